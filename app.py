@@ -1,35 +1,25 @@
 import os
+import sys
+from datetime import datetime
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from flask_login import LoginManager
 from sqlalchemy.orm import DeclarativeBase
 import logging
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG, 
+logging.basicConfig(level=logging.DEBUG,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+logger = logging.getLogger(__name__)
+
 class Base(DeclarativeBase):
     pass
 
-# Create Flask app and configure database
-app = Flask(__name__)
-app.secret_key = os.environ.get("SESSION_SECRET", "dev_secret_key")
-
-# Use PostgreSQL for database
-app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-}
-
-# Initialize SQLAlchemy with the app
+# Extensions are created once and bound to the app in create_app()
 db = SQLAlchemy(model_class=Base)
-db.init_app(app)
 
-# Initialize Flask-Login
-from flask_login import LoginManager
 login_manager = LoginManager()
-login_manager.init_app(app)
 login_manager.login_view = 'auth.login'
 
 @login_manager.user_loader
@@ -37,24 +27,7 @@ def load_user(user_id):
     from models import User
     return User.query.get(int(user_id))
 
-with app.app_context():
-    # Import models here to ensure they're registered with SQLAlchemy
-    import models  # noqa: F401
-
-    # Create all tables in the database
-    db.create_all()
-    
-    # Initialize services that need application context
-    from services.rag_service import init_rag_service
-    init_rag_service()
-
-# Register learning helper functions
-from utils.learning_helpers import register_learning_helpers
-register_learning_helpers(app)
-
-# Add custom Jinja filters
-from datetime import datetime
-@app.template_filter('timestamp_to_datetime')
+# Custom Jinja filters
 def timestamp_to_datetime(timestamp):
     """Convert Unix timestamp to formatted datetime string"""
     try:
@@ -62,25 +35,137 @@ def timestamp_to_datetime(timestamp):
     except (ValueError, TypeError):
         return "Unknown"
 
-@app.template_filter('nl2br')
 def nl2br(text):
     """Convert newlines to HTML line breaks"""
     if not text:
         return ""
     return text.replace('\n', '<br>')
 
-# Register blueprints
-from routes.auth_routes import auth_bp
-from routes.learning_routes import learning_bp
-from routes.main_routes import main_bp
-# Import API routes
-from routes.api_routes import api_bp
+def create_app():
+    """
+    Create and configure the Flask application
+
+    Safe to call in a gunicorn master with --preload: anything built here is
+    shared copy-on-write by the workers, and the per-process resources (DB
+    connections, HTTP clients) are recreated by reset_after_fork().
+
+    Returns:
+        Flask: The configured application
+    """
+    app = Flask(__name__)
+    app.secret_key = os.environ.get("SESSION_SECRET", "dev_secret_key")
+
+    # Use PostgreSQL for database
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_recycle": 300,
+        "pool_pre_ping": True,
+    }
+
+    # Serialize numpy/pandas/datetime values natively and compress large responses
+    from utils.json_provider import FastJSONProvider
+    from utils.compression import init_compression
+    app.json = FastJSONProvider(app)
+    init_compression(app)
+
+    # Server-Timing breakdown per dependency and slow request log
+    from utils.request_timing import init_request_timing
+    init_request_timing(app)
+
+    # Initialize extensions with the app
+    db.init_app(app)
+    login_manager.init_app(app)
+
+    with app.app_context():
+        # Import models here to ensure they're registered with SQLAlchemy
+        import models  # noqa: F401
+
+        # Create all tables in the database
+        db.create_all()
+
+    # Register learning helper functions
+    from utils.learning_helpers import register_learning_helpers
+    register_learning_helpers(app)
+
+    # Add custom Jinja filters
+    app.add_template_filter(timestamp_to_datetime, 'timestamp_to_datetime')
+    app.add_template_filter(nl2br, 'nl2br')
+
+    # Register blueprints
+    from routes.auth_routes import auth_bp
+    from routes.learning_routes import learning_bp
+    from routes.main_routes import main_bp
+    # Import API routes
+    from routes.api_routes import api_bp
+
+    # Register blueprints with the app
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(learning_bp)
+    app.register_blueprint(main_bp)
+    app.register_blueprint(api_bp)
+
+    return app
+
+def warm_shared_state(app):
+    """
+    Build the read-only data every worker needs (book corpus and RAG service)
+
+    Called in the gunicorn master before forking when the app is preloaded, so
+    workers share these objects copy-on-write instead of each building its own.
+    Index metadata, sector maps and the RAGProcessor book content are already
+    built when the route modules are imported by create_app().
+
+    Args:
+        app (Flask): The application
+    """
+    from services.rag_service import get_rag_service
+
+    with app.app_context():
+        get_rag_service()
+
+        # Close the connections the master used so no socket is inherited by workers
+        db.engine.dispose()
+
+    logger.info("Shared application state built before forking workers")
+
+def start_background_warm_up(app):
+    """
+    Warm up lazily built services on a background thread (if enabled)
+
+    Must only be called in the process that serves requests - threads do not
+    survive a fork.
+
+    Args:
+        app (Flask): The application
+    """
+    from config import RAG_BACKGROUND_WARMUP
+
+    if RAG_BACKGROUND_WARMUP:
+        from services.rag_service import warm_up_rag_service
+        warm_up_rag_service(app)
+
+def reset_after_fork(app):
+    """
+    Recreate per-process resources in a freshly forked worker
+
+    Database connections and HTTP connection pools must never be shared
+    between processes, so pooled DB connections inherited from the master are
+    dropped (without closing the parent's sockets) and HTTP clients are
+    recreated on their next use.
+
+    Args:
+        app (Flask): The application
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+    # Only reset services that were actually imported in the master
+    llm_module = sys.modules.get('services.llm_service')
+    if llm_module is not None:
+        llm_module.llm_service.reset_client()
 
-# Register blueprints with the app
-app.register_blueprint(auth_bp)
-app.register_blueprint(learning_bp)
-app.register_blueprint(main_bp)
-app.register_blueprint(api_bp)
+app = create_app()
 
 if __name__ == "__main__":
+    start_background_warm_up(app)
     app.run(host="0.0.0.0", port=5000, debug=True)
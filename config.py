@@ -14,6 +14,69 @@ TAVILY_API_KEY = os.environ.get("TAVILY_API_KEY", "")
 GROQ_API_KEY = os.environ.get("GROQ_API_KEY", "")
 GROQ_MODEL_NAME = "llama3-70b-8192"
 
+# Token budgets for context packed into LLM prompts
+TOKENIZER_ENCODING = os.environ.get("TOKENIZER_ENCODING", "cl100k_base")
+LLM_CONTEXT_TOKEN_BUDGET = int(os.environ.get("LLM_CONTEXT_TOKEN_BUDGET", "1500"))
+NEWS_CONTEXT_TOKEN_BUDGET = int(os.environ.get("NEWS_CONTEXT_TOKEN_BUDGET", "600"))
+BOOK_CONTEXT_TOKEN_BUDGET = int(os.environ.get("BOOK_CONTEXT_TOKEN_BUDGET", "500"))
+MARKET_CONTEXT_TOKEN_BUDGET = int(os.environ.get("MARKET_CONTEXT_TOKEN_BUDGET", "600"))
+
+# Market context shared by insights requests is rebuilt in the background after this long
+MARKET_CONTEXT_REFRESH_SECONDS = int(os.environ.get("MARKET_CONTEXT_REFRESH_SECONDS", "300"))
+
+# Independent LLM calls of one request run concurrently on a shared pool
+TASK_EXECUTOR_WORKERS = int(os.environ.get("TASK_EXECUTOR_WORKERS", "16"))
+INSIGHTS_DEADLINE_SECONDS = float(os.environ.get("INSIGHTS_DEADLINE_SECONDS", "25"))
+
+# In-process cache of Yahoo Finance and Tavily results (TTLs are set per method)
+DATA_CACHE_MAX_ENTRIES = int(os.environ.get("DATA_CACHE_MAX_ENTRIES", "1024"))
+
+# Rendered HTML of the shared market widgets, one entry per widget and data version
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get("FRAGMENT_CACHE_MAX_ENTRIES", "128"))
+
+# Response compression (brotli when installed, otherwise gzip)
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", "5"))
+
+# Upper bound for the 'points' parameter of the historical data API (chart downsampling)
+CHART_MAX_POINTS = int(os.environ.get("CHART_MAX_POINTS", "2000"))
+
+# Live quote push (see utils/quote_stream.py)
+QUOTE_STREAM_INTERVAL = float(os.environ.get("QUOTE_STREAM_INTERVAL", "15"))  # seconds between polls
+QUOTE_STREAM_KEEPALIVE = float(os.environ.get("QUOTE_STREAM_KEEPALIVE", "20"))  # seconds
+QUOTE_STREAM_MAX_SYMBOLS = int(os.environ.get("QUOTE_STREAM_MAX_SYMBOLS", "50"))
+# Streams are closed after this long (browsers reconnect) so no worker thread is held forever
+QUOTE_STREAM_MAX_SECONDS = float(os.environ.get("QUOTE_STREAM_MAX_SECONDS", "300"))
+
+# Request timing (see utils/request_timing.py)
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", "1000"))  # log requests slower than this
+SERVER_TIMING_HEADER = os.environ.get("SERVER_TIMING_HEADER", "true").lower() == "true"
+
+# Build the RAG book corpus on a background thread at startup instead of on first use
+RAG_BACKGROUND_WARMUP = os.environ.get("RAG_BACKGROUND_WARMUP", "true").lower() == "true"
+
+# Learning resource recommendations (in-process segment cache)
+RECOMMENDATION_CACHE_TTL = int(os.environ.get("RECOMMENDATION_CACHE_TTL", "600"))  # seconds
+RECOMMENDATION_MAX_SEGMENTS = int(os.environ.get("RECOMMENDATION_MAX_SEGMENTS", "256"))
+
+# Learning catalog (paths and resource metadata) cached in-process
+CATALOG_CACHE_TTL = int(os.environ.get("CATALOG_CACHE_TTL", "300"))  # seconds
+
+# Write-behind buffer for learning progress updates
+PROGRESS_FLUSH_INTERVAL = float(os.environ.get("PROGRESS_FLUSH_INTERVAL", "5"))  # seconds
+PROGRESS_BUFFER_MAX_PENDING = int(os.environ.get("PROGRESS_BUFFER_MAX_PENDING", "500"))
+PROGRESS_JOURNAL_DIR = os.environ.get(
+    "PROGRESS_JOURNAL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "progress_journal")
+)
+
+# Precomputed LLM narratives for the tax advisor (see scripts/precompute_tax_narratives.py)
+TAX_NARRATIVE_FILE = os.environ.get(
+    "TAX_NARRATIVE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "tax_narratives.json")
+)
+
 # India-specific constants
 INDIAN_STOCK_EXCHANGES = ["NSE", "BSE"]
 DEFAULT_STOCK_EXCHANGE = "NSE"
@@ -0,0 +1,53 @@
+"""
+Gunicorn configuration (loaded automatically from the working directory)
+
+Run with --preload (or GUNICORN_PRELOAD=true) to import the app once in the
+master: read-only state such as the book corpus and RAG service is built
+before forking and shared copy-on-write by all workers, while database
+connections and HTTP clients are recreated in each worker after the fork.
+"""
+import gc
+import os
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "false").lower() == "true"
+
+# Every dashboard and watchlist page keeps a live quote stream
+# (/api/quotes/stream) open for up to QUOTE_STREAM_MAX_SECONDS, holding one
+# thread for it. Sync workers would block all other requests behind a single
+# stream, so workers are threaded: each worker serves `threads` connections at
+# once, and its heartbeat keeps running while streams are open, so long
+# streams do not trip the worker timeout. Size threads for the expected
+# number of open streams per worker plus headroom for regular requests.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", "64"))
+
+
+def when_ready(server):
+    """Build shared state in the master once the preloaded app is imported"""
+    if not server.cfg.preload_app:
+        return
+
+    from app import app, warm_shared_state
+    warm_shared_state(app)
+
+    # Move everything built so far out of the garbage collector's reach so
+    # collections in the workers don't write to (and copy) the shared pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Give each preloaded worker its own DB connections and HTTP clients"""
+    if not server.cfg.preload_app:
+        return
+
+    from app import app, reset_after_fork
+    reset_after_fork(app)
+
+
+def post_worker_init(worker):
+    """Warm up lazily built services when every worker loads its own app"""
+    if worker.cfg.preload_app:
+        return
+
+    from app import app, start_background_warm_up
+    start_background_warm_up(app)
@@ -1,4 +1,5 @@
-from app import app
+from app import app, start_background_warm_up
 
 if __name__ == "__main__":
+    start_background_warm_up(app)
     app.run(host="0.0.0.0", port=5000, debug=True)
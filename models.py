@@ -1,7 +1,7 @@
 from datetime import datetime
 from app import db
 from flask_login import UserMixin
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Text, JSON, ForeignKey, Boolean
 
 # Define models in the correct order for SQLAlchemy relationships
 
@@ -179,9 +179,35 @@ class DailyTip(db.Model):
     saved = db.Column(Boolean, default=False)  # Track if user has saved this tip
     created_at = db.Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        # Latest unread personalized tip for a user
+        db.Index('ix_daily_tips_user_read_personalized_created', 'user_id', 'read', 'is_personalized', 'created_at'),
+        # Latest unread global tip (user_id IS NULL) for a difficulty level
+        db.Index('ix_daily_tips_user_read_difficulty_created', 'user_id', 'read', 'tip_difficulty', 'created_at'),
+    )
+    
     def __repr__(self):
         return f'<Tip {self.tip_title[:30]}...>'
 
+class DailyTipAssignment(db.Model):
+    """
+    The tip shown to a user on a given day, precomputed by the daily tip batch job
+    """
+    __tablename__ = 'daily_tip_assignments'
+    
+    id = db.Column(Integer, primary_key=True)
+    user_id = db.Column(Integer, ForeignKey('users.id'), nullable=False)
+    tip_id = db.Column(Integer, ForeignKey('daily_tips.id', ondelete='CASCADE'), nullable=False)
+    assigned_date = db.Column(Date, nullable=False)
+    created_at = db.Column(DateTime, default=datetime.utcnow)
+    
+    tip = db.relationship('DailyTip', lazy='joined')
+    
+    __table_args__ = (db.UniqueConstraint('user_id', 'assigned_date', name='uix_user_tip_date'),)
+    
+    def __repr__(self):
+        return f'<TipAssignment User:{self.user_id} Tip:{self.tip_id} {self.assigned_date}>'
+
 class LearningResource(db.Model):
     """
     Financial learning resources
@@ -204,6 +230,11 @@ class LearningResource(db.Model):
     created_at = db.Column(DateTime, default=datetime.utcnow)
     updated_at = db.Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Topic pages (ordered by difficulty and duration) and related resources
+        db.Index('ix_learning_resources_topic_difficulty_duration', 'topic', 'difficulty_level', 'duration_minutes'),
+    )
+    
     def __repr__(self):
         return f'<Resource {self.title[:30]}...>'
 
@@ -261,13 +292,88 @@ class LearningProgress(db.Model):
     last_accessed = db.Column(DateTime, default=datetime.utcnow)
     completed_at = db.Column(DateTime, nullable=True)
     
+    # Also serves every lookup by user_id alone (progress snapshot, stats rebuild)
     __table_args__ = (db.UniqueConstraint('user_id', 'resource_id', name='uix_user_resource_progress'),)
     
     def __repr__(self):
         return f'<Progress User:{self.user_id} Resource:{self.resource_id} {self.completion_percentage}%>'
+
+
+class UserLearningStats(db.Model):
+    """
+    Precomputed learning aggregates for a user
+    
+    Maintained in the same transaction as the progress and bookmark writes
+    (see utils/learning_stats.py) so learning pages read one row by primary key.
+    """
+    __tablename__ = 'user_learning_stats'
+    
+    user_id = db.Column(Integer, ForeignKey('users.id'), primary_key=True)
+    completed_count = db.Column(Integer, nullable=False, default=0)
+    started_count = db.Column(Integer, nullable=False, default=0)  # Resources with any progress
+    total_time_spent_minutes = db.Column(Integer, nullable=False, default=0)
+    completed_by_path = db.Column(db.JSON, default={})  # Path ID (as string) -> completed resource IDs
+    bookmark_count = db.Column(Integer, nullable=False, default=0)
+    completed_bookmark_count = db.Column(Integer, nullable=False, default=0)
+    started_bookmark_count = db.Column(Integer, nullable=False, default=0)
+    bookmarks_with_notes_count = db.Column(Integer, nullable=False, default=0)
+    bookmark_topics = db.Column(db.JSON, default={})  # Topic -> bookmarked resources
+    updated_at = db.Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @property
+    def not_started_bookmark_count(self):
+        return max(self.bookmark_count - self.started_bookmark_count, 0)
+    
+    def completed_in_path(self, path):
+        """Number of the path's resources completed as part of that path"""
+        if not path or not path.resource_sequence:
+            return 0
+        completed = set((self.completed_by_path or {}).get(str(path.id), ()))
+        return sum(1 for resource_id in path.resource_sequence if resource_id in completed)
+    
+    def path_progress(self, path):
+        """Completion percentage of a learning path"""
+        if not path or not path.resource_sequence:
+            return 0
+        return self.completed_in_path(path) / len(path.resource_sequence) * 100
+    
+    def __repr__(self):
+        return f'<LearningStats User:{self.user_id} Completed:{self.completed_count}>'
+
+class SeededContent(db.Model):
+    """
+    Content hash of each learning catalog row loaded by the content seeder
+    
+    Lets re-runs of the seeder skip rows whose source content did not change.
+    """
+    __tablename__ = 'seeded_content'
+    
+    id = db.Column(Integer, primary_key=True)
+    kind = db.Column(String(20), nullable=False)  # resource, path, tip
+    key = db.Column(String(200), nullable=False)  # Natural key in the content file (title or name)
+    row_id = db.Column(Integer, nullable=False)  # ID of the row in the kind's table
+    content_hash = db.Column(String(64), nullable=False)
+    updated_at = db.Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (db.UniqueConstraint('kind', 'key', name='uix_seeded_content_kind_key'),)
+    
+    def __repr__(self):
+        return f'<SeededContent {self.kind}:{self.key}>'
         
 # Add relationships after all models have been defined
 User.daily_tips = db.relationship('DailyTip', backref='user', lazy='dynamic')
 User.learning_bookmarks = db.relationship('LearningBookmark', backref='user', lazy='dynamic')
 User.learning_progress_records = db.relationship('LearningProgress', backref='user', lazy='dynamic')
 User.queries = db.relationship('UserQuery', backref='user', lazy='dynamic')
+User.learning_stats = db.relationship('UserLearningStats', backref='user', uselist=False)
+LearningBookmark.resource = db.relationship('LearningResource', lazy='select')
+# The bookmarking user's progress on the bookmarked resource (if any)
+LearningBookmark.progress = db.relationship(
+    'LearningProgress',
+    primaryjoin=lambda: db.and_(
+        LearningBookmark.user_id == db.foreign(LearningProgress.user_id),
+        LearningBookmark.resource_id == db.foreign(LearningProgress.resource_id)
+    ),
+    uselist=False,
+    viewonly=True
+)
@@ -6,7 +6,7 @@ from app import app, db
 from services.news_service import news_service
 from services.stock_service import stock_service
 from services.llm_service import llm_service
-from services.rag_service import rag_service, init_rag_service
+from services.rag_service import get_rag_service
 from services.db_service import db_service
 from config import FINANCIAL_BOOKS, INDIAN_STOCK_EXCHANGES
 
@@ -155,10 +155,8 @@ def insights():
         # Get answer from LLM
         answer = llm_service.answer_financial_question(query)
         
-        # Ensure rag_service is initialized
-        if rag_service is None:
-            init_rag_service()
-            logger.info("RAG service initialized on demand")
+        # The RAG service is built on first use
+        rag_service = get_rag_service()
         
         # Get related book recommendations
         book_recommendations = rag_service.get_book_recommendations(query)
@@ -378,7 +376,7 @@ def answer_question_api():
             book_references = []
         
         # Get additional book recommendations (separate from the book references)
-        book_recommendations = rag_service.get_book_recommendations(query)
+        book_recommendations = get_rag_service().get_book_recommendations(query)
         
         return jsonify({
             'success': True,
@@ -1,15 +1,21 @@
-from flask import Blueprint, jsonify, request, g
+from flask import Blueprint, Response, current_app, jsonify, request, g
 from flask_login import login_required, current_user
 import logging
+import time
 from utils.tavily_api import TavilyNewsExtractor
 from utils.groq_api import GroqLLMProcessor
 from utils.yahoo_finance_api import YahooFinanceAPI
 from utils.rag_processor import RAGProcessor
 from utils.langchain_tools import LangChainManager
+from utils.http_cache import http_cache
+from utils.downsampling import MIN_POINTS
+from utils.price_history import to_columnar, to_points, downsample_history, DOWNSAMPLE_METHODS
+from utils.quote_stream import quote_stream
+from config import CHART_MAX_POINTS, QUOTE_STREAM_KEEPALIVE, QUOTE_STREAM_MAX_SECONDS, QUOTE_STREAM_MAX_SYMBOLS
 
 logger = logging.getLogger(__name__)
 
-api_bp = Blueprint('api', __name__)
+api_bp = Blueprint('api', __name__, url_prefix='/api')
 
 # Initialize API clients
 news_client = TavilyNewsExtractor()
@@ -20,6 +26,7 @@ langchain_manager = LangChainManager()
 
 @api_bp.route('/news/latest', methods=['GET'])
 @login_required
+@http_cache(max_age=300, stale_while_revalidate=300)
 def get_latest_news():
     try:
         limit = request.args.get('limit', 5, type=int)
@@ -33,6 +40,7 @@ def get_latest_news():
 
 @api_bp.route('/news/search', methods=['GET'])
 @login_required
+@http_cache(max_age=300, stale_while_revalidate=300)
 def search_news():
     try:
         query = request.args.get('q', '')
@@ -49,6 +57,7 @@ def search_news():
 
 @api_bp.route('/stock/data', methods=['GET'])
 @login_required
+@http_cache(max_age=60, stale_while_revalidate=60)
 def get_stock_data():
     try:
         symbol = request.args.get('symbol', '')
@@ -66,6 +75,7 @@ def get_stock_data():
 
 @api_bp.route('/stock/multiple', methods=['GET'])
 @login_required
+@http_cache(max_age=60, stale_while_revalidate=60)
 def get_multiple_stocks():
     try:
         symbols = request.args.get('symbols', '')
@@ -84,6 +94,7 @@ def get_multiple_stocks():
 
 @api_bp.route('/market/summary', methods=['GET'])
 @login_required
+@http_cache(max_age=30, stale_while_revalidate=30)
 def get_market_summary():
     try:
         indices = request.args.get('indices')
@@ -98,6 +109,7 @@ def get_market_summary():
         
 @api_bp.route('/market/indices', methods=['GET'])
 @login_required
+@http_cache(max_age=120, stale_while_revalidate=180)
 def get_market_indices():
     try:
         period = request.args.get('period', '1mo')
@@ -112,6 +124,7 @@ def get_market_indices():
         
 @api_bp.route('/market/indices/categories', methods=['GET'])
 @login_required
+@http_cache(max_age=120, stale_while_revalidate=180)
 def get_indices_by_category():
     try:
         indices_by_category = stock_client.get_indices_by_category()
@@ -122,6 +135,7 @@ def get_indices_by_category():
 
 @api_bp.route('/sectors/performance', methods=['GET'])
 @login_required
+@http_cache(max_age=120, stale_while_revalidate=180)
 def get_sector_performance():
     try:
         sectors = request.args.get('sectors')
@@ -244,27 +258,83 @@ def get_book_advice():
 
 @api_bp.route('/historical-data/<symbol>', methods=['GET'])
 @login_required
+@http_cache(max_age=60, stale_while_revalidate=60)
 def get_historical_data_api(symbol):
     try:
         period = request.args.get('period', '1mo')
         interval = request.args.get('interval', '1d')
+        # 'columnar' sends {"t": [...], "o": [...], ...} instead of one object per bar
+        data_format = request.args.get('format', 'points')
+        # Target number of bars (e.g. the chart width in pixels) for long ranges
+        points = request.args.get('points', type=int)
+        method = request.args.get('downsample', 'lttb')
         
         if not symbol:
             return jsonify({"success": False, "error": "Symbol parameter is required"}), 400
         
+        if method not in DOWNSAMPLE_METHODS:
+            return jsonify({"success": False, "error": f"downsample must be one of {', '.join(DOWNSAMPLE_METHODS)}"}), 400
+        
+        if points is not None:
+            points = min(max(points, MIN_POINTS), CHART_MAX_POINTS)
+        
         # Get stock data with the specified period
         stock_data = stock_client.get_stock_data(symbol, period=period, interval=interval)
+        if stock_data.get('error'):
+            return jsonify({"success": False, "error": stock_data['error']}), 502
         
-        # Extract historical data
-        historical_data = []
-        if 'historical_data' in stock_data:
-            historical_data = stock_data['historical_data']
+        history = stock_data.get('history', [])
+        total = len(history)
+        history = downsample_history(history, points, method)
+        meta = {"success": True, "total_points": total, "downsampled": len(history) < total}
+        if data_format == 'columnar':
+            return jsonify({**meta, "format": "columnar", "data": to_columnar(history)})
         
-        return jsonify({"success": True, "data": historical_data})
+        return jsonify({**meta, "format": "points", "data": to_points(history)})
     except Exception as e:
         logger.error(f"API error in get_historical_data: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+@api_bp.route('/quotes/stream', methods=['GET'])
+@login_required
+def stream_quotes():
+    """Server-Sent Events stream of quote changes for the user's watchlist (or ?symbols=A,B)"""
+    symbols_param = request.args.get('symbols')
+    if symbols_param:
+        symbols = [symbol.strip() for symbol in symbols_param.split(',') if symbol.strip()]
+    else:
+        symbols = list(current_user.watchlist or [])
+    
+    if not symbols:
+        return jsonify({"success": False, "error": "No symbols to stream"}), 400
+    if len(symbols) > QUOTE_STREAM_MAX_SYMBOLS:
+        return jsonify({"success": False, "error": f"At most {QUOTE_STREAM_MAX_SYMBOLS} symbols can be streamed"}), 400
+    
+    # The generator runs after the request context is gone
+    dumps = current_app.json.dumps
+    subscription = quote_stream.subscribe(symbols)
+    
+    def events():
+        deadline = time.monotonic() + QUOTE_STREAM_MAX_SECONDS
+        try:
+            # Reconnect after 5 seconds if the connection drops
+            yield "retry: 5000\n\n"
+            while time.monotonic() < deadline:
+                changes = subscription.wait(QUOTE_STREAM_KEEPALIVE)
+                if changes:
+                    yield f"event: quotes\ndata: {dumps(changes)}\n\n"
+                else:
+                    # Comment line; lets proxies and the server notice dead connections
+                    yield ": keepalive\n\n"
+        finally:
+            quote_stream.unsubscribe(subscription)
+    
+    response = Response(events(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @api_bp.route('/watchlist/update', methods=['POST'])
 @login_required
 def update_watchlist():
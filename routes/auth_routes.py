@@ -2,8 +2,9 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import check_password_hash, generate_password_hash
 from datetime import datetime
-from models import User, DailyTip
+from models import User, DailyTip, UserLearningStats
 from app import db
+from utils.progress_buffer import progress_buffer
 import os
 import json
 import logging
@@ -128,6 +129,8 @@ def register():
                 is_personalized=True
             )
             db.session.add(welcome_tip)
+            # Learning pages only read the aggregates; a new user starts with an empty row
+            db.session.add(UserLearningStats(user_id=new_user.id))
             db.session.commit()
             
             # Log in the user
@@ -194,6 +197,8 @@ def login():
 @auth_bp.route('/logout')
 @login_required
 def logout():
+    # Write the user's buffered reading progress before the session ends
+    progress_buffer.flush(user_id=current_user.id)
     logout_user()
     flash('You have been logged out', 'info')
     return redirect(url_for('auth.login'))
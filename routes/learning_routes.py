@@ -1,8 +1,15 @@
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, abort, current_app
 from flask_login import login_required, current_user
 from models import LearningResource, LearningPath, LearningBookmark, LearningProgress, DailyTip
 from app import db
-from datetime import datetime, timedelta
+from utils.learning_helpers import get_bookmarks_with_resources, get_progress_snapshot, invalidate_progress_snapshot
+from utils.learning_stats import (get_learning_stats, lock_learning_stats, progress_state,
+                                  record_progress_change, record_bookmark_added, record_bookmark_removed)
+from utils.recommendation_engine import recommendation_engine
+from utils.catalog_cache import get_catalog
+from utils.daily_tips import get_assigned_tip
+from utils.progress_buffer import progress_buffer
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,86 +25,50 @@ def home():
     
     # Get current learning path from user progress
     current_path_name = current_user.learning_progress.get('current_learning_path', 'Basics')
-    current_path = LearningPath.query.filter_by(name=current_path_name).first()
+    catalog = get_catalog()
+    current_path = catalog.get_path_by_name(current_path_name)
     
     if not current_path:
         # Default path if user's path doesn't exist
-        current_path = LearningPath.query.filter_by(difficulty_level=difficulty).first()
+        current_path = next((p for p in catalog.paths if p.difficulty_level == difficulty), None)
         if not current_path:
             # Create a default path if none exists
             current_path = create_default_learning_path(difficulty)
     
-    # Get user's progress in current path
-    path_progress = 0
-    completed_resources = 0
+    # Get user's progress in current path from the same aggregates as the
+    # get_path_progress/get_completed_resources_count template helpers
+    learning_stats = get_learning_stats(current_user.id)
     total_resources = len(current_path.resource_sequence) if current_path else 0
+    completed_resources = learning_stats.completed_in_path(current_path)
+    path_progress = learning_stats.path_progress(current_path)
     
-    progress_records = LearningProgress.query.filter_by(
-        user_id=current_user.id,
-        path_id=current_path.id if current_path else None
-    ).all()
-    
-    if progress_records and total_resources > 0:
-        completed_resources = sum(1 for p in progress_records if p.is_completed)
-        path_progress = (completed_resources / total_resources) * 100 if total_resources > 0 else 0
+    # Completion per resource (one query shared with the template helpers)
+    progress_snapshot = get_progress_snapshot(current_user.id)
     
-    # Get next resource in learning path
+    # Get next resource in learning path: the first one not completed
     next_resource = None
     if current_path and current_path.resource_sequence:
-        # Find the first resource not completed
-        for resource_id in current_path.resource_sequence:
-            progress = LearningProgress.query.filter_by(
-                user_id=current_user.id, 
-                resource_id=resource_id
-            ).first()
-            
-            if not progress or not progress.is_completed:
-                next_resource = LearningResource.query.get(resource_id)
-                break
+        next_resource_id = next(
+            (resource_id for resource_id in current_path.resource_sequence
+             if not progress_snapshot.is_completed(resource_id)),
+            None
+        )
+        if next_resource_id is not None:
+            next_resource = LearningResource.query.get(next_resource_id)
     
     # Get recommended resources based on user profile
     recommended_resources = get_recommended_resources(current_user, limit=3)
     
     # Get user's saved resources (bookmarks)
-    saved_resources = LearningBookmark.query.filter_by(user_id=current_user.id).all()
+    saved_resources = get_bookmarks_with_resources(current_user.id)
     
-    # Get daily tip if user has preference enabled
+    # Get today's daily tip (assigned ahead of time by the daily tip batch job)
     daily_tip = None
     if current_user.preferences.get('daily_tip', True):
-        # Check if user needs a new daily tip
-        last_tip_time = current_user.last_daily_tip
-        time_diff = datetime.utcnow() - last_tip_time if last_tip_time else timedelta(days=2)
-        
-        if time_diff.days >= 1:  # More than a day since last tip
-            # Get personalized tip if available, otherwise get a general tip
-            personalized_tip = DailyTip.query.filter_by(
-                user_id=current_user.id,
-                read=False,
-                is_personalized=True
-            ).order_by(DailyTip.created_at.desc()).first()
-            
-            if personalized_tip:
-                daily_tip = personalized_tip
-            else:
-                # Get global tip based on user's difficulty level
-                global_tip = DailyTip.query.filter_by(
-                    user_id=None,  # Global tip
-                    read=False,
-                    tip_difficulty=difficulty
-                ).order_by(DailyTip.created_at.desc()).first()
-                
-                if global_tip:
-                    daily_tip = global_tip
-                else:
-                    # If no suitable tip found, create a default one
-                    daily_tip = create_default_tip(current_user.id)
-            
-            # Update last tip time
-            current_user.last_daily_tip = datetime.utcnow()
-            db.session.commit()
+        daily_tip = get_assigned_tip(current_user.id, difficulty=difficulty)
     
     # Get all available learning paths for the modal
-    all_paths = LearningPath.query.all()
+    all_paths = catalog.paths
     
     return render_template('learning.html', 
                           difficulty=difficulty,
@@ -111,10 +82,27 @@ def home():
                           daily_tip=daily_tip,
                           all_paths=all_paths)
 
+def _flush_buffered_progress(resource_id):
+    """
+    Write the current user's buffered progress for a resource
+
+    Returns:
+        bool: False if the write failed (the update stays buffered)
+    """
+    try:
+        progress_buffer.flush(user_id=current_user.id, resource_id=resource_id)
+        return True
+    except Exception as e:
+        logger.error(f"Error writing buffered progress for resource {resource_id}: {e}")
+        return False
+
 @learning_bp.route('/resource/<int:resource_id>')
 @login_required
 def resource(resource_id):
     """Display a specific learning resource"""
+    # Write buffered reading progress so the page shows the latest percentage
+    progress_flushed = _flush_buffered_progress(resource_id)
+    
     resource = LearningResource.query.get_or_404(resource_id)
     
     # Check if resource is already bookmarked
@@ -131,11 +119,8 @@ def resource(resource_id):
     
     if not progress:
         # Find the path this resource belongs to
-        path = None
-        for p in LearningPath.query.all():
-            if resource_id in p.resource_sequence:
-                path = p
-                break
+        containing_paths = get_catalog().paths_for_resource(resource_id)
+        path = containing_paths[0] if containing_paths else None
         
         progress = LearningProgress(
             user_id=current_user.id,
@@ -145,11 +130,21 @@ def resource(resource_id):
         )
         db.session.add(progress)
         db.session.commit()
+        
+        # The page renders progress helpers after this new record was created
+        invalidate_progress_snapshot(current_user.id)
     else:
         # Update last accessed time
         progress.last_accessed = datetime.utcnow()
         db.session.commit()
     
+    completion_percentage = progress.completion_percentage
+    if not progress_flushed and not progress.is_completed:
+        # Show the buffered percentage; it is written by a later flush
+        pending = progress_buffer.pending(current_user.id, resource_id)
+        if pending is not None:
+            completion_percentage = pending
+    
     # Get related resources (same topic, same difficulty)
     related_resources = LearningResource.query.filter(
         LearningResource.topic == resource.topic,
@@ -161,6 +156,7 @@ def resource(resource_id):
                           resource=resource,
                           is_bookmarked=is_bookmarked,
                           progress=progress,
+                          completion_percentage=completion_percentage,
                           related_resources=related_resources)
 
 @learning_bp.route('/topic/<topic>')
@@ -171,10 +167,10 @@ def topic(topic):
     topic_name = topic.replace('-', ' ').title()
     
     # Get resources for this topic
-    resources = LearningResource.query.filter_by(topic=topic_name).order_by(
-        LearningResource.difficulty_level,
-        LearningResource.duration_minutes
-    ).all()
+    resources = sorted(
+        get_catalog().resources_for_topic(topic_name),
+        key=lambda r: (r.difficulty_level, r.duration_minutes or 0)
+    )
     
     # Group resources by difficulty level
     beginner_resources = [r for r in resources if r.difficulty_level == 'Beginner']
@@ -191,8 +187,9 @@ def topic(topic):
 @login_required
 def bookmarks():
     """Show user's bookmarked resources"""
-    bookmarks = LearningBookmark.query.filter_by(user_id=current_user.id).all()
-    return render_template('learning_bookmarks.html', bookmarks=bookmarks)
+    bookmarks = get_bookmarks_with_resources(current_user.id, with_progress=True)
+    learning_stats = get_learning_stats(current_user.id)
+    return render_template('learning_bookmarks.html', bookmarks=bookmarks, learning_stats=learning_stats)
 
 @learning_bp.route('/bookmark/<int:resource_id>', methods=['POST'])
 @login_required
@@ -219,7 +216,10 @@ def add_bookmark(resource_id):
     )
     
     try:
+        # Lock the stats row before the bookmark is flushed
+        learning_stats = lock_learning_stats(current_user.id)
         db.session.add(bookmark)
+        record_bookmark_added(learning_stats, bookmark, resource)
         db.session.commit()
         return jsonify({'success': True, 'message': 'Resource bookmarked successfully'})
     except Exception as e:
@@ -238,6 +238,8 @@ def remove_bookmark(bookmark_id):
         return jsonify({'success': False, 'message': 'Unauthorized'})
     
     try:
+        learning_stats = lock_learning_stats(current_user.id)
+        record_bookmark_removed(learning_stats, bookmark, LearningResource.query.get(bookmark.resource_id))
         db.session.delete(bookmark)
         db.session.commit()
         return jsonify({'success': True, 'message': 'Bookmark removed successfully'})
@@ -250,6 +252,10 @@ def remove_bookmark(bookmark_id):
 @login_required
 def mark_complete(resource_id):
     """Mark a learning resource as completed"""
+    # Write any buffered percentage first (if that fails, the flusher skips
+    # completed resources, so it cannot undo the completion later)
+    _flush_buffered_progress(resource_id)
+    
     progress = LearningProgress.query.filter_by(
         user_id=current_user.id,
         resource_id=resource_id
@@ -258,6 +264,10 @@ def mark_complete(resource_id):
     if not progress:
         return jsonify({'success': False, 'message': 'Progress record not found'})
     
+    learning_stats = lock_learning_stats(current_user.id)
+    previous_state = progress_state(progress)
+    minutes_added = 0
+    
     # Update quiz score if provided
     quiz_score = request.form.get('quiz_score')
     if quiz_score is not None:
@@ -270,7 +280,8 @@ def mark_complete(resource_id):
     time_spent = request.form.get('time_spent')
     if time_spent is not None:
         try:
-            progress.time_spent_minutes += int(time_spent)
+            minutes_added = int(time_spent)
+            progress.time_spent_minutes = (progress.time_spent_minutes or 0) + minutes_added
         except ValueError:
             pass
     
@@ -290,6 +301,8 @@ def mark_complete(resource_id):
         learning_progress['completed_topics'] = completed_topics
         current_user.learning_progress = learning_progress
     
+    record_progress_change(learning_stats, progress, previous_state, time_added=minutes_added)
+    
     try:
         db.session.commit()
         return jsonify({'success': True, 'message': 'Resource marked as completed'})
@@ -301,7 +314,44 @@ def mark_complete(resource_id):
 @learning_bp.route('/update-progress/<int:resource_id>', methods=['POST'])
 @login_required
 def update_progress(resource_id):
-    """Update progress on a learning resource (percentage completed)"""
+    """Update progress on a learning resource (percentage completed)
+    
+    Partial progress is reported often while reading, so it goes to the
+    write-behind buffer; reaching 100% is written immediately.
+    """
+    percentage = request.form.get('percentage')
+    if percentage is None and request.is_json:
+        # The resource page posts JSON
+        percentage = (request.get_json(silent=True) or {}).get('percentage')
+    
+    if percentage is None:
+        return jsonify({'success': False, 'message': 'Percentage not provided'})
+    
+    try:
+        percentage = float(percentage)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Invalid percentage'})
+    
+    if not 0 <= percentage <= 100:
+        return jsonify({'success': False, 'message': 'Percentage must be between 0 and 100'})
+    
+    if percentage < 100:
+        # Only the existence check runs per update; the write is buffered
+        existing = db.session.query(LearningProgress.is_completed).filter_by(
+            user_id=current_user.id,
+            resource_id=resource_id
+        ).first()
+        if existing is None:
+            return jsonify({'success': False, 'message': 'Progress record not found'})
+        
+        # Completed resources keep their 100%
+        if not existing.is_completed:
+            progress_buffer.record(current_app._get_current_object(), current_user.id, resource_id, percentage)
+        return jsonify({'success': True, 'message': 'Progress updated'})
+    
+    # Completion: write any buffered percentage first so it cannot overwrite this one
+    _flush_buffered_progress(resource_id)
+    
     progress = LearningProgress.query.filter_by(
         user_id=current_user.id,
         resource_id=resource_id
@@ -310,26 +360,15 @@ def update_progress(resource_id):
     if not progress:
         return jsonify({'success': False, 'message': 'Progress record not found'})
     
-    percentage = request.form.get('percentage')
-    if percentage is not None:
-        try:
-            percentage = float(percentage)
-            if 0 <= percentage <= 100:
-                progress.completion_percentage = percentage
-                
-                # If 100%, mark as completed
-                if percentage == 100:
-                    progress.is_completed = True
-                    progress.completed_at = datetime.utcnow()
-                
-                db.session.commit()
-                return jsonify({'success': True, 'message': 'Progress updated'})
-            else:
-                return jsonify({'success': False, 'message': 'Percentage must be between 0 and 100'})
-        except ValueError:
-            return jsonify({'success': False, 'message': 'Invalid percentage'})
+    learning_stats = lock_learning_stats(current_user.id)
+    previous_state = progress_state(progress)
+    progress.completion_percentage = percentage
+    progress.is_completed = True
+    progress.completed_at = datetime.utcnow()
     
-    return jsonify({'success': False, 'message': 'Percentage not provided'})
+    record_progress_change(learning_stats, progress, previous_state)
+    db.session.commit()
+    return jsonify({'success': True, 'message': 'Progress updated'})
 
 @learning_bp.route('/tips/<int:tip_id>/read', methods=['POST'])
 @login_required
@@ -363,13 +402,15 @@ def save_tip(tip_id):
 @login_required
 def change_path():
     """Change user's current learning path"""
-    path_id = request.form.get('learning_path_id')
+    path_id = request.form.get('learning_path_id', type=int)
     if not path_id:
         flash('No learning path selected', 'danger')
         return redirect(url_for('learning.home'))
     
     # Verify path exists
-    path = LearningPath.query.get_or_404(path_id)
+    path = get_catalog().get_path(path_id)
+    if not path:
+        abort(404)
     
     # Update user's learning progress
     learning_progress = current_user.learning_progress or {}
@@ -384,62 +425,7 @@ def change_path():
 # Helper functions
 def get_recommended_resources(user, limit=3):
     """Get personalized resource recommendations based on user profile"""
-    # Get user's difficulty level preference
-    difficulty = user.personal_profile.get('experience_level', 'Beginner')
-    
-    # Get user's preferred learning style
-    learning_style = user.personal_profile.get('preferred_learning_style', 'Text')
-    
-    # Get user's topics of interest
-    topics_of_interest = user.learning_progress.get('learning_topics', [])
-    
-    # Get user's completed resources
-    completed_resource_ids = []
-    progress_records = LearningProgress.query.filter_by(
-        user_id=user.id,
-        is_completed=True
-    ).all()
-    
-    for progress in progress_records:
-        completed_resource_ids.append(progress.resource_id)
-    
-    # Query for recommendations
-    query = LearningResource.query.filter(
-        LearningResource.id.notin_(completed_resource_ids)
-    )
-    
-    # Filter by difficulty
-    query = query.filter_by(difficulty_level=difficulty)
-    
-    # Apply topic filter if topics of interest exist
-    if topics_of_interest:
-        query = query.filter(LearningResource.topic.in_(topics_of_interest))
-    
-    # Apply learning style preference if applicable
-    if learning_style == 'Video':
-        query = query.filter_by(resource_type='video')
-    elif learning_style == 'Interactive':
-        query = query.filter_by(resource_type='quiz')
-    
-    # Get resources ordered by relevance (most recent first)
-    resources = query.order_by(LearningResource.created_at.desc()).limit(limit).all()
-    
-    # If not enough resources found, add some general ones
-    if len(resources) < limit:
-        additional_needed = limit - len(resources)
-        additional_ids = [r.id for r in resources]  # Don't repeat resources already selected
-        
-        additional_resources = LearningResource.query.filter(
-            LearningResource.id.notin_(completed_resource_ids + additional_ids)
-        ).filter_by(
-            difficulty_level=difficulty
-        ).order_by(
-            LearningResource.created_at.desc()
-        ).limit(additional_needed).all()
-        
-        resources.extend(additional_resources)
-    
-    return resources
+    return recommendation_engine.recommend(user, limit=limit)
 
 def create_default_learning_path(difficulty='Beginner'):
     """Create a default learning path if none exists"""
@@ -460,18 +446,3 @@ def create_default_learning_path(difficulty='Beginner'):
     db.session.add(path)
     db.session.commit()
     return path
-
-def create_default_tip(user_id):
-    """Create a default tip if none is available"""
-    tip = DailyTip(
-        user_id=user_id,
-        tip_title="Start Your Investment Journey",
-        tip_text="Begin with small investments to build your confidence and understanding of the market. Consider starting with mutual funds for diversification.",
-        tip_category="investing",
-        tip_difficulty="Beginner",
-        is_personalized=True
-    )
-    
-    db.session.add(tip)
-    db.session.commit()
-    return tip
\ No newline at end of file
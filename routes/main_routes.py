@@ -7,7 +7,14 @@ from utils.groq_api import GroqLLMProcessor
 from utils.yahoo_finance_api import YahooFinanceAPI
 from utils.rag_processor import RAGProcessor
 from utils.langchain_tools import LangChainManager
-from config import DEFAULT_STOCKS, INDIAN_MARKET_INDICES
+from utils.market_context import MarketContextCache
+from utils.concurrent_tasks import run_concurrently
+from utils.data_cache import cached_entry
+from utils.fragment_cache import render_fragment
+from utils.price_history import to_columnar
+from utils.quote_stream import quote_stream
+from utils.tax_rules import get_tax_advice, INVESTMENT_TYPES, HOLDING_PERIODS, INCOME_BRACKETS
+from config import DEFAULT_STOCKS, INDIAN_MARKET_INDICES, INSIGHTS_DEADLINE_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +27,9 @@ stock_client = YahooFinanceAPI()
 rag_client = RAGProcessor()
 langchain_manager = LangChainManager()
 
+# Market context reused by every insights question
+market_context = MarketContextCache(stock_client, news_client)
+
 @main_bp.route('/')
 def index():
     return render_template('index.html')
@@ -34,21 +44,25 @@ def dashboard():
         # Get latest news
         latest_news = news_client.get_latest_market_news(limit=5)
         
-        # Get user's watchlist stocks
-        watchlist_symbols = current_user.watchlist
-        watchlist_data = {}
-        if watchlist_symbols:
-            watchlist_data = stock_client.get_multiple_stocks(watchlist_symbols, period="1d")
+        # Watchlist quotes come from the live quote stream; symbols it has not
+        # polled yet are filled in by the page's subscription
+        watchlist_symbols = current_user.watchlist or []
+        watchlist_quotes = quote_stream.latest(watchlist_symbols)
         
-        # Get sector performance
-        sector_performance = stock_client.get_sector_performance()
+        # Get sector performance (chart data rendered once per data version)
+        sector_entry = cached_entry(stock_client.get_sector_performance)
+        fragments = {
+            'sector_data': render_fragment('partials/sector_data.html', sector_entry, 'sector_performance')
+        }
         
         return render_template(
             'dashboard.html',
+            fragments=fragments,
             market_summary=market_summary,
             latest_news=latest_news,
-            watchlist_data=watchlist_data,
-            sector_performance=sector_performance
+            watchlist_symbols=watchlist_symbols,
+            watchlist_quotes=watchlist_quotes,
+            sector_performance=sector_entry.value
         )
         
     except Exception as e:
@@ -57,9 +71,11 @@ def dashboard():
         # Provide empty data to prevent template errors
         return render_template(
             'dashboard.html',
+            fragments={},
             market_summary={},
             latest_news=[],
-            watchlist_data={},
+            watchlist_symbols=[],
+            watchlist_quotes={},
             sector_performance=[],
             regulatory_updates=[]
         )
@@ -73,19 +89,29 @@ def stocks():
         category = request.args.get('category')
         
         # Get all market indices organized by category
-        indices_by_category = stock_client.get_indices_by_category()
+        indices_entry = cached_entry(stock_client.get_indices_by_category)
         
         # Get sector performance for visualization
-        sector_performance = stock_client.get_sector_performance()
+        sector_entry = cached_entry(stock_client.get_sector_performance)
         
         # Get latest market news
         market_news = news_client.get_latest_market_news(limit=5)
         
+        # The index tables and sector data are the same for every user, so
+        # their HTML is rendered once per data version
+        fragments = {
+            'market_overview': render_fragment('partials/market_overview.html', indices_entry, 'indices_by_category'),
+            'indices_sidebar': render_fragment('partials/indices_sidebar.html', indices_entry, 'indices_by_category'),
+            'index_category_tabs': render_fragment('partials/index_category_tabs.html', indices_entry, 'indices_by_category'),
+            'sector_data': render_fragment('partials/sector_data.html', sector_entry, 'sector_performance')
+        }
+        
         return render_template(
             'stocks.html',
-            indices_by_category=indices_by_category,
+            fragments=fragments,
+            indices_by_category=indices_entry.value,
             market_indices=INDIAN_MARKET_INDICES,
-            sector_performance=sector_performance,
+            sector_performance=sector_entry.value,
             market_news=market_news,
             selected_category=category
         )
@@ -112,10 +138,14 @@ def stock_detail(symbol):
                 break
                 
         # Add additional index information if available
+        # (on a copy - stock data is shared through the data cache)
         if is_index and index_info:
-            data['info']['description'] = index_info.get('description', '')
-            data['info']['category'] = index_info.get('category', '')
-            data['info']['is_index'] = True
+            data = dict(data, info=dict(
+                data['info'],
+                description=index_info.get('description', ''),
+                category=index_info.get('category', ''),
+                is_index=True
+            ))
         
         # Get recent news about the stock/index
         entity_name = data.get('info', {}).get('shortName', symbol)
@@ -138,6 +168,7 @@ def stock_detail(symbol):
         return render_template(
             'stock_analysis.html',
             data=data,
+            price_history=to_columnar(data.get('history', [])),
             news=related_news,
             analysis=analysis,
             in_watchlist=in_watchlist,
@@ -224,8 +255,8 @@ def watchlist():
                 recommended_indices=recommended_indices  # Show recommended indices
             )
         
-        # Get data for watchlist stocks/indices
-        watchlist_data = stock_client.get_multiple_stocks(watchlist_symbols)
+        # Get data for watchlist stocks/indices (symbol -> stock data)
+        watchlist_data = stock_client.get_multiple_stocks(watchlist_symbols)['stocks']
         
         # Flag items that are indices versus individual stocks
         watchlist_indices = []
@@ -323,23 +354,24 @@ def financial_insights():
             return redirect(url_for('main.financial_insights'))
         
         try:
-            # Get market data for context
-            market_data = stock_client.get_market_summary()
-            
-            # Get recent news for context
-            news_data = news_client.get_latest_market_news(limit=5)
-            
-            # Create context
-            context = {
-                "market_summary": market_data,
-                "recent_news": news_data
-            }
-            
-            # Get insights from LLM
-            insights = llm_client.get_financial_insights(context, question)
+            # Shared, precompacted market summary and news (no external calls per question)
+            context = market_context.get().text
             
-            # Get relevant book insights
-            book_advice = rag_client.get_financial_advice_from_books(question, context)
+            # The market insights and the book advice are independent LLM calls,
+            # so run them concurrently and render whatever finishes in time
+            results = run_concurrently(
+                {
+                    "insights": lambda: llm_client.get_financial_insights(context, question),
+                    "book_advice": lambda: rag_client.get_financial_advice_from_books(question, context)
+                },
+                timeout=INSIGHTS_DEADLINE_SECONDS,
+                fallbacks={
+                    "insights": {"error": "Market insights are taking too long, please try again", "insights": ""},
+                    "book_advice": {"question": question, "answer": "", "references": []}
+                }
+            )
+            insights = results["insights"]
+            book_advice = results["book_advice"]
             
             return render_template(
                 'financial_insights.html',
@@ -411,8 +443,9 @@ def tax_advisor():
         income_bracket = request.form.get('income_bracket')
         
         try:
-            # Get tax advice
-            tax_advice = llm_client.get_tax_advice(
+            # The form offers a closed set of inputs, so the rules engine answers
+            # locally; the narrative comes from the precomputed cache
+            tax_advice = get_tax_advice(
                 investment_type=investment_type,
                 holding_period=holding_period,
                 income_bracket=income_bracket
@@ -432,36 +465,11 @@ def tax_advisor():
             return render_template('tax_advisor.html')
     
     # GET request
-    investment_types = [
-        "Equity Shares",
-        "Mutual Funds",
-        "Fixed Deposits",
-        "Real Estate",
-        "Gold",
-        "ELSS",
-        "PPF",
-        "NPS"
-    ]
-    
-    holding_periods = [
-        "Less than 1 year",
-        "1-3 years",
-        "More than 3 years"
-    ]
-    
-    income_brackets = [
-        "Up to ₹2.5 Lakh",
-        "₹2.5 Lakh - ₹5 Lakh",
-        "₹5 Lakh - ₹10 Lakh",
-        "₹10 Lakh - ₹50 Lakh",
-        "Above ₹50 Lakh"
-    ]
-    
     return render_template(
         'tax_advisor.html',
-        investment_types=investment_types,
-        holding_periods=holding_periods,
-        income_brackets=income_brackets
+        investment_types=INVESTMENT_TYPES,
+        holding_periods=HOLDING_PERIODS,
+        income_brackets=INCOME_BRACKETS
     )
 
 # Set up database reference
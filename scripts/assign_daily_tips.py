@@ -0,0 +1,43 @@
+"""
+Daily tip batch job.
+
+Chooses today's tip for every active user in bulk and stores it in
+daily_tip_assignments, which the learning home page reads. Schedule it once a
+day shortly after midnight UTC (it is safe to re-run).
+
+Usage:
+    python scripts/assign_daily_tips.py
+    python scripts/assign_daily_tips.py --date 2025-01-31 --active-days 60
+"""
+import sys
+import os
+import argparse
+import logging
+from datetime import date
+
+# Add the project directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+logger = logging.getLogger(__name__)
+
+
+def run(argv=None):
+    """Main function to assign daily tips"""
+    parser = argparse.ArgumentParser(description="Assign the daily tip of every active user")
+    parser.add_argument("--date", type=date.fromisoformat, help="day to assign (YYYY-MM-DD, default: today UTC)")
+    parser.add_argument("--active-days", type=int, default=30,
+                        help="only users who logged in within this many days (default: 30)")
+    parser.add_argument("--keep-days", type=int, default=7, help="days of old assignments to keep (default: 7)")
+    args = parser.parse_args(argv)
+
+    from app import app
+    from utils.daily_tips import assign_daily_tips, purge_tip_assignments
+
+    with app.app_context():
+        count = assign_daily_tips(for_date=args.date, active_days=args.active_days)
+        purged = purge_tip_assignments(keep_days=args.keep_days)
+        logger.info(f"Daily tip job finished: {count} assigned, {purged} old assignments removed")
+
+
+if __name__ == "__main__":
+    run()
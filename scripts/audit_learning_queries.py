@@ -0,0 +1,216 @@
+"""
+Index migration and query plan audit for the learning tables.
+
+Creates any missing indexes declared on the learning models (CREATE INDEX IF
+NOT EXISTS), then runs EXPLAIN for each hot query issued by the learning
+routes and reports the ones that need a sequential scan of a table.
+
+db.create_all() only creates indexes together with new tables, so run this
+with --apply once after deploying model index changes.
+
+Usage:
+    python scripts/audit_learning_queries.py
+    python scripts/audit_learning_queries.py --apply
+    python scripts/audit_learning_queries.py --user-id 42 --verbose
+
+Exits with status 1 when a query needs a sequential scan, so it can run in CI.
+"""
+import sys
+import os
+import argparse
+import json
+import logging
+
+# Add the project directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+logger = logging.getLogger(__name__)
+
+# Tables whose rows grow with users; scanning them is never acceptable
+LEARNING_TABLES = [
+    'learning_progress',
+    'learning_bookmarks',
+    'daily_tips',
+    'daily_tip_assignments',
+    'learning_resources',
+    'user_learning_stats',
+]
+
+
+def hot_queries(user_id):
+    """
+    The frequent queries of the learning pages
+
+    Args:
+        user_id (int): User to build the queries for
+
+    Returns:
+        list: (name, SQLAlchemy statement) tuples
+    """
+    from datetime import date
+    from models import LearningResource, LearningBookmark, LearningProgress, DailyTip, DailyTipAssignment, UserLearningStats
+
+    return [
+        ("progress_snapshot",
+         LearningProgress.query.filter_by(user_id=user_id).statement),
+        ("progress_for_resource",
+         LearningProgress.query.filter_by(user_id=user_id, resource_id=1).limit(1).statement),
+        ("bookmarks_for_user",
+         LearningBookmark.query.filter_by(user_id=user_id).statement),
+        ("bookmark_for_resource",
+         LearningBookmark.query.filter_by(user_id=user_id, resource_id=1).limit(1).statement),
+        ("personalized_daily_tip",
+         DailyTip.query.filter_by(user_id=user_id, read=False, is_personalized=True)
+         .order_by(DailyTip.created_at.desc()).limit(1).statement),
+        ("global_daily_tip",
+         DailyTip.query.filter_by(user_id=None, read=False, tip_difficulty='Beginner')
+         .order_by(DailyTip.created_at.desc()).limit(1).statement),
+        ("assigned_daily_tip",
+         DailyTipAssignment.query.filter_by(user_id=user_id, assigned_date=date.today()).limit(1).statement),
+        ("topic_resources",
+         LearningResource.query.filter_by(topic='Tax Planning')
+         .order_by(LearningResource.difficulty_level, LearningResource.duration_minutes).statement),
+        ("related_resources",
+         LearningResource.query.filter(
+             LearningResource.topic == 'Tax Planning',
+             LearningResource.id != 1,
+             LearningResource.difficulty_level == 'Beginner'
+         ).limit(3).statement),
+        ("learning_stats",
+         UserLearningStats.query.filter_by(user_id=user_id).statement),
+    ]
+
+
+def apply_indexes(db):
+    """
+    Create the indexes declared on the learning models that do not exist yet
+
+    Args:
+        db (SQLAlchemy): Flask-SQLAlchemy extension
+
+    Returns:
+        list: Names of the indexes checked
+    """
+    applied = []
+    for table_name in LEARNING_TABLES:
+        table = db.metadata.tables.get(table_name)
+        if table is None:
+            continue
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            index.create(bind=db.engine, checkfirst=True)
+            applied.append(index.name)
+            logger.info(f"Index {index.name} on {table_name} is present")
+    return applied
+
+
+def _postgres_seq_scans(plan, found):
+    """Collect the relations scanned sequentially in a Postgres JSON plan"""
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        _postgres_seq_scans(child, found)
+    return found
+
+
+def explain(connection, statement):
+    """
+    Explain one statement
+
+    Args:
+        connection (Connection): Database connection
+        statement: SQLAlchemy statement
+
+    Returns:
+        dict: Plan lines and the tables scanned sequentially
+    """
+    dialect = connection.dialect.name
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+
+    if dialect == "postgresql":
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        root = plan[0]["Plan"]
+        text_plan = [row[0] for row in connection.exec_driver_sql(f"EXPLAIN {sql}")]
+        return {"sql": sql, "plan": text_plan, "seq_scans": _postgres_seq_scans(root, [])}
+
+    if dialect == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+        details = [row[-1] for row in rows]
+        # "SCAN <table>" is a full table scan; "SEARCH <table> USING INDEX" is not
+        seq_scans = [
+            detail.split()[1] for detail in details
+            if detail.startswith("SCAN ") and "USING" not in detail and "INDEX" not in detail
+        ]
+        return {"sql": sql, "plan": details, "seq_scans": seq_scans}
+
+    raise ValueError(f"EXPLAIN audit is not supported for the {dialect} dialect")
+
+
+def audit(db, user_id, force_index=True):
+    """
+    Run EXPLAIN for every hot query
+
+    Args:
+        db (SQLAlchemy): Flask-SQLAlchemy extension
+        user_id (int): User to build the queries for
+        force_index (bool): Make the Postgres planner avoid sequential scans
+            when any index applies, so missing indexes show up even on small
+            development tables
+
+    Returns:
+        list: One result dict per query with its name, plan and sequential scans
+    """
+    results = []
+    with db.engine.connect() as connection:
+        if force_index and connection.dialect.name == "postgresql":
+            connection.exec_driver_sql("SET enable_seqscan = off")
+
+        for name, statement in hot_queries(user_id):
+            result = explain(connection, statement)
+            result["name"] = name
+            result["seq_scans"] = [table for table in result["seq_scans"] if table in LEARNING_TABLES]
+            results.append(result)
+
+        connection.rollback()
+
+    return results
+
+
+def run(argv=None):
+    """Main function to apply indexes and audit the learning query plans"""
+    parser = argparse.ArgumentParser(description="Audit query plans of the learning pages")
+    parser.add_argument("--apply", action="store_true", help="create missing indexes before auditing")
+    parser.add_argument("--user-id", type=int, default=1, help="user id used in the queries (default: 1)")
+    parser.add_argument("--no-force-index", action="store_true",
+                        help="let Postgres choose sequential scans on small tables")
+    parser.add_argument("--verbose", action="store_true", help="print the SQL and full plan of every query")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    from app import app, db
+
+    with app.app_context():
+        if args.apply:
+            apply_indexes(db)
+        results = audit(db, args.user_id, force_index=not args.no_force_index)
+
+    flagged = [result for result in results if result["seq_scans"]]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            status = "SEQ SCAN " + ", ".join(result["seq_scans"]) if result["seq_scans"] else "ok"
+            print(f"{result['name']:<26} {status}")
+            if args.verbose or result["seq_scans"]:
+                print(f"    {result['sql']}".replace("\n", " "))
+                for line in result["plan"]:
+                    print(f"    | {line}")
+        print(f"\n{len(flagged)} of {len(results)} queries need a sequential scan")
+
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,46 @@
+"""
+Backfill (or repair) the user_learning_stats aggregates from the raw
+learning progress and bookmark rows.
+
+Usage:
+    python scripts/backfill_learning_stats.py
+    python scripts/backfill_learning_stats.py --user-id 42
+"""
+import sys
+import os
+import argparse
+import logging
+
+# Add the project directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+logger = logging.getLogger(__name__)
+
+
+def run(argv=None):
+    """Main function to rebuild the learning stats"""
+    parser = argparse.ArgumentParser(description="Rebuild the per-user learning aggregates")
+    parser.add_argument("--user-id", type=int, help="only rebuild this user (default: all users)")
+    parser.add_argument("--batch-size", type=int, default=200, help="users per transaction (default: 200)")
+    args = parser.parse_args(argv)
+
+    from app import app, db
+    from utils.learning_stats import rebuild_learning_stats, rebuild_all_learning_stats
+
+    with app.app_context():
+        try:
+            if args.user_id is not None:
+                rebuild_learning_stats(args.user_id)
+                db.session.commit()
+                logger.info(f"Rebuilt learning stats for user {args.user_id}")
+            else:
+                count = rebuild_all_learning_stats(batch_size=args.batch_size)
+                logger.info(f"Rebuilt learning stats for {count} users")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error rebuilding learning stats: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,192 @@
+"""
+Offline retrieval benchmark for the book RAG retrievers.
+
+Runs a fixed set of Indian personal finance questions against each retriever
+and reports recall@k, MRR and p50/p99 retrieval latency. No database, network
+or API keys are needed.
+
+Usage:
+    python scripts/benchmark_retrieval.py
+    python scripts/benchmark_retrieval.py --k 5 --repeat 50 --retriever rag_processor
+    python scripts/benchmark_retrieval.py --json
+"""
+import sys
+import os
+import argparse
+import json
+import logging
+import math
+import time
+
+# Add the project directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_DATASET = os.path.join(os.path.dirname(__file__), 'data', 'rag_benchmark_questions.json')
+
+
+def build_rag_service_retriever():
+    """Keyword retrieval in RAGService over its default book corpus"""
+    from services.rag_service import RAGService, DEFAULT_BOOKS_DATA
+    service = RAGService(books_data=DEFAULT_BOOKS_DATA)
+
+    def retrieve(question, k):
+        return [
+            {"book": item.get("source", ""), "content": item.get("content", "")}
+            for item in service.retrieve_relevant_content(question, k=k)
+        ]
+
+    return retrieve
+
+
+def build_rag_processor_retriever():
+    """Keyword retrieval in RAGProcessor.query_books over its book content"""
+    from utils.rag_processor import RAGProcessor
+    processor = RAGProcessor()
+
+    def retrieve(question, k):
+        return [
+            {"book": item.get("book", ""), "content": item.get("content", "")}
+            for item in processor.query_books(question, None, num_results=k).get("results", [])
+        ]
+
+    return retrieve
+
+
+# Retriever name -> factory returning a retrieve(question, k) callable
+RETRIEVERS = {
+    "rag_service": build_rag_service_retriever,
+    "rag_processor": build_rag_processor_retriever,
+}
+
+
+def load_dataset(path):
+    """Load the benchmark questions"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)["questions"]
+
+
+def matches(result, expected):
+    """Check whether a retrieved passage is one of the expected passages"""
+    if expected["book"].lower() not in result["book"].lower():
+        return False
+    content = result["content"].lower()
+    return any(phrase.lower() in content for phrase in expected["phrases"])
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def evaluate(retrieve, questions, k=3, repeat=20):
+    """
+    Evaluate one retriever on the benchmark questions
+
+    Args:
+        retrieve (callable): retrieve(question, k) -> list of {"book", "content"}
+        questions (list): Benchmark questions with expected passages
+        k (int): Number of results to retrieve per question
+        repeat (int): Timed runs per question for latency percentiles
+
+    Returns:
+        dict: recall@k, MRR, latency percentiles and per-question details
+    """
+    latencies_ms = []
+    recalls = []
+    reciprocal_ranks = []
+    details = []
+
+    for item in questions:
+        question = item["question"]
+        expected = item["expected"]
+
+        results = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            results = retrieve(question, k)
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        results = results[:k]
+        found = [any(matches(result, passage) for result in results) for passage in expected]
+        recall = sum(found) / len(expected) if expected else 0.0
+
+        first_rank = next(
+            (rank for rank, result in enumerate(results, 1) if any(matches(result, passage) for passage in expected)),
+            None
+        )
+        reciprocal_rank = 1.0 / first_rank if first_rank else 0.0
+
+        recalls.append(recall)
+        reciprocal_ranks.append(reciprocal_rank)
+        details.append({
+            "id": item.get("id", question),
+            "recall": recall,
+            "first_relevant_rank": first_rank
+        })
+
+    return {
+        "k": k,
+        "questions": len(questions),
+        "recall_at_k": sum(recalls) / len(recalls) if recalls else 0.0,
+        "mrr": sum(reciprocal_ranks) / len(reciprocal_ranks) if reciprocal_ranks else 0.0,
+        "latency_p50_ms": percentile(latencies_ms, 50),
+        "latency_p99_ms": percentile(latencies_ms, 99),
+        "details": details
+    }
+
+
+def print_report(reports, show_details=False):
+    """Print benchmark results as a plain text table"""
+    header = f"{'retriever':<16} {'recall@k':>9} {'mrr':>7} {'p50 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, report in reports.items():
+        print(f"{name:<16} {report['recall_at_k']:>9.3f} {report['mrr']:>7.3f} "
+              f"{report['latency_p50_ms']:>9.3f} {report['latency_p99_ms']:>9.3f}")
+
+    if show_details:
+        for name, report in reports.items():
+            print(f"\n{name} (k={report['k']})")
+            for detail in report["details"]:
+                rank = detail["first_relevant_rank"] or "-"
+                print(f"  {detail['id']:<24} recall={detail['recall']:.2f} first_relevant_rank={rank}")
+
+
+def run(argv=None):
+    """Main function to run the retrieval benchmark"""
+    parser = argparse.ArgumentParser(description="Offline benchmark for book retrieval")
+    parser.add_argument("--k", type=int, default=3, help="number of results per question (default: 3)")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per question (default: 20)")
+    parser.add_argument("--retriever", action="append", choices=sorted(RETRIEVERS),
+                        help="retriever to benchmark (repeatable, default: all)")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET, help="path to the benchmark questions JSON")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--details", action="store_true", help="print per-question results")
+    parser.add_argument("--verbose", action="store_true", help="keep application log output")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        # Retrievers log on every call, which would drown the report and skew latency
+        logging.disable(logging.WARNING)
+
+    questions = load_dataset(args.dataset)
+
+    reports = {}
+    for name in args.retriever or sorted(RETRIEVERS):
+        retrieve = RETRIEVERS[name]()
+        reports[name] = evaluate(retrieve, questions, k=args.k, repeat=args.repeat)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_report(reports, show_details=args.details)
+
+    return reports
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,45 @@
+"""
+Tax advisor narrative precomputation.
+
+Asks the LLM to explain the computed tax treatment of every combination the
+tax advisor form offers (8 investment types x 3 holding periods x 5 income
+brackets) and saves the narratives to TAX_NARRATIVE_FILE. The tax advisor
+serves them from there; combinations without one get the narrative built
+from the tax rules. Re-run after changing utils/tax_rules.py with --overwrite.
+
+Usage:
+    python scripts/precompute_tax_narratives.py
+    python scripts/precompute_tax_narratives.py --overwrite
+"""
+import sys
+import os
+import argparse
+import logging
+
+# Add the project directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+logger = logging.getLogger(__name__)
+
+
+def run(argv=None):
+    """Main function to precompute the tax advisor narratives"""
+    parser = argparse.ArgumentParser(description="Precompute LLM narratives for the tax advisor")
+    parser.add_argument("--overwrite", action="store_true", help="regenerate narratives that already exist")
+    args = parser.parse_args(argv)
+
+    from utils.groq_api import GroqLLMProcessor
+    from utils.tax_rules import tax_narratives, all_combinations
+
+    llm_client = GroqLLMProcessor()
+    if not llm_client.api_key:
+        logger.error("GROQ_API_KEY is not set; the tax advisor will use the rule narratives")
+        return 1
+
+    generated = tax_narratives.precompute_llm_narratives(llm_client, overwrite=args.overwrite)
+    logger.info(f"Generated {generated} of {len(all_combinations())} tax narratives into {tax_narratives.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
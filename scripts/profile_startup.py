@@ -0,0 +1,156 @@
+"""
+Startup import-time profiler.
+
+Imports the application in a fresh interpreter with ``python -X importtime``
+and reports how long each module (and each top-level package) took to import,
+so heavy dependencies that sneak into the startup path are easy to spot.
+
+Usage:
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --top 40 --packages
+    python scripts/profile_startup.py --module routes.learning_routes --json
+"""
+import sys
+import os
+import argparse
+import json
+import subprocess
+from collections import defaultdict
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Dependencies that should only be imported when their subsystem is first used
+HEAVY_MODULES = [
+    "yfinance",
+    "pandas",
+    "numpy",
+    "groq",
+    "langchain",
+    "langchain_community",
+    "langchain_groq",
+    "faiss",
+]
+
+
+def profile_imports(module, env=None):
+    """
+    Import a module in a fresh interpreter and collect -X importtime output
+
+    Args:
+        module (str): Module to import (e.g. 'main')
+        env (dict): Extra environment variables for the child process
+
+    Returns:
+        list: One dict per imported module with self/cumulative time in ms and depth
+    """
+    child_env = dict(os.environ)
+    child_env.update(env or {})
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        env=child_env,
+        capture_output=True,
+        text=True
+    )
+
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    records = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        except ValueError:
+            continue
+
+        # Nesting is shown with two spaces per level before the module name
+        stripped = name.lstrip(" ")
+        depth = (len(name) - len(stripped) - 1) // 2
+
+        records.append({
+            "module": stripped.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": depth
+        })
+
+    return records
+
+
+def summarize_packages(records):
+    """
+    Aggregate self time by top-level package
+
+    Args:
+        records (list): Output of profile_imports()
+
+    Returns:
+        list: (package, total self time in ms, module count), slowest first
+    """
+    totals = defaultdict(float)
+    counts = defaultdict(int)
+    for record in records:
+        package = record["module"].split(".")[0]
+        totals[package] += record["self_ms"]
+        counts[package] += 1
+
+    return sorted(
+        ((package, totals[package], counts[package]) for package in totals),
+        key=lambda item: item[1],
+        reverse=True
+    )
+
+
+def run(argv=None):
+    """Main function to profile application startup"""
+    parser = argparse.ArgumentParser(description="Report import time per module for application startup")
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--top", type=int, default=25, help="number of modules to show (default: 25)")
+    parser.add_argument("--sort", choices=["cumulative", "self"], default="cumulative",
+                        help="sort modules by cumulative or self time (default: cumulative)")
+    parser.add_argument("--packages", action="store_true", help="also show totals per top-level package")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    # Keep background warm-up threads out of the measurement
+    records = profile_imports(args.module, env={"RAG_BACKGROUND_WARMUP": "false"})
+
+    total_ms = sum(record["cumulative_ms"] for record in records if record["depth"] == 0)
+    key = "cumulative_ms" if args.sort == "cumulative" else "self_ms"
+    slowest = sorted(records, key=lambda record: record[key], reverse=True)[:args.top]
+    imported_names = {record["module"] for record in records}
+    heavy_loaded = [name for name in HEAVY_MODULES if name in imported_names]
+
+    if args.json:
+        print(json.dumps({
+            "module": args.module,
+            "total_ms": total_ms,
+            "modules_imported": len(records),
+            "heavy_modules_loaded": heavy_loaded,
+            "slowest": slowest,
+            "packages": [
+                {"package": package, "self_ms": self_ms, "modules": count}
+                for package, self_ms, count in summarize_packages(records)
+            ] if args.packages else None
+        }, indent=2))
+        return
+
+    print(f"Importing '{args.module}' took {total_ms:.1f} ms ({len(records)} modules)")
+    print(f"Heavy modules loaded at startup: {', '.join(heavy_loaded) if heavy_loaded else 'none'}\n")
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for record in slowest:
+        print(f"{record['cumulative_ms']:>14.1f} {record['self_ms']:>9.1f}  {record['module']}")
+
+    if args.packages:
+        print(f"\n{'self ms':>9} {'modules':>8}  package")
+        for package, self_ms, count in summarize_packages(records)[:args.top]:
+            print(f"{self_ms:>9.1f} {count:>8}  {package}")
+
+
+if __name__ == "__main__":
+    run()
@@ -3,9 +3,12 @@ from datetime import datetime, timedelta
 from app import db
 from models import User, StockData, NewsItem, BookInsight, UserQuery
 from sqlalchemy.exc import SQLAlchemyError
+from utils.request_timing import timed_methods
 
 logger = logging.getLogger(__name__)
 
+# Every public method is timed as database work of the current request
+@timed_methods("db")
 class PostgreSQLService:
     """
     Service for interacting with PostgreSQL
@@ -1,11 +1,17 @@
 import os
 import logging
 import json
+import threading
 from datetime import datetime
 import requests
-from groq import Groq
-from config import GROQ_API_KEY, STOCK_ANALYSIS_TEMPLATE, NEWS_ANALYSIS_TEMPLATE, BOOK_RECOMMENDATION_TEMPLATE, FINANCIAL_QA_TEMPLATE
+from config import GROQ_API_KEY, STOCK_ANALYSIS_TEMPLATE, NEWS_ANALYSIS_TEMPLATE, BOOK_RECOMMENDATION_TEMPLATE, FINANCIAL_QA_TEMPLATE, NEWS_CONTEXT_TOKEN_BUDGET
 from services.db_service import db_service
+from utils.context_packer import ContextPacker
+from utils.lazy_import import lazy_import
+from utils.request_timing import span
+
+# The Groq SDK is imported when the first client is created
+groq = lazy_import("groq")
 
 logger = logging.getLogger(__name__)
 
@@ -16,18 +22,14 @@ class LLMService:
     def __init__(self):
         self.api_key = GROQ_API_KEY
         self.simplified_mode = False
+        self.model = "llama3-70b-8192"  # Using LLaMa 3 70B model
         
-        try:
-            if not self.api_key:
-                logger.warning("No Groq API key provided - using simplified mode")
-                self.simplified_mode = True
-                self.client = None
-            else:
-                self.client = Groq(api_key=self.api_key)
-            self.model = "llama3-70b-8192"  # Using LLaMa 3 70B model
-        except Exception as e:
-            logger.error(f"Error initializing Groq client: {e}")
-            self.client = None
+        # The Groq client is created on first use (see the client property)
+        self._client = None
+        self._client_lock = threading.Lock()
+        
+        if not self.api_key:
+            logger.warning("No Groq API key provided - using simplified mode")
             self.simplified_mode = True
         
         # Templates
@@ -35,6 +37,39 @@ class LLMService:
         self.news_analysis_template = NEWS_ANALYSIS_TEMPLATE
         self.book_recommendation_template = BOOK_RECOMMENDATION_TEMPLATE
         self.financial_qa_template = FINANCIAL_QA_TEMPLATE
+        
+        # Packs news and book context into prompts within a token budget
+        self.context_packer = ContextPacker()
+
+    @property
+    def client(self):
+        """
+        Groq client, created on first use
+        
+        Creating it lazily means each process (e.g. each forked gunicorn
+        worker) opens its own HTTP connection pool.
+        
+        Returns:
+            Groq: Groq client, or None in simplified mode
+        """
+        if self._client is None and not self.simplified_mode:
+            with self._client_lock:
+                if self._client is None and not self.simplified_mode:
+                    try:
+                        self._client = groq.Groq(api_key=self.api_key)
+                    except Exception as e:
+                        logger.error(f"Error initializing Groq client: {e}")
+                        self.simplified_mode = True
+        return self._client
+
+    def _complete(self, **kwargs):
+        """Create a chat completion, timed as a Groq call of the current request"""
+        with span("groq"):
+            return self.client.chat.completions.create(**kwargs)
+
+    def reset_client(self):
+        """Drop the Groq client so it is recreated with a fresh connection pool on next use"""
+        self._client = None
 
     def analyze_stock(self, stock_data, news_items):
         """
@@ -73,7 +108,7 @@ class LLMService:
             )
             
             # Make LLM API call
-            completion = self.client.chat.completions.create(
+            completion = self._complete(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a financial expert specializing in Indian stock markets. Provide detailed, accurate analysis with India-specific context."},
@@ -133,7 +168,7 @@ class LLMService:
             )
             
             # Make LLM API call
-            completion = self.client.chat.completions.create(
+            completion = self._complete(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a financial analyst specializing in Indian markets. Analyze news objectively and provide actionable insights with India-specific context."},
@@ -179,7 +214,7 @@ class LLMService:
             )
             
             # Make LLM API call
-            completion = self.client.chat.completions.create(
+            completion = self._complete(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a financial education expert specializing in Indian personal finance. Recommend books that are particularly relevant to Indian investors and financial contexts."},
@@ -238,7 +273,7 @@ class LLMService:
             Return only the keywords separated by commas, with no additional explanation or text."""
             
             # Make LLM API call
-            completion = self.client.chat.completions.create(
+            completion = self._complete(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a financial keyword extraction tool. Extract only the most relevant financial keywords."},
@@ -277,27 +312,36 @@ class LLMService:
             # Search for relevant news
             news_results = tavily_client.search_indian_financial_news(
                 query=keywords,
-                max_results=3
+                max_results=5
             )
             
             if not news_results or "error" in news_results or not news_results.get("results"):
                 logger.info(f"No news results found for keywords: {keywords}")
                 return ""
                 
-            # Format news for context
-            news_context = "Here is recent news that may be relevant to the question:\n\n"
-            
-            for idx, item in enumerate(news_results.get("results", [])[:3]):
+            # Rank news by search score and pack as much as fits in the budget
+            snippets = []
+            for item in news_results.get("results", []):
                 title = item.get("title", "")
                 content = item.get("content", "")
                 published = item.get("published_date", "")
                 source = item.get("source", "")
                 
-                news_context += f"[News {idx+1}] {title}\n"
-                news_context += f"Source: {source}, Date: {published}\n"
-                news_context += f"Summary: {content[:200]}...\n\n"
-                
-            return news_context
+                snippets.append({
+                    "text": f"{title}\nSource: {source}, Date: {published}\nSummary: {content}",
+                    "score": item.get("score", 0)
+                })
+            
+            packed = self.context_packer.pack(snippets, token_budget=NEWS_CONTEXT_TOKEN_BUDGET)
+            if not packed["snippets"]:
+                return ""
+            
+            news_items = [
+                f"[News {idx+1}] {snippet['text']}"
+                for idx, snippet in enumerate(packed["snippets"])
+            ]
+            
+            return "Here is recent news that may be relevant to the question:\n\n" + "\n\n".join(news_items) + "\n\n"
             
         except Exception as e:
             logger.error(f"Error getting news context from Tavily: {e}")
@@ -312,7 +356,8 @@ class LLMService:
             news_context = self.get_news_context_for_question(question)
             
             # Next, get an initial LLM response
-            from services.rag_service import rag_service
+            from services.rag_service import get_rag_service
+            rag_service = get_rag_service()
 
             # Format the initial prompt, including news context if available
             if news_context:
@@ -325,7 +370,7 @@ class LLMService:
                 )
             
             # Make initial LLM API call
-            initial_completion = self.client.chat.completions.create(
+            initial_completion = self._complete(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a financial advisor specializing in Indian personal finance, taxation, and investment. Provide accurate, detailed answers with India-specific context."},
@@ -349,7 +394,7 @@ class LLMService:
                 enhanced_prompt = f"{initial_prompt}\n{insights_for_prompt}\n\nPlease incorporate these book insights into your answer, weaving them naturally and seamlessly into your explanation. Don't simply list them as quotes or references."
                 
                 # Make enhanced LLM API call
-                enhanced_completion = self.client.chat.completions.create(
+                enhanced_completion = self._complete(
                     model=self.model,
                     messages=[
                         {"role": "system", "content": "You are a financial advisor specializing in Indian personal finance, taxation, and investment. Provide accurate, detailed answers with India-specific context. When insights from financial books are provided, weave them naturally into your response."},
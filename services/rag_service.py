@@ -1,29 +1,85 @@
+import copy
 import os
 import logging
 import json
+import threading
 from datetime import datetime
-from langchain_community.vectorstores import FAISS
+# langchain/FAISS are imported where they are used so importing this module stays cheap
 # Commented out until sentence-transformers package is installed
 # from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.schema import Document
-from config import FINANCIAL_BOOKS
-from services.db_service import db_service
+from config import FINANCIAL_BOOKS, BOOK_CONTEXT_TOKEN_BUDGET
+from utils.context_packer import ContextPacker
 
 logger = logging.getLogger(__name__)
 
+# Default book data, used when the database has no book insights yet
+DEFAULT_BOOKS_DATA = {
+    "Let's Talk Money by Monika Halan": {
+        "author": "Monika Halan",
+        "content": """Let's Talk Money is a comprehensive guide to managing personal finances in India. 
+        The book covers essential topics like budgeting, insurance, investments, retirement planning, and tax planning 
+        with specific focus on Indian financial products and regulations. 
+        Key insights include the Serenity System for organizing finances, the importance of term insurance 
+        over traditional policies, and investment strategies for Indians across different age groups and risk profiles.""",
+        "insights": [
+            "The Serenity System: A three-jar approach to organizing your money",
+            "Term insurance is the most cost-effective life insurance in India",
+            "Diversify investments across equity, debt, and gold based on your time horizon",
+            "Understand the tax implications of different investment options in India"
+        ],
+        "topics": ["Personal Finance", "Budgeting", "Insurance", "Investments", "Tax Planning"]
+    },
+    "The Intelligent Investor by Benjamin Graham": {
+        "author": "Benjamin Graham",
+        "content": """The Intelligent Investor is a classic investment guide that promotes value investing principles.
+        While written with US markets in mind, the core principles apply to Indian investors as well.
+        The book emphasizes fundamental analysis, margin of safety, and long-term investment strategies.
+        Indian investors can apply these concepts to BSE and NSE listed companies by focusing on
+        strong fundamentals, reasonable valuations, and avoiding market speculation.""",
+        "insights": [
+            "Value investing focuses on intrinsic value rather than market trends",
+            "Mr. Market analogy explains market volatility and irrational behavior",
+            "Margin of safety is essential for risk management in Indian equity markets",
+            "Defensive vs. Enterprising investor strategies can be applied to Indian portfolios"
+        ],
+        "topics": ["Value Investing", "Stock Analysis", "Risk Management", "Market Psychology"]
+    },
+    "Rich Dad Poor Dad by Robert Kiyosaki": {
+        "author": "Robert Kiyosaki",
+        "content": """Rich Dad Poor Dad contrasts the financial philosophies of the author's two father figures.
+        For Indian readers, the book's emphasis on financial education and asset building is particularly relevant.
+        The concepts of assets vs. liabilities can be applied to Indian investments like real estate, stocks, and business ownership.
+        The book's tax strategies, however, need to be adapted to Indian taxation laws and regulations.""",
+        "insights": [
+            "Build assets that generate passive income rather than working for money",
+            "Financial literacy is critical and often missing from traditional education in India",
+            "Understanding the difference between assets and liabilities in the Indian context",
+            "Entrepreneurship as a path to wealth creation for Indian professionals"
+        ],
+        "topics": ["Financial Education", "Asset Building", "Passive Income", "Entrepreneurship"]
+    }
+}
+
 class RAGService:
     """
     Service for Retrieval-Augmented Generation (RAG) using book insights
     """
-    def __init__(self):
+    def __init__(self, books_data=None):
+        """
+        Args:
+            books_data (dict): Book corpus to use instead of loading it from the
+                database (e.g. DEFAULT_BOOKS_DATA for offline evaluation)
+        """
+        # Packs retrieved insights into prompts within a token budget
+        self.context_packer = ContextPacker(separator="\n")
+        
         try:
             # Simplified initialization without HuggingFaceEmbeddings
             # This is a temporary measure until dependencies are resolved
             logger.warning("Initializing RAG Service in simplified mode")
             
             # Book data - In production, this would come from a database or files
-            self.books_data = self._initialize_book_data()
+            self.books_data = books_data if books_data is not None else self._initialize_book_data()
             
             # Skip vector store initialization
             self.vector_store = None
@@ -43,6 +99,9 @@ class RAGService:
         books_data = {}
         
         try:
+            # Imported here so the service can be used offline without the app/database
+            from services.db_service import db_service
+            
             # Check if we have book data in the database
             db_books = db_service.get_book_insights()
             
@@ -71,53 +130,8 @@ class RAGService:
             # If no books were loaded, use default data
             if not books_data:
                 logger.warning("No books found in database, using default book data")
-                # Default book data
-                books_data = {
-                    "Let's Talk Money by Monika Halan": {
-                        "author": "Monika Halan",
-                        "content": """Let's Talk Money is a comprehensive guide to managing personal finances in India. 
-                        The book covers essential topics like budgeting, insurance, investments, retirement planning, and tax planning 
-                        with specific focus on Indian financial products and regulations. 
-                        Key insights include the Serenity System for organizing finances, the importance of term insurance 
-                        over traditional policies, and investment strategies for Indians across different age groups and risk profiles.""",
-                        "insights": [
-                            "The Serenity System: A three-jar approach to organizing your money",
-                            "Term insurance is the most cost-effective life insurance in India",
-                            "Diversify investments across equity, debt, and gold based on your time horizon",
-                            "Understand the tax implications of different investment options in India"
-                        ],
-                        "topics": ["Personal Finance", "Budgeting", "Insurance", "Investments", "Tax Planning"]
-                    },
-                    "The Intelligent Investor by Benjamin Graham": {
-                        "author": "Benjamin Graham",
-                        "content": """The Intelligent Investor is a classic investment guide that promotes value investing principles.
-                        While written with US markets in mind, the core principles apply to Indian investors as well.
-                        The book emphasizes fundamental analysis, margin of safety, and long-term investment strategies.
-                        Indian investors can apply these concepts to BSE and NSE listed companies by focusing on
-                        strong fundamentals, reasonable valuations, and avoiding market speculation.""",
-                        "insights": [
-                            "Value investing focuses on intrinsic value rather than market trends",
-                            "Mr. Market analogy explains market volatility and irrational behavior",
-                            "Margin of safety is essential for risk management in Indian equity markets",
-                            "Defensive vs. Enterprising investor strategies can be applied to Indian portfolios"
-                        ],
-                        "topics": ["Value Investing", "Stock Analysis", "Risk Management", "Market Psychology"]
-                    },
-                    "Rich Dad Poor Dad by Robert Kiyosaki": {
-                        "author": "Robert Kiyosaki",
-                        "content": """Rich Dad Poor Dad contrasts the financial philosophies of the author's two father figures.
-                        For Indian readers, the book's emphasis on financial education and asset building is particularly relevant.
-                        The concepts of assets vs. liabilities can be applied to Indian investments like real estate, stocks, and business ownership.
-                        The book's tax strategies, however, need to be adapted to Indian taxation laws and regulations.""",
-                        "insights": [
-                            "Build assets that generate passive income rather than working for money",
-                            "Financial literacy is critical and often missing from traditional education in India",
-                            "Understanding the difference between assets and liabilities in the Indian context",
-                            "Entrepreneurship as a path to wealth creation for Indian professionals"
-                        ],
-                        "topics": ["Financial Education", "Asset Building", "Passive Income", "Entrepreneurship"]
-                    }
-                }
+                # Copy: the module-level default must not change with this instance
+                books_data = copy.deepcopy(DEFAULT_BOOKS_DATA)
                 
                 # Save these to the database
                 try:
@@ -159,6 +173,9 @@ class RAGService:
         Create a vector store from book data
         """
         try:
+            from langchain_community.vectorstores import FAISS
+            from langchain.schema import Document
+            
             documents = []
             
             for book_title, book_data in self.books_data.items():
@@ -207,43 +224,52 @@ class RAGService:
                 logger.warning("Using simplified keyword search instead of vector search")
                 # Simple fallback using keyword matching
                 results = []
-                query_lower = query.lower()
+                query_terms = [term.lower() for term in query.split() if len(term) > 3]
                 
                 # For each book, check if query terms appear in content
                 for book_title, book_data in self.books_data.items():
                     content = book_data.get("content", "")
-                    if any(term.lower() in content.lower() for term in query.split() if len(term) > 3):
+                    content_lower = content.lower()
+                    matches = sum(1 for term in query_terms if term in content_lower)
+                    if matches:
                         results.append({
                             "content": content[:200] + "...",  # First 200 chars
                             "source": book_title,
                             "author": book_data.get("author", "Unknown"),
-                            "type": "content"
+                            "type": "content",
+                            "score": matches / len(query_terms)
                         })
                     
                     # Also check insights
                     for insight in book_data.get("insights", []):
-                        if any(term.lower() in insight.lower() for term in query.split() if len(term) > 3):
+                        insight_lower = insight.lower()
+                        matches = sum(1 for term in query_terms if term in insight_lower)
+                        if matches:
                             results.append({
                                 "content": insight,
                                 "source": book_title,
                                 "author": book_data.get("author", "Unknown"),
-                                "type": "insight"
+                                "type": "insight",
+                                "score": matches / len(query_terms)
                             })
                 
-                # Return top k results
+                # Return top k results by score (stable sort keeps book order for ties)
+                results.sort(key=lambda x: x["score"], reverse=True)
                 return results[:k]
             
             # This code will not be reached in simplified mode
             # Search for relevant documents
-            docs = self.vector_store.similarity_search(query, k=k)
+            docs_with_scores = self.vector_store.similarity_search_with_score(query, k=k)
             
             results = []
-            for doc in docs:
+            for doc, distance in docs_with_scores:
                 results.append({
                     "content": doc.page_content,
                     "source": doc.metadata.get("source", "Unknown"),
                     "author": doc.metadata.get("author", "Unknown"),
-                    "type": doc.metadata.get("type", "content")
+                    "type": doc.metadata.get("type", "content"),
+                    # FAISS returns a distance - convert it so higher means more relevant
+                    "score": 1 / (1 + float(distance))
                 })
             
             return results
@@ -317,7 +343,17 @@ class RAGService:
         Returns both enhanced response and book references separately
         """
         try:
-            relevant_content = self.retrieve_relevant_content(query, k=3)
+            relevant_content = self.retrieve_relevant_content(query, k=10)
+            
+            # Keep only the best scoring insights that fit in the book context budget
+            packed = self.context_packer.pack(
+                [
+                    dict(item, text=f"- {item['content']} (From: {item['source']})")
+                    for item in relevant_content
+                ],
+                token_budget=BOOK_CONTEXT_TOKEN_BUDGET
+            )
+            relevant_content = packed["snippets"]
             
             if not relevant_content:
                 return {
@@ -338,9 +374,7 @@ class RAGService:
             # Format content to be added to the LLM prompt for reprocessing
             # This will allow the LLM to weave the book insights into its response
             book_insights_for_prompt = "\n\nRelevant insights from financial books that may help with this question:\n"
-            
-            for i, item in enumerate(relevant_content, 1):
-                book_insights_for_prompt += f"- {item['content']} (From: {item['source']})\n"
+            book_insights_for_prompt += packed["text"] + "\n"
             
             # The caller should use these book insights to enhance the prompt and get a new response
             # Return both the original response and book references
@@ -357,11 +391,51 @@ class RAGService:
                 "book_references": []
             }
 
-# Create a placeholder for the service instance
+# Shared service instance, built on first use by get_rag_service()
 rag_service = None
+_rag_service_lock = threading.Lock()
 
-def init_rag_service():
-    """Initialize the RAG service within application context"""
+def get_rag_service():
+    """
+    Get the shared RAG service, building it on first use
+    
+    Building loads the book corpus from the database, so the first call
+    must happen within an application context. Concurrent first calls
+    block until a single instance has been built.
+    
+    Returns:
+        RAGService: The shared service instance
+    """
     global rag_service
-    rag_service = RAGService()
+    if rag_service is None:
+        with _rag_service_lock:
+            if rag_service is None:
+                rag_service = RAGService()
     return rag_service
+
+def init_rag_service():
+    """Initialize the RAG service within application context"""
+    return get_rag_service()
+
+def warm_up_rag_service(app):
+    """
+    Build the RAG service on a background thread so the first request
+    that needs it does not pay the construction cost
+    
+    Args:
+        app (Flask): Application used to provide the database context
+        
+    Returns:
+        threading.Thread: The started warm-up thread
+    """
+    def warm_up():
+        try:
+            with app.app_context():
+                get_rag_service()
+            logger.info("RAG service warmed up in the background")
+        except Exception as e:
+            logger.error(f"Error warming up RAG service: {e}")
+    
+    thread = threading.Thread(target=warm_up, name="rag-service-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -1,10 +1,13 @@
 import logging
 import requests
-import yfinance as yf
-import pandas as pd
 from datetime import datetime, timedelta
 from services.db_service import db_service
 from config import INDIAN_STOCK_EXCHANGES, DEFAULT_STOCK_EXCHANGE
+from utils.lazy_import import lazy_import
+
+# Heavy dependencies are imported the first time market data is fetched
+yf = lazy_import("yfinance")
+pd = lazy_import("pandas")
 
 logger = logging.getLogger(__name__)
 
@@ -282,6 +282,36 @@ function createSectorPerformanceChart(ctx, sectorData) {
     return sectorChart;
 }
 
+// Offset of Indian Standard Time from UTC
+const IST_OFFSET_SECONDS = 5.5 * 3600;
+
+/**
+ * Format the epoch-second timestamps of a columnar price history as chart labels
+ * @param {Array} timestamps - Epoch seconds (the "t" column)
+ * @param {Boolean} withTime - Include the time of day (intraday bars)
+ * @returns {Array} Label strings
+ */
+function historyLabels(timestamps, withTime = false) {
+    // Label bars in Indian Standard Time (UTC+5:30, no daylight saving)
+    return timestamps.map(t => {
+        const iso = new Date((t + IST_OFFSET_SECONDS) * 1000).toISOString();
+        return withTime ? iso.slice(0, 16).replace('T', ' ') : iso.slice(0, 10);
+    });
+}
+
+/**
+ * Convert a columnar price history ({t, o, h, l, c, v}) into chart series
+ * @param {Object} history - Columnar history from /api/historical-data?format=columnar
+ * @returns {Object} Dates, prices (close) and volumes for the chart helpers
+ */
+function historySeries(history) {
+    return {
+        dates: historyLabels(history.t),
+        prices: history.c,
+        volumes: history.v
+    };
+}
+
 /**
  * Create Stock Price Chart for individual stock pages
  * @param {CanvasRenderingContext2D} ctx - The canvas context
@@ -88,13 +88,16 @@ document.addEventListener('DOMContentLoaded', function() {
     };
     
     // Load historical stock data from API
-    window.fetchHistoricalData = function(symbol, exchange = 'NSE', period = '1mo', callback) {
-        fetch(`/api/stocks/historical?symbol=${symbol}&exchange=${exchange}&period=${period}`)
+    // The callback receives columnar history ({t, o, h, l, c, v}, see historySeries in charts.js);
+    // pass points (e.g. the chart width) to have long ranges downsampled on the server
+    window.fetchHistoricalData = function(symbol, exchange = 'NSE', period = '1mo', callback, points = null) {
+        const pointsParam = points ? `&points=${Math.round(points)}` : '';
+        fetch(`/api/historical-data/${encodeURIComponent(symbol)}?period=${period}&format=columnar${pointsParam}`)
             .then(response => response.json())
             .then(data => {
-                if (data.success && data.historical_data) {
+                if (data.success && data.data) {
                     if (callback && typeof callback === 'function') {
-                        callback(data.historical_data);
+                        callback(data.data);
                     }
                 } else {
                     console.error('Error fetching historical data:', data.error);
@@ -106,6 +109,44 @@ document.addEventListener('DOMContentLoaded', function() {
             });
     };
     
+    // Live quotes: rows marked data-quote-symbol inside a [data-live-quotes] container
+    // are updated from the server's quote stream. The row's .quote-price and
+    // .quote-change elements get the new values, and .quote-change switches between
+    // the container's data-positive-class and data-negative-class.
+    window.subscribeQuotes = function(symbols, onQuotes) {
+        const source = new EventSource(`/api/quotes/stream?symbols=${encodeURIComponent(symbols.join(','))}`);
+        source.addEventListener('quotes', event => onQuotes(JSON.parse(event.data)));
+        // EventSource reconnects by itself after errors
+        return source;
+    };
+    
+    const liveQuotes = document.querySelector('[data-live-quotes]');
+    if (liveQuotes && typeof EventSource !== 'undefined') {
+        const positiveClass = liveQuotes.dataset.positiveClass;
+        const negativeClass = liveQuotes.dataset.negativeClass;
+        const rows = document.querySelectorAll('[data-quote-symbol]');
+        const symbols = [...new Set([...rows].map(row => row.dataset.quoteSymbol))];
+        
+        if (symbols.length > 0) {
+            window.subscribeQuotes(symbols, quotes => {
+                Object.entries(quotes).forEach(([symbol, quote]) => {
+                    document.querySelectorAll(`[data-quote-symbol="${CSS.escape(symbol)}"]`).forEach(row => {
+                        const price = row.querySelector('.quote-price');
+                        const change = row.querySelector('.quote-change');
+                        if (price) {
+                            price.textContent = window.formatIndianCurrency(quote.price);
+                        }
+                        if (change) {
+                            change.textContent = window.formatPercentage(quote.changePercent);
+                            change.classList.toggle(positiveClass, quote.changePercent > 0);
+                            change.classList.toggle(negativeClass, quote.changePercent <= 0);
+                        }
+                    });
+                });
+            });
+        }
+    }
+    
     // Submit financial question to insights API
     window.submitFinancialQuestion = function(query, callback) {
         fetch('/api/insights/question', {
@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+from collections import defaultdict, namedtuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app import db
+from models import LearningPath, LearningResource
+from config import CATALOG_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+# Read-only copies of the catalog rows; resources leave out their (large) content
+CatalogPath = namedtuple('CatalogPath', [column.key for column in LearningPath.__table__.columns])
+CatalogResource = namedtuple(
+    'CatalogResource',
+    [column.key for column in LearningResource.__table__.columns if column.key != 'content']
+)
+
+
+class CatalogSnapshot:
+    """
+    Immutable, indexed copy of the learning catalog at one version
+    """
+    def __init__(self, version, paths, resources):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.paths = tuple(sorted(paths, key=lambda path: path.id))
+        self.paths_by_id = {path.id: path for path in self.paths}
+        self.paths_by_name = {path.name: path for path in self.paths}
+        self.resources_by_id = {resource.id: resource for resource in resources}
+
+        paths_by_resource = defaultdict(list)
+        for path in self.paths:
+            for resource_id in path.resource_sequence:
+                paths_by_resource[resource_id].append(path)
+        self.paths_by_resource = {resource_id: tuple(paths) for resource_id, paths in paths_by_resource.items()}
+
+        resources_by_topic = defaultdict(list)
+        for resource in sorted(self.resources_by_id.values(), key=lambda resource: resource.id):
+            resources_by_topic[resource.topic].append(resource)
+        self.resources_by_topic = {topic: tuple(resources) for topic, resources in resources_by_topic.items()}
+
+    def get_path(self, path_id):
+        return self.paths_by_id.get(path_id)
+
+    def get_path_by_name(self, name):
+        return self.paths_by_name.get(name)
+
+    def get_resource(self, resource_id):
+        return self.resources_by_id.get(resource_id)
+
+    def paths_for_resource(self, resource_id):
+        """Learning paths containing a resource, in path ID order"""
+        return self.paths_by_resource.get(resource_id, ())
+
+    def resources_for_topic(self, topic):
+        """Resources of a topic, in resource ID order"""
+        return self.resources_by_topic.get(topic, ())
+
+
+class CatalogCache:
+    """
+    In-process cache of learning paths and resource metadata
+
+    The catalog only changes when content is seeded or edited. Committed ORM
+    writes to either table bump the version counter, and the next read
+    rebuilds the snapshot; changes made by other processes are picked up
+    once the snapshot is older than CATALOG_CACHE_TTL seconds.
+    """
+    def __init__(self, ttl=CATALOG_CACHE_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, snapshot):
+        return (
+            snapshot is not None
+            and snapshot.version == self.version
+            and time.monotonic() - snapshot.loaded_at < self.ttl
+        )
+
+    def get(self):
+        """
+        Get the current catalog snapshot, rebuilding it if it is stale
+
+        Returns:
+            CatalogSnapshot: The catalog
+        """
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                return snapshot
+
+            version = self.version
+            paths = [
+                CatalogPath(**{key: getattr(row, key) for key in CatalogPath._fields})
+                for row in db.session.query(*LearningPath.__table__.columns)
+            ]
+            # JSON lists are shared between requests, so store them as tuples
+            paths = [path._replace(
+                resource_sequence=tuple(path.resource_sequence or ()),
+                topics_covered=tuple(path.topics_covered or ())
+            ) for path in paths]
+
+            resources = [
+                CatalogResource(**{key: getattr(row, key) for key in CatalogResource._fields})
+                for row in db.session.query(*(LearningResource.__table__.columns[key] for key in CatalogResource._fields))
+            ]
+            resources = [resource._replace(prerequisites=tuple(resource.prerequisites or ())) for resource in resources]
+
+            snapshot = CatalogSnapshot(version, paths, resources)
+            self._snapshot = snapshot
+            logger.info(f"Loaded learning catalog v{version}: {len(paths)} paths, {len(resources)} resources")
+            return snapshot
+
+    def bump_version(self):
+        """Mark the cached catalog as stale"""
+        with self._lock:
+            self.version += 1
+
+
+catalog_cache = CatalogCache()
+
+
+def get_catalog():
+    """Get the cached learning catalog"""
+    return catalog_cache.get()
+
+
+# Bump the catalog version when a transaction that changed it commits
+_CHANGED_KEY = 'catalog_changed'
+
+
+@event.listens_for(LearningPath, 'after_insert')
+@event.listens_for(LearningPath, 'after_update')
+@event.listens_for(LearningPath, 'after_delete')
+@event.listens_for(LearningResource, 'after_insert')
+@event.listens_for(LearningResource, 'after_update')
+@event.listens_for(LearningResource, 'after_delete')
+def _catalog_row_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_catalog_version(session):
+    if session.info.pop(_CHANGED_KEY, False):
+        catalog_cache.bump_version()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_catalog_changes(session):
+    session.info.pop(_CHANGED_KEY, None)
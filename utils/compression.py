@@ -0,0 +1,96 @@
+"""
+Response compression
+
+Large JSON and HTML responses are compressed with brotli (when the brotli
+package is installed and the client accepts it) or gzip. Small responses
+are sent as is, since compressing them saves little and costs CPU.
+"""
+import gzip
+import logging
+from flask import request
+from config import COMPRESSION_MIN_BYTES, GZIP_LEVEL, BROTLI_QUALITY
+
+logger = logging.getLogger(__name__)
+
+# brotli is opt-in (not a declared dependency): install it to serve br to
+# clients that accept it; gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/html',
+    'text/css',
+    'text/javascript',
+    'text/plain',
+    'image/svg+xml',
+}
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response):
+    """
+    Compress a response body if it is large and the client accepts it
+
+    Args:
+        response (Response): Outgoing response
+
+    Returns:
+        Response: The same response, compressed when worthwhile
+    """
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or response.is_streamed
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    # Responses differ by encoding even when they end up uncompressed
+    response.vary.add('Accept-Encoding')
+
+    data = response.get_data()
+    if len(data) < COMPRESSION_MIN_BYTES:
+        return response
+
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+
+    # The compressed body is a different representation of the same content
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+    return response
+
+
+def init_compression(app):
+    """
+    Compress responses of the application
+
+    Args:
+        app (Flask): The application
+    """
+    app.after_request(compress_response)
@@ -0,0 +1,73 @@
+"""
+Run independent slow calls (LLM completions, external APIs) concurrently
+
+A request that needs several independent round trips submits them to the
+shared thread pool and waits for all of them up to one deadline, so its
+latency is that of the slowest call rather than their sum.
+"""
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from config import TASK_EXECUTOR_WORKERS
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Get the process-wide thread pool (created on first use, so a preloading
+    master process never starts threads that its workers would not inherit)
+
+    Returns:
+        ThreadPoolExecutor: The shared executor
+    """
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=TASK_EXECUTOR_WORKERS, thread_name_prefix="task")
+    return _executor
+
+
+def run_concurrently(tasks, timeout, fallbacks=None):
+    """
+    Run callables concurrently and collect the results that finish in time
+
+    Args:
+        tasks (dict): Name -> zero-argument callable
+        timeout (float): Shared deadline in seconds for all tasks
+        fallbacks (dict): Name -> result used when a task fails or misses the
+            deadline (default: None)
+
+    Returns:
+        dict: Name -> result (or fallback)
+    """
+    fallbacks = fallbacks or {}
+    executor = get_executor()
+    # Each task runs in a copy of the caller's context so its calls are
+    # attributed to the calling request (see utils/request_timing.py)
+    futures = {name: executor.submit(contextvars.copy_context().run, task) for name, task in tasks.items()}
+
+    done, not_done = wait(futures.values(), timeout=timeout)
+
+    results = {}
+    for name, future in futures.items():
+        if future in not_done:
+            # The thread keeps running to completion; its result is ignored
+            future.cancel()
+            logger.warning(f"Task '{name}' missed the {timeout}s deadline")
+            results[name] = fallbacks.get(name)
+            continue
+
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            logger.error(f"Error in task '{name}': {e}")
+            results[name] = fallbacks.get(name)
+
+    return results
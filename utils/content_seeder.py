@@ -0,0 +1,279 @@
+"""
+Bulk, idempotent loader for the learning catalog
+
+Learning resources, paths and global daily tips are declared in a content
+file (JSON, or YAML when PyYAML is installed). Each record gets a content
+hash; seed_content() inserts new records and updates changed ones with bulk
+statements in a single transaction, and skips records whose hash matches the
+last load, so it is safe (and cheap) to re-run.
+
+Records are identified by their natural key: resource title, path name and
+tip title. Rows that already exist under that key (e.g. loaded by an older
+seeding script) are adopted instead of duplicated.
+"""
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
+from sqlalchemy import insert, update
+from app import db
+from models import LearningResource, LearningPath, DailyTip, SeededContent
+
+logger = logging.getLogger(__name__)
+
+# PyYAML is optional - content files can always be JSON
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+DEFAULT_CONTENT_FILE = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'scripts', 'data', 'learning_content.json')
+)
+
+# Marks columns every record must provide
+REQUIRED = object()
+
+# Columns loaded from the content file, with the value used when a record omits them
+RESOURCE_FIELDS = {
+    "title": REQUIRED,
+    "description": REQUIRED,
+    "content": REQUIRED,
+    "resource_type": REQUIRED,
+    "topic": REQUIRED,
+    "subtopic": None,
+    "difficulty_level": "Beginner",
+    "duration_minutes": 5,
+    "thumbnail_url": None,
+    "external_url": None,
+    "is_premium": False,
+}
+PATH_FIELDS = {
+    "name": REQUIRED,
+    "description": REQUIRED,
+    "target_audience": REQUIRED,
+    "difficulty_level": REQUIRED,
+    "estimated_days": 30,
+    "topics_covered": [],
+}
+TIP_FIELDS = {
+    "tip_title": REQUIRED,
+    "tip_text": REQUIRED,
+    "tip_category": REQUIRED,
+    "tip_difficulty": "Beginner",
+}
+
+
+def load_content(path=DEFAULT_CONTENT_FILE):
+    """
+    Load a learning content file
+
+    Args:
+        path (str): Path to a .json, .yaml or .yml file
+
+    Returns:
+        dict: Content with 'resources', 'paths' and 'tips' lists
+    """
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise RuntimeError("PyYAML is required to load YAML content files")
+            content = yaml.safe_load(f)
+        else:
+            content = json.load(f)
+
+    for section in ("resources", "paths", "tips"):
+        content.setdefault(section, [])
+    return content
+
+
+def content_hash(record):
+    """
+    Hash a content record independently of key order and formatting
+
+    Args:
+        record (dict): Record from the content file
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _normalize(record, fields, kind):
+    """Pick the model columns from a record, filling in defaults"""
+    missing = [field for field, default in fields.items() if default is REQUIRED and record.get(field) is None]
+    if missing:
+        raise ValueError(f"{kind} record {record.get('title') or record.get('name') or record.get('tip_title')!r} "
+                         f"is missing {', '.join(missing)}")
+    return {field: record.get(field, default) for field, default in fields.items()}
+
+
+def _check_unique(keys, kind):
+    """Reject content files that declare the same natural key twice"""
+    duplicates = [key for key, count in Counter(keys).items() if count > 1]
+    if duplicates:
+        raise ValueError(f"Duplicate {kind} keys in content file: {', '.join(sorted(duplicates))}")
+
+
+def _upsert(kind, model, key_column, items, stats, extra_filters=(), insert_defaults=None):
+    """
+    Insert new and update changed rows of one kind with bulk statements
+
+    Args:
+        kind (str): Record kind stored in seeded_content
+        model: SQLAlchemy model
+        key_column: Model column holding the natural key
+        items (list): (key, column values, content hash) tuples
+        stats (dict): Counters to update
+        extra_filters (tuple): Extra filters when adopting existing rows
+        insert_defaults (dict): Extra column values for inserted rows only
+
+    Returns:
+        dict: Natural key -> row ID for every item
+    """
+    states = {
+        state.key: state for state in db.session.query(
+            SeededContent.id, SeededContent.key, SeededContent.row_id, SeededContent.content_hash
+        ).filter(SeededContent.kind == kind)
+    }
+
+    # Rows loaded before the seeder tracked hashes are adopted by natural key
+    unknown_keys = [key for key, _, _ in items if key not in states]
+    adopted = {}
+    if unknown_keys:
+        for row_id, key in db.session.query(model.id, key_column).filter(
+            key_column.in_(unknown_keys), *extra_filters
+        ).order_by(model.id):
+            adopted.setdefault(key, row_id)
+
+    ids_by_key = {}
+    new_items = []
+    row_updates = []
+    state_inserts = []
+    state_updates = []
+
+    for key, values, digest in items:
+        state = states.get(key)
+        if state is not None:
+            ids_by_key[key] = state.row_id
+            if state.content_hash == digest:
+                stats["unchanged"] += 1
+                continue
+            row_updates.append(dict(values, id=state.row_id))
+            state_updates.append({"id": state.id, "content_hash": digest})
+            stats["updated"] += 1
+        elif key in adopted:
+            ids_by_key[key] = adopted[key]
+            row_updates.append(dict(values, id=adopted[key]))
+            state_inserts.append({"kind": kind, "key": key, "row_id": adopted[key], "content_hash": digest})
+            stats["updated"] += 1
+        else:
+            new_items.append((key, values, digest))
+            stats["inserted"] += 1
+
+    if new_items:
+        row_ids = db.session.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            [dict(values, **(insert_defaults or {})) for _, values, _ in new_items]
+        ).all()
+        for (key, _, digest), row_id in zip(new_items, row_ids):
+            ids_by_key[key] = row_id
+            state_inserts.append({"kind": kind, "key": key, "row_id": row_id, "content_hash": digest})
+
+    if row_updates:
+        db.session.execute(update(model), row_updates)
+    if state_inserts:
+        db.session.execute(insert(SeededContent), state_inserts)
+    if state_updates:
+        db.session.execute(update(SeededContent), state_updates)
+
+    return ids_by_key
+
+
+def seed_content(content, dry_run=False):
+    """
+    Load learning content into the database in one transaction
+
+    Args:
+        content (dict): Output of load_content()
+        dry_run (bool): Compute the changes but roll them back
+
+    Returns:
+        dict: Per kind counts of inserted, updated and unchanged records
+    """
+    stats = {kind: {"inserted": 0, "updated": 0, "unchanged": 0} for kind in ("resources", "paths", "tips")}
+
+    try:
+        # Resources: prerequisites are given as titles and resolved to IDs after the upsert
+        resources = content["resources"]
+        _check_unique([record["title"] for record in resources], "resource")
+        resource_items = [
+            (record["title"], _normalize(record, RESOURCE_FIELDS, "resource"), content_hash(record))
+            for record in resources
+        ]
+        resource_ids = _upsert("resource", LearningResource, LearningResource.title, resource_items,
+                               stats["resources"])
+
+        known_titles = set(resource_ids)
+        prerequisite_updates = []
+        for record in resources:
+            missing = [title for title in record.get("prerequisites", []) if title not in known_titles]
+            if missing:
+                raise ValueError(f"Resource {record['title']!r} has unknown prerequisites: {', '.join(missing)}")
+            prerequisite_updates.append({
+                "id": resource_ids[record["title"]],
+                "prerequisites": [resource_ids[title] for title in record.get("prerequisites", [])]
+            })
+        if stats["resources"]["inserted"] or stats["resources"]["updated"]:
+            db.session.execute(update(LearningResource), prerequisite_updates)
+
+        # Paths reference their resources by title
+        paths = content["paths"]
+        _check_unique([record["name"] for record in paths], "path")
+        path_items = []
+        for record in paths:
+            missing = [title for title in record.get("resources", []) if title not in resource_ids]
+            if missing:
+                raise ValueError(f"Path {record['name']!r} has unknown resources: {', '.join(missing)}")
+            values = _normalize(record, PATH_FIELDS, "path")
+            values["resource_sequence"] = [resource_ids[title] for title in record.get("resources", [])]
+            # Resource IDs are part of the hash so re-created resources update the path
+            path_items.append((record["name"], values, content_hash(dict(record, resource_sequence=values["resource_sequence"]))))
+        _upsert("path", LearningPath, LearningPath.name, path_items, stats["paths"])
+
+        # Global daily tips
+        tips = content["tips"]
+        _check_unique([record["tip_title"] for record in tips], "tip")
+        tip_items = [
+            (record["tip_title"], _normalize(record, TIP_FIELDS, "tip"), content_hash(record))
+            for record in tips
+        ]
+        _upsert("tip", DailyTip, DailyTip.tip_title, tip_items, stats["tips"],
+                extra_filters=(DailyTip.user_id.is_(None),),
+                insert_defaults={"user_id": None, "is_personalized": False})
+
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error seeding learning content: {e}")
+        raise
+
+    if not dry_run:
+        _invalidate_caches()
+
+    return stats
+
+
+def _invalidate_caches():
+    """Bulk statements skip ORM events, so refresh the in-process caches explicitly"""
+    from utils.catalog_cache import catalog_cache
+    from utils.recommendation_engine import recommendation_engine
+
+    catalog_cache.bump_version()
+    recommendation_engine.invalidate()
@@ -0,0 +1,239 @@
+import json
+import logging
+import math
+import re
+from config import LLM_CONTEXT_TOKEN_BUDGET, TOKENIZER_ENCODING
+
+logger = logging.getLogger(__name__)
+
+# tiktoken is a dependency; fall back to a regex based estimate if it is missing
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Words and individual punctuation marks, roughly how BPE tokenizers split text
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+_ELLIPSIS = "..."
+
+_encoder = None
+_encoder_loaded = False
+
+
+def _get_encoder():
+    """
+    Load the local tokenizer once per process
+
+    Returns:
+        Encoding: tiktoken encoding, or None if it is not available
+    """
+    global _encoder, _encoder_loaded
+
+    if not _encoder_loaded:
+        _encoder_loaded = True
+        if tiktoken is None:
+            logger.warning("tiktoken not installed - using approximate token counts for context packing")
+        else:
+            try:
+                _encoder = tiktoken.get_encoding(TOKENIZER_ENCODING)
+            except Exception as e:
+                logger.warning(f"Could not load tokenizer '{TOKENIZER_ENCODING}', using approximate token counts: {e}")
+                _encoder = None
+
+    return _encoder
+
+
+def count_tokens(text):
+    """
+    Count the tokens in a piece of text
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Number of tokens (exact with tiktoken, estimated otherwise)
+    """
+    if not text:
+        return 0
+
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+
+    # Approximation: one token per punctuation mark, ~4 characters per token for words
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_PATTERN.findall(text))
+
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    Truncate text so that it fits within a token limit
+
+    Args:
+        text (str): Text to truncate
+        max_tokens (int): Maximum number of tokens to keep
+
+    Returns:
+        str: Truncated text (with a trailing ellipsis if anything was removed)
+    """
+    if max_tokens <= 0 or not text:
+        return ""
+
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    # Leave room for the ellipsis
+    keep_tokens = max(max_tokens - count_tokens(_ELLIPSIS), 0)
+
+    encoder = _get_encoder()
+    if encoder is not None:
+        tokens = encoder.encode(text, disallowed_special=())
+        return encoder.decode(tokens[:keep_tokens]).rstrip() + _ELLIPSIS
+
+    # Binary search for the longest prefix that fits
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle]) <= keep_tokens:
+            low = middle
+        else:
+            high = middle - 1
+
+    return text[:low].rstrip() + _ELLIPSIS
+
+
+def compact_json(data):
+    """
+    Serialize data to JSON without any insignificant whitespace
+
+    Args:
+        data: JSON-serializable data (non-serializable values are converted to strings)
+
+    Returns:
+        str: Compact JSON string
+    """
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class ContextPacker:
+    """
+    Packs candidate context snippets into an LLM prompt within a token budget
+    """
+    def __init__(self, token_budget=None, separator="\n\n"):
+        self.token_budget = token_budget if token_budget is not None else LLM_CONTEXT_TOKEN_BUDGET
+        self.separator = separator
+        self.separator_tokens = count_tokens(separator)
+
+    def pack(self, snippets, token_budget=None, min_snippet_tokens=32):
+        """
+        Fill the token budget with the highest scoring snippets
+
+        Args:
+            snippets (list): Dicts with a 'text' key and an optional 'score' key
+                (higher is more relevant); any other keys are passed through
+            token_budget (int): Budget override for this call
+            min_snippet_tokens (int): Smallest truncated snippet worth including
+
+        Returns:
+            dict: Packed text, token count, the snippets used and the number dropped
+        """
+        budget = token_budget if token_budget is not None else self.token_budget
+
+        # Highest score first; sorted() is stable so ties keep retrieval order
+        ranked = sorted(
+            (snippet for snippet in snippets if snippet.get("text")),
+            key=lambda snippet: snippet.get("score") or 0,
+            reverse=True
+        )
+
+        used = []
+        parts = []
+        used_tokens = 0
+
+        for snippet in ranked:
+            separator_cost = self.separator_tokens if parts else 0
+            remaining = budget - used_tokens - separator_cost
+            if remaining <= 0:
+                break
+
+            text = snippet["text"]
+            tokens = count_tokens(text)
+
+            if tokens > remaining:
+                # Only truncate when a meaningful part of the snippet still fits
+                if remaining < min_snippet_tokens:
+                    continue
+                text = truncate_to_tokens(text, remaining)
+                tokens = count_tokens(text)
+
+            parts.append(text)
+            used.append(dict(snippet, text=text, tokens=tokens))
+            used_tokens += tokens + separator_cost
+
+        return {
+            "text": self.separator.join(parts),
+            "token_count": used_tokens,
+            "snippets": used,
+            "dropped": len(ranked) - len(used)
+        }
+
+    def pack_json(self, data, token_budget=None):
+        """
+        Serialize a context dict as compact JSON that fits the token budget
+
+        Items are removed from the largest lists first (lowest 'score' first
+        when the items carry one) until the JSON fits.
+
+        Args:
+            data: Context data (dict, list or scalar)
+            token_budget (int): Budget override for this call
+
+        Returns:
+            str: Compact JSON context string
+        """
+        budget = token_budget if token_budget is not None else self.token_budget
+
+        serialized = compact_json(data)
+        if count_tokens(serialized) <= budget or not isinstance(data, (dict, list)):
+            return serialized
+
+        # Work on a copy so the caller's data is left untouched
+        trimmed = json.loads(serialized)
+
+        while count_tokens(serialized) > budget:
+            largest = self._largest_list(trimmed)
+            if not largest:
+                # Nothing left to drop - hard truncate the serialized string
+                return truncate_to_tokens(serialized, budget)
+
+            scores = [item.get("score") if isinstance(item, dict) else None for item in largest]
+            if any(isinstance(score, (int, float)) for score in scores):
+                lowest = min(range(len(largest)), key=lambda i: scores[i] if isinstance(scores[i], (int, float)) else float("-inf"))
+                largest.pop(lowest)
+            else:
+                largest.pop()
+
+            serialized = compact_json(trimmed)
+
+        return serialized
+
+    def _largest_list(self, data):
+        """
+        Find the non-empty list with the largest serialized size inside data
+        """
+        best = None
+        best_size = 0
+        stack = [data]
+
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                if node:
+                    size = len(compact_json(node))
+                    if size > best_size:
+                        best, best_size = node, size
+                stack.extend(node)
+
+        return best
@@ -0,0 +1,183 @@
+"""
+Daily tip assignment
+
+The daily tip of every active user is chosen ahead of time by
+assign_daily_tips() (run once a day by scripts/assign_daily_tips.py) and
+stored in daily_tip_assignments, so the learning home page only reads it.
+"""
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import insert, update
+from app import db
+from models import User, DailyTip, DailyTipAssignment
+
+logger = logging.getLogger(__name__)
+
+# Users per IN (...) list when loading tips and updating users
+USER_BATCH_SIZE = 1000
+
+DEFAULT_TIP = {
+    "tip_title": "Start Your Investment Journey",
+    "tip_text": "Begin with small investments to build your confidence and understanding of the market. Consider starting with mutual funds for diversification.",
+    "tip_category": "investing",
+}
+
+
+def get_assigned_tip(user_id, for_date=None, difficulty="Beginner"):
+    """
+    Get the tip assigned to a user for a day (no writes)
+
+    Users the batch job has not covered (new signups, users inactive for
+    longer than its window, or no job scheduled at all) get a tip chosen the
+    same way at read time, without storing an assignment.
+
+    Args:
+        user_id (int): User ID
+        for_date (date): Day of the assignment (default: today, UTC)
+        difficulty (str): User's experience level, for the fallback pick
+
+    Returns:
+        DailyTip: The assigned tip, or the fallback tip
+    """
+    assignment = DailyTipAssignment.query.filter_by(
+        user_id=user_id,
+        assigned_date=for_date or datetime.utcnow().date()
+    ).first()
+    if assignment:
+        return assignment.tip
+    return _pick_tip(user_id, difficulty)
+
+
+def _pick_tip(user_id, difficulty):
+    """Choose a tip like assign_daily_tips() does, read-only"""
+    tip = DailyTip.query.filter_by(
+        user_id=user_id,
+        read=False,
+        is_personalized=True
+    ).order_by(DailyTip.created_at.desc()).first()
+    if tip is None:
+        tip = DailyTip.query.filter_by(
+            user_id=None,
+            read=False,
+            tip_difficulty=difficulty
+        ).order_by(DailyTip.created_at.desc()).first()
+    if tip is None:
+        # Not added to the session: shown, but never stored from a page view
+        tip = DailyTip(user_id=None, tip_difficulty=difficulty, is_personalized=False, **DEFAULT_TIP)
+    return tip
+
+
+def _get_or_create_default_tip(difficulty):
+    """Get the shared default tip for a difficulty level, creating it if needed"""
+    tip = DailyTip.query.filter_by(
+        user_id=None,
+        tip_title=DEFAULT_TIP["tip_title"],
+        tip_difficulty=difficulty
+    ).first()
+    if tip is None:
+        tip = DailyTip(user_id=None, tip_difficulty=difficulty, is_personalized=False, **DEFAULT_TIP)
+        db.session.add(tip)
+        db.session.flush()
+    return tip
+
+
+def assign_daily_tips(for_date=None, active_days=30):
+    """
+    Choose the daily tip of every active user and store the assignments in bulk
+
+    Users get their newest unread personalized tip, otherwise the newest
+    unread global tip for their experience level, otherwise a shared default
+    tip. Users who turned daily tips off or already have an assignment for
+    the day are skipped, so the job is safe to re-run.
+
+    Args:
+        for_date (date): Day to assign tips for (default: today, UTC)
+        active_days (int): Only users who logged in within this many days
+
+    Returns:
+        int: Number of assignments created
+    """
+    for_date = for_date or datetime.utcnow().date()
+    active_since = datetime.utcnow() - timedelta(days=active_days)
+
+    users = db.session.query(User.id, User.preferences, User.personal_profile).filter(
+        User.last_login >= active_since
+    ).all()
+
+    already_assigned = {
+        user_id for (user_id,) in db.session.query(DailyTipAssignment.user_id).filter(
+            DailyTipAssignment.assigned_date == for_date
+        )
+    }
+
+    candidates = [
+        user for user in users
+        if user.id not in already_assigned and (user.preferences or {}).get('daily_tip', True)
+    ]
+    if not candidates:
+        logger.info(f"No daily tips to assign for {for_date}")
+        return 0
+
+    candidate_ids = [user.id for user in candidates]
+    id_batches = [candidate_ids[i:i + USER_BATCH_SIZE] for i in range(0, len(candidate_ids), USER_BATCH_SIZE)]
+
+    # Newest unread personalized tip per user (first row per user wins)
+    personalized = {}
+    for id_batch in id_batches:
+        for user_id, tip_id in db.session.query(DailyTip.user_id, DailyTip.id).filter(
+            DailyTip.user_id.in_(id_batch),
+            DailyTip.read == False,  # noqa: E712
+            DailyTip.is_personalized == True  # noqa: E712
+        ).order_by(DailyTip.user_id, DailyTip.created_at.desc()):
+            personalized.setdefault(user_id, tip_id)
+
+    # Newest unread global tip per difficulty level
+    global_tips = {}
+    for difficulty, tip_id in db.session.query(DailyTip.tip_difficulty, DailyTip.id).filter(
+        DailyTip.user_id.is_(None),
+        DailyTip.read == False  # noqa: E712
+    ).order_by(DailyTip.tip_difficulty, DailyTip.created_at.desc()):
+        global_tips.setdefault(difficulty, tip_id)
+
+    now = datetime.utcnow()
+    rows = []
+    for user in candidates:
+        tip_id = personalized.get(user.id)
+        if tip_id is None:
+            difficulty = (user.personal_profile or {}).get('experience_level', 'Beginner')
+            if difficulty not in global_tips:
+                global_tips[difficulty] = _get_or_create_default_tip(difficulty).id
+            tip_id = global_tips[difficulty]
+        rows.append({"user_id": user.id, "tip_id": tip_id, "assigned_date": for_date, "created_at": now})
+
+    try:
+        db.session.execute(insert(DailyTipAssignment), rows)
+        # last_login is set explicitly so its onupdate default does not touch it
+        for id_batch in id_batches:
+            db.session.execute(
+                update(User).where(User.id.in_(id_batch)).values(last_daily_tip=now, last_login=User.last_login)
+            )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error assigning daily tips for {for_date}: {e}")
+        raise
+
+    logger.info(f"Assigned daily tips to {len(rows)} users for {for_date}")
+    return len(rows)
+
+
+def purge_tip_assignments(keep_days=7):
+    """
+    Delete assignments older than keep_days
+
+    Args:
+        keep_days (int): Days of assignments to keep
+
+    Returns:
+        int: Number of assignments deleted
+    """
+    cutoff = datetime.utcnow().date() - timedelta(days=keep_days)
+    deleted = DailyTipAssignment.query.filter(DailyTipAssignment.assigned_date < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
@@ -0,0 +1,180 @@
+"""
+In-process TTL cache for market data and news
+
+Results of the Yahoo Finance and Tavily client methods are cached per
+arguments for a few minutes, so pages and API polls reuse one upstream
+fetch. Every stored value gets a new version number; requests record the
+versions they read so HTTP responses can derive their ETag from them (see
+utils/http_cache.py) without hashing the payload.
+
+Cached values are shared between requests and must not be mutated.
+"""
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from flask import g, has_app_context
+from config import DATA_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    __slots__ = ('value', 'version', 'expires_at')
+
+    def __init__(self, value, version, expires_at):
+        self.value = value
+        self.version = version
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self):
+        return time.monotonic() < self.expires_at
+
+
+class DataCache:
+    """
+    Bounded LRU cache with a TTL per entry and one fetch per key at a time
+    """
+    def __init__(self, max_entries=DATA_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._version = 0
+
+    def peek(self, key):
+        """
+        Get the fresh entry for a key without fetching
+
+        Args:
+            key (tuple): Cache key
+
+        Returns:
+            CacheEntry: The entry, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        return entry if entry is not None and entry.fresh else None
+
+    def get_or_fetch(self, key, fetch, ttl, cacheable=None):
+        """
+        Get a cached value, fetching and storing it when missing or expired
+
+        Args:
+            key (tuple): Cache key
+            fetch (callable): Zero-argument function producing the value
+            ttl (float): Seconds the value stays fresh
+            cacheable (callable): Predicate deciding whether a fetched value
+                is stored (e.g. to skip error results)
+
+        Returns:
+            CacheEntry: Entry holding the value and its version
+        """
+        entry = self.peek(key)
+        if entry is not None:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            return entry
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent misses for the same key wait for one fetch
+        with key_lock:
+            entry = self.peek(key)
+            if entry is not None:
+                return entry
+
+            try:
+                value = fetch()
+            except Exception:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+                raise
+
+            with self._lock:
+                self._version += 1
+                entry = CacheEntry(value, self._version, time.monotonic() + ttl)
+                if cacheable is None or cacheable(value):
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                # Only now: a request missing the key lock must find the entry
+                self._key_locks.pop(key, None)
+
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+data_cache = DataCache()
+
+
+def record_data_version(key, version):
+    """Remember in the current request which cached data version it used"""
+    if has_app_context():
+        g.setdefault('data_versions', {})[key] = version
+
+
+def _is_cacheable(value):
+    # Upstream failures are returned as {"error": ...}; retry them next time
+    return not (isinstance(value, dict) and value.get('error'))
+
+
+def _freeze(value):
+    """Hashable form of an argument (lists of symbols etc.)"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def cached(ttl):
+    """
+    Cache a client method's results per arguments for ttl seconds
+
+    The instance is not part of the key, so all clients of a class share the
+    cache.
+
+    Args:
+        ttl (float): Seconds a result stays fresh
+    """
+    def decorator(method):
+        name = method.__qualname__
+
+        def entry(self, *args, **kwargs):
+            key = (name, _freeze(args), _freeze(kwargs))
+            entry = data_cache.get_or_fetch(
+                key, lambda: method(self, *args, **kwargs), ttl, cacheable=_is_cacheable
+            )
+            record_data_version(key, entry.version)
+            return entry
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return entry(self, *args, **kwargs).value
+
+        wrapper.entry = entry
+        wrapper.uncached = method
+        return wrapper
+
+    return decorator
+
+
+def cached_entry(bound_method, *args, **kwargs):
+    """
+    Call a cached client method and get its cache entry (value and version)
+
+    Args:
+        bound_method: Method decorated with cached(), bound to a client
+
+    Returns:
+        CacheEntry: The entry
+    """
+    return bound_method.__func__.entry(bound_method.__self__, *args, **kwargs)
@@ -0,0 +1,112 @@
+"""
+Downsampling of long price series for charts
+
+A chart a few hundred pixels wide cannot show more points than it has
+pixels, so long ranges (5y, max) are reduced on the server before they are
+sent:
+
+- lttb_indices() picks the points that best preserve the line's visual shape
+  (Largest-Triangle-Three-Buckets, Steinarsson 2013) for line charts.
+- ohlc_bucket_starts() splits bars into equal buckets that are aggregated
+  into one OHLC bar each (open of the first bar, high/low over the bucket,
+  close of the last bar) for candlestick charts.
+"""
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+# LTTB always keeps the first and last point plus at least one bucket
+MIN_POINTS = 3
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Select the indices of the points kept by Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+
+    Args:
+        x (array-like): Increasing x values (e.g. epoch seconds)
+        y (array-like): y values; NaN points are only kept if a bucket has
+            nothing else
+        threshold (int): Number of points to keep
+
+    Returns:
+        numpy.ndarray: Sorted indices of the kept points
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < MIN_POINTS:
+        return np.arange(n)
+
+    # threshold - 2 buckets over the points between the first and the last
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+
+    # Bucket averages from cumulative sums; NaNs count as the bucket's mean
+    y_filled = np.where(np.isnan(y), np.nanmean(y), y)
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y_filled)))
+    counts = ends - starts
+    avg_x = (cum_x[ends] - cum_x[starts]) / counts
+    avg_y = (cum_y[ends] - cum_y[starts]) / counts
+    # The last bucket's "next bucket" is the last point
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y_filled[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    # Each bucket depends on the point kept in the previous one, so only the
+    # work inside a bucket is vectorized
+    for i in range(threshold - 2):
+        start, end = starts[i], ends[i]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[start:end] - y_filled[a])
+            - (x[a] - x[start:end]) * (next_y[i] - y_filled[a])
+        )
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[i + 1] = a
+    return selected
+
+
+def ohlc_bucket_starts(n, threshold):
+    """
+    Split n bars into threshold buckets of (nearly) equal size
+
+    Args:
+        n (int): Number of bars
+        threshold (int): Number of buckets
+
+    Returns:
+        numpy.ndarray: Index of the first bar of each bucket
+    """
+    if threshold >= n or threshold < 1:
+        return np.arange(n)
+    return np.linspace(0, n, threshold + 1).astype(np.int64)[:-1]
+
+
+def aggregate_ohlc(opens, highs, lows, closes, volumes, starts):
+    """
+    Aggregate bars into one OHLC bar per bucket
+
+    Args:
+        opens, highs, lows, closes, volumes (array-like): Bar columns
+        starts (numpy.ndarray): Index of the first bar of each bucket, as
+            returned by ohlc_bucket_starts()
+
+    Returns:
+        tuple: (opens, highs, lows, closes, volumes) arrays with one value
+            per bucket
+    """
+    ends = np.append(starts[1:], len(opens)) - 1
+    return (
+        np.asarray(opens, dtype=np.float64)[starts],
+        np.fmax.reduceat(np.asarray(highs, dtype=np.float64), starts),
+        np.fmin.reduceat(np.asarray(lows, dtype=np.float64), starts),
+        np.asarray(closes, dtype=np.float64)[ends],
+        np.add.reduceat(np.asarray(volumes, dtype=np.int64), starts),
+    )
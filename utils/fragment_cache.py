@@ -0,0 +1,75 @@
+"""
+Rendered HTML cache for widgets shared by every user
+
+Market widgets (index tables, sector performance) only depend on cached
+market data, not on the user. Each widget template is rendered once per
+version of its data (see utils/data_cache.py) and the HTML is reused by
+every page that shows it until the data is refetched.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from flask import render_template
+from markupsafe import Markup
+from config import FRAGMENT_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+
+class FragmentCache:
+    """
+    Bounded LRU cache of rendered template fragments keyed by data version
+    """
+    def __init__(self, max_entries=FRAGMENT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, template_name, version, **context):
+        """
+        Render a fragment template, or reuse the HTML rendered for this version
+
+        Args:
+            template_name (str): Template of the fragment
+            version: Version of the data the fragment shows (hashable)
+            **context: Template variables (must not depend on the user)
+
+        Returns:
+            Markup: Rendered HTML, safe to insert into a page
+        """
+        key = (template_name, version)
+        html = self._fragments.get(key)
+        if html is not None:
+            with self._lock:
+                if key in self._fragments:
+                    self._fragments.move_to_end(key)
+            return html
+
+        html = Markup(render_template(template_name, **context))
+        with self._lock:
+            self._fragments[key] = html
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+        return html
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+
+
+fragment_cache = FragmentCache()
+
+
+def render_fragment(template_name, entry, name):
+    """
+    Render a fragment from a data cache entry
+
+    Args:
+        template_name (str): Template of the fragment
+        entry (CacheEntry): Cached data shown by the fragment
+        name (str): Template variable the data is passed as
+
+    Returns:
+        Markup: Rendered HTML
+    """
+    return fragment_cache.render(template_name, entry.version, **{name: entry.value})
@@ -1,21 +1,60 @@
 import os
 import logging
+import threading
 import requests
-import json
 from datetime import datetime
-from config import GROQ_API_KEY
+from config import GROQ_API_KEY, INSIGHTS_DEADLINE_SECONDS
+from utils.context_packer import ContextPacker
+from utils.request_timing import timed
 
 logger = logging.getLogger(__name__)
 
+class LazyChatGroq:
+    """
+    LangChain Groq chat model, created on first use
+
+    Shared by the RAG processor and the LangChain manager so that importing
+    them stays cheap and each process creates its own client.
+    """
+    def __init__(self, api_key, model_name="llama3-70b-8192"):
+        self.api_key = api_key
+        self.model_name = model_name
+        self._llm = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Get the chat model, creating it if an API key is available
+
+        Returns:
+            ChatGroq: LLM client, or None without an API key
+        """
+        if self._llm is None and self.api_key:
+            with self._lock:
+                if self._llm is None:
+                    from langchain_groq import ChatGroq
+                    # Bounded so abandoned calls do not hold executor threads forever
+                    self._llm = ChatGroq(
+                        api_key=self.api_key,
+                        model_name=self.model_name,
+                        timeout=INSIGHTS_DEADLINE_SECONDS * 2,
+                        max_retries=1
+                    )
+        return self._llm
+
 class GroqLLMProcessor:
     def __init__(self, api_key=None):
         self.api_key = api_key or GROQ_API_KEY
         self.base_url = "https://api.groq.com/openai/v1/chat/completions"
         self.model = "llama3-70b-8192"  # Default model
         
+        # Keeps prompt context within the token budget
+        self.context_packer = ContextPacker()
+        
         if not self.api_key:
             logger.warning("Groq API key not provided. LLM functionality will be limited.")
     
+    @timed("groq")
     def get_financial_insights(self, context, query, model=None):
         """
         Get financial insights from Groq LLM
@@ -34,9 +73,9 @@ class GroqLLMProcessor:
         try:
             model = model or self.model
             
-            # Convert context to string if it's not already
+            # Convert context to a compact string that fits the token budget
             if isinstance(context, dict):
-                context_str = json.dumps(context, indent=2)
+                context_str = self.context_packer.pack_json(context)
             else:
                 context_str = str(context)
             
@@ -75,10 +114,12 @@ class GroqLLMProcessor:
                 "max_tokens": 2048
             }
             
+            # Bounded so abandoned calls do not hold executor threads forever
             response = requests.post(
                 self.base_url, 
                 headers=headers, 
-                json=payload
+                json=payload,
+                timeout=INSIGHTS_DEADLINE_SECONDS * 2
             )
             response.raise_for_status()
             
@@ -113,7 +154,7 @@ class GroqLLMProcessor:
             dict: Analysis and recommendations
         """
         # Create context with stock data
-        context = f"Stock Symbol: {stock_symbol}\n\nStock Data: {json.dumps(stock_data, indent=2)}"
+        context = f"Stock Symbol: {stock_symbol}\n\nStock Data: {self.context_packer.pack_json(stock_data)}"
         
         if additional_context:
             context += f"\n\nAdditional Context: {additional_context}"
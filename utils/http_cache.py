@@ -0,0 +1,102 @@
+"""
+HTTP caching for the JSON API
+
+http_cache() adds Cache-Control and an ETag to successful GET responses and
+answers conditional requests (If-None-Match) with 304 Not Modified. The ETag
+is derived from the versions of the cached market data the view read (see
+utils/data_cache.py). When every piece of data a URL used last time is still
+cached at the same version, a matching If-None-Match is answered without
+running the view at all.
+"""
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import g, request, make_response
+from utils.data_cache import data_cache
+
+# URL -> cache keys of the data its last response was built from
+_dependencies = OrderedDict()
+_dependencies_lock = threading.Lock()
+MAX_TRACKED_URLS = 2048
+
+
+def _etag_for(versions):
+    digest = hashlib.sha1(request.full_path.encode('utf-8'))
+    for key, version in sorted(versions.items(), key=lambda item: repr(item[0])):
+        digest.update(f"{key!r}={version};".encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def _current_etag(url):
+    """ETag the URL would get now, if all of its data is still cached"""
+    keys = _dependencies.get(url)
+    if not keys:
+        return None
+
+    versions = {}
+    for key in keys:
+        entry = data_cache.peek(key)
+        if entry is None:
+            return None
+        versions[key] = entry.version
+    return _etag_for(versions)
+
+
+def _remember_dependencies(url, keys):
+    with _dependencies_lock:
+        _dependencies[url] = keys
+        _dependencies.move_to_end(url)
+        while len(_dependencies) > MAX_TRACKED_URLS:
+            _dependencies.popitem(last=False)
+
+
+def _set_cache_headers(response, max_age, stale_while_revalidate):
+    # The API requires a login, so only the browser may store responses
+    response.headers['Cache-Control'] = (
+        f"private, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+    )
+    response.vary.add('Cookie')
+
+
+def http_cache(max_age, stale_while_revalidate=0):
+    """
+    Add validators and Cache-Control to a GET view and honor If-None-Match
+
+    Args:
+        max_age (int): Seconds the browser may reuse a response without asking
+        stale_while_revalidate (int): Extra seconds a stale response may be
+            shown while it is revalidated in the background
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            url = request.full_path
+
+            # Fast path: the client's copy is current and the data is still cached
+            if request.if_none_match:
+                etag = _current_etag(url)
+                if etag is not None and request.if_none_match.contains_weak(etag):
+                    response = make_response('', 304)
+                    response.set_etag(etag)
+                    _set_cache_headers(response, max_age, stale_while_revalidate)
+                    return response
+
+            g.data_versions = {}
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            versions = g.pop('data_versions', {})
+            if versions:
+                _remember_dependencies(url, tuple(versions))
+                response.set_etag(_etag_for(versions))
+            else:
+                response.add_etag()
+
+            _set_cache_headers(response, max_age, stale_while_revalidate)
+            return response.make_conditional(request)
+
+        return wrapper
+
+    return decorator
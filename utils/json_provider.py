@@ -0,0 +1,104 @@
+"""
+Fast JSON serialization for Flask responses
+
+Market data carries numpy scalars, pandas timestamps and datetimes. The
+FastJSONProvider serializes them natively with orjson (a declared
+dependency; the standard library encoder with the same conversions is only
+a fallback for environments without it), so data methods no longer convert
+every record to plain Python types.
+"""
+import datetime
+import decimal
+import logging
+import sys
+import uuid
+from flask.json.provider import DefaultJSONProvider
+
+logger = logging.getLogger(__name__)
+
+# orjson is a declared dependency; keep working with the standard library
+# encoder if an environment lacks it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    logger.warning("orjson not installed - using the slower standard library JSON encoder")
+
+
+def convert_default(obj):
+    """
+    Convert values the JSON encoders do not handle natively
+
+    Args:
+        obj: Value to convert
+
+    Returns:
+        A JSON-serializable equivalent
+
+    Raises:
+        TypeError: If the value cannot be converted
+    """
+    # numpy/pandas values can only exist once those modules were imported,
+    # so look them up instead of importing them at startup
+    pd = sys.modules.get('pandas')
+    np = sys.modules.get('numpy')
+
+    if pd is not None:
+        if obj is pd.NaT:
+            return None
+        if isinstance(obj, pd.Timestamp):
+            # A plain datetime is serialized natively by orjson (much faster than isoformat())
+            return obj.to_pydatetime()
+        if isinstance(obj, pd.DataFrame):
+            return obj.to_dict(orient='records')
+        if isinstance(obj, (pd.Series, pd.Index)):
+            return obj.tolist()
+    if np is not None:
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson
+    """
+    if orjson is not None:
+        _options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    default = staticmethod(convert_default)
+
+    def dumps(self, obj, **kwargs):
+        # Jinja's tojson filter asks for sorted keys, which orjson supports
+        sort_keys = kwargs.pop("sort_keys", False)
+        if orjson is None or kwargs:
+            # Callers asking for other stdlib options (indent, ...) get the stdlib encoder
+            kwargs.setdefault("default", convert_default)
+            return super().dumps(obj, sort_keys=sort_keys, **kwargs)
+        option = self._options | orjson.OPT_SORT_KEYS if sort_keys else self._options
+        return orjson.dumps(obj, default=convert_default, option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson is None:
+            return super().response(obj)
+        # Serialize straight to bytes, skipping the str round trip
+        return self._app.response_class(
+            orjson.dumps(obj, default=convert_default, option=self._options),
+            mimetype=self.mimetype
+        )
@@ -1,14 +1,10 @@
 import os
 import logging
-from langchain.chains import RetrievalQA
-from langchain.prompts import PromptTemplate
-from langchain_community.vectorstores import FAISS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.schema import Document
+# langchain/FAISS are imported where they are used so importing this module stays cheap
 # Commented out until sentence-transformers package is installed
 # from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_groq import ChatGroq
 from config import GROQ_API_KEY
+from utils.groq_api import LazyChatGroq
 
 logger = logging.getLogger(__name__)
 
@@ -16,20 +12,25 @@ class LangChainManager:
     def __init__(self, api_key=None):
         self.api_key = api_key or GROQ_API_KEY
         
+        # Groq LLM is created on first use (see the llm property) to keep startup cheap
+        self._llm = LazyChatGroq(self.api_key)
         if not self.api_key:
             logger.warning("Groq API key not provided. LangChain functionality will be limited.")
-            self.llm = None
-        else:
-            # Initialize Groq LLM
-            self.llm = ChatGroq(
-                api_key=self.api_key,
-                model_name="llama3-70b-8192"  # Default model
-            )
         
         # Skip embeddings initialization for now
         logger.warning("Using simple keyword matching instead of embeddings - sentence-transformers not installed")
         self.embeddings = None
     
+    @property
+    def llm(self):
+        """
+        Groq chat model, created on first use if an API key is available
+        
+        Returns:
+            ChatGroq: LLM client, or None without an API key
+        """
+        return self._llm.get()
+    
     def create_qa_chain(self, docs, prompt_template=None):
         """
         Create a question-answering chain with the given documents
@@ -46,6 +47,12 @@ class LangChainManager:
             return None
         
         try:
+            from langchain.chains import RetrievalQA
+            from langchain.prompts import PromptTemplate
+            from langchain.schema import Document
+            from langchain.text_splitter import RecursiveCharacterTextSplitter
+            from langchain_community.vectorstores import FAISS
+            
             # Convert to Document objects if they're just strings
             documents = []
             for doc in docs:
@@ -166,6 +173,8 @@ class LangChainManager:
         Returns:
             object: Investment advisor chain
         """
+        from langchain.schema import Document
+        
         # Prepare documents from multiple sources
         docs = []
         
@@ -227,6 +236,8 @@ class LangChainManager:
         Returns:
             object: Tax advisor chain
         """
+        from langchain.schema import Document
+        
         # Prepare tax documents
         docs = []
         for reg in tax_regulations:
@@ -0,0 +1,73 @@
+import importlib
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported on first attribute access
+
+    Heavy dependencies (yfinance, pandas, groq, ...) are declared with
+    lazy_import() at the top of a module so that importing the app does not
+    load them; the real import happens the first time the subsystem using
+    them does any work.
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Import the real module (once, thread-safe) and return it"""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    logger.debug(f"Lazily imported {self._name} in {(time.perf_counter() - start) * 1000:.1f} ms")
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """
+    Get a module that is imported on first use
+
+    Args:
+        name (str): Fully qualified module name (e.g. 'yfinance')
+
+    Returns:
+        module or LazyModule: The module itself if it is already imported,
+            otherwise a LazyModule proxy
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(name):
+    """
+    Check whether a module has actually been imported
+
+    Args:
+        name (str): Fully qualified module name
+
+    Returns:
+        bool: True if the module is in sys.modules
+    """
+    return name in sys.modules
@@ -1,84 +1,126 @@
-from flask import current_app
+from flask import current_app, g, has_app_context
 from models import LearningPath, LearningResource, LearningProgress, LearningBookmark
 from collections import defaultdict
+from sqlalchemy.orm import joinedload, selectinload
+from utils.learning_stats import get_learning_stats
+from utils.catalog_cache import get_catalog
+
+class ProgressSnapshot:
+    """
+    All of a user's learning progress, loaded with a single query
+
+    Backs the template helpers below so that checking progress for any number
+    of resources costs one query per request instead of one per resource.
+    """
+    def __init__(self, user_id, progress_records):
+        self.user_id = user_id
+        self.by_resource = {}  # resource_id -> LearningProgress
+        self.completed_ids = set()
+        self.completed_by_path = defaultdict(set)  # path_id -> completed resource ids
+        
+        for progress in progress_records:
+            self.by_resource[progress.resource_id] = progress
+            if progress.is_completed:
+                self.completed_ids.add(progress.resource_id)
+                if progress.path_id is not None:
+                    self.completed_by_path[progress.path_id].add(progress.resource_id)
+    
+    @classmethod
+    def load(cls, user_id):
+        """Load a snapshot of all progress records for a user"""
+        return cls(user_id, LearningProgress.query.filter_by(user_id=user_id).all())
+    
+    def get(self, resource_id):
+        """Get the progress record for a resource, or None if not started"""
+        return self.by_resource.get(resource_id)
+    
+    def is_completed(self, resource_id):
+        """Check if a resource is completed"""
+        return resource_id in self.completed_ids
+    
+    def completed_in_path(self, path):
+        """Count the resources of a path that were completed as part of that path"""
+        if not path or not path.resource_sequence:
+            return 0
+        completed = self.completed_by_path.get(path.id, ())
+        return sum(1 for r_id in path.resource_sequence if r_id in completed)
+
+def get_progress_snapshot(user_id):
+    """
+    Get the progress snapshot for a user, shared for the rest of the request
+    
+    Call invalidate_progress_snapshot() after changing progress records if
+    the same request renders them afterwards.
+    """
+    if not has_app_context():
+        return ProgressSnapshot.load(user_id)
+    
+    snapshots = g.setdefault('progress_snapshots', {})
+    if user_id not in snapshots:
+        snapshots[user_id] = ProgressSnapshot.load(user_id)
+    return snapshots[user_id]
+
+def invalidate_progress_snapshot(user_id):
+    """Discard the cached progress snapshot for a user in this request"""
+    if has_app_context():
+        g.setdefault('progress_snapshots', {}).pop(user_id, None)
+
+def get_bookmarks_with_resources(user_id, with_progress=False):
+    """
+    Get a user's bookmarks with their resources (and optionally progress) loaded
+    
+    Uses a fixed number of queries however many bookmarks the user has, so
+    templates can dereference bookmark.resource and bookmark.progress freely.
+    
+    Args:
+        user_id (int): User ID
+        with_progress (bool): Also load each bookmark's progress record
+        
+    Returns:
+        list: LearningBookmark objects
+    """
+    options = [joinedload(LearningBookmark.resource)]
+    if with_progress:
+        options.append(selectinload(LearningBookmark.progress))
+    return LearningBookmark.query.options(*options).filter_by(user_id=user_id).all()
 
 def get_learning_path(path_id):
-    """Helper to get a learning path by ID"""
-    return LearningPath.query.get(path_id)
+    """Helper to get a learning path by ID (from the catalog cache)"""
+    return get_catalog().get_path(path_id)
 
 def get_resource(resource_id):
-    """Helper to get a learning resource by ID"""
-    return LearningResource.query.get(resource_id)
+    """Helper to get a learning resource's metadata by ID (from the catalog cache)"""
+    return get_catalog().get_resource(resource_id)
 
 def get_path_progress(user_id, path_id):
     """Helper to get a user's progress percentage on a learning path"""
-    path = LearningPath.query.get(path_id)
-    if not path or not path.resource_sequence:
-        return 0
-    
-    # Get all user's progress records for this path
-    progress_records = LearningProgress.query.filter_by(
-        user_id=user_id,
-        path_id=path_id,
-        is_completed=True
-    ).all()
-    
-    # Calculate completion percentage
-    completed_resource_ids = [p.resource_id for p in progress_records]
-    total_resources = len(path.resource_sequence)
-    completed_path_resources = sum(1 for r_id in path.resource_sequence if r_id in completed_resource_ids)
-    
-    return (completed_path_resources / total_resources) * 100 if total_resources > 0 else 0
+    path = get_catalog().get_path(path_id)
+    return get_learning_stats(user_id).path_progress(path)
 
 def get_completed_resources_count(user_id, path_id):
     """Helper to get the count of completed resources on a learning path"""
-    path = LearningPath.query.get(path_id)
-    if not path or not path.resource_sequence:
-        return 0
-    
-    # Get all user's progress records for this path
-    progress_records = LearningProgress.query.filter_by(
-        user_id=user_id,
-        path_id=path_id,
-        is_completed=True
-    ).all()
-    
-    # Calculate completed resources that are part of this path
-    completed_resource_ids = [p.resource_id for p in progress_records]
-    completed_path_resources = sum(1 for r_id in path.resource_sequence if r_id in completed_resource_ids)
-    
-    return completed_path_resources
+    path = get_catalog().get_path(path_id)
+    return get_learning_stats(user_id).completed_in_path(path)
 
 def is_resource_completed(user_id, resource_id):
     """Helper to check if a resource is completed by the user"""
-    progress = LearningProgress.query.filter_by(
-        user_id=user_id,
-        resource_id=resource_id,
-        is_completed=True
-    ).first()
-    
-    return progress is not None
+    return get_progress_snapshot(user_id).is_completed(resource_id)
 
 def get_resource_progress(user_id, resource_id):
     """Helper to get a user's progress on a specific resource"""
-    return LearningProgress.query.filter_by(
-        user_id=user_id,
-        resource_id=resource_id
-    ).first()
+    return get_progress_snapshot(user_id).get(resource_id)
 
 def get_completed_bookmark_count(user_id, bookmarks):
     """Helper to get the count of completed bookmarked resources"""
-    completed_count = 0
-    for bookmark in bookmarks:
-        if is_resource_completed(user_id, bookmark.resource_id):
-            completed_count += 1
-    return completed_count
+    snapshot = get_progress_snapshot(user_id)
+    return sum(1 for bookmark in bookmarks if snapshot.is_completed(bookmark.resource_id))
 
 def get_not_started_bookmark_count(user_id, bookmarks):
     """Helper to get the count of bookmarked resources not started yet"""
+    snapshot = get_progress_snapshot(user_id)
     not_started_count = 0
     for bookmark in bookmarks:
-        progress = get_resource_progress(user_id, bookmark.resource_id)
+        progress = snapshot.get(bookmark.resource_id)
         if progress is None or progress.completion_percentage == 0:
             not_started_count += 1
     return not_started_count
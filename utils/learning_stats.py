@@ -0,0 +1,255 @@
+"""
+Maintenance of the per-user learning aggregates (user_learning_stats)
+
+Write paths lock the user's stats row with lock_learning_stats() BEFORE
+changing any progress or bookmark rows, apply the matching record_* function
+and commit everything in one transaction. Read paths use get_learning_stats(),
+which never writes: the row is created at signup, by the first write or by
+rebuild_all_learning_stats().
+"""
+import logging
+from collections import Counter
+from app import db
+from models import User, LearningResource, LearningBookmark, LearningProgress, UserLearningStats
+
+logger = logging.getLogger(__name__)
+
+
+def progress_state(progress):
+    """
+    Get the (completed, started) state of a progress record
+
+    Args:
+        progress (LearningProgress): Progress record, or None if not started
+
+    Returns:
+        tuple: (is_completed, has_started)
+    """
+    if progress is None:
+        return False, False
+    completed = bool(progress.is_completed)
+    return completed, completed or (progress.completion_percentage or 0) > 0
+
+
+def rebuild_learning_stats(user_id, persist=True):
+    """
+    Recompute a user's learning aggregates from the raw rows
+
+    Args:
+        user_id (int): User ID
+        persist (bool): Add a new row to the session (not committed); with
+            False a missing row is computed as a detached object only
+
+    Returns:
+        UserLearningStats: The rebuilt stats row
+    """
+    stats = db.session.get(UserLearningStats, user_id)
+    if stats is None:
+        stats = UserLearningStats(user_id=user_id)
+        if persist:
+            db.session.add(stats)
+
+    progress_records = LearningProgress.query.filter_by(user_id=user_id).all()
+    progress_by_resource = {progress.resource_id: progress for progress in progress_records}
+
+    completed_by_path = {}
+    completed_count = 0
+    started_count = 0
+    for progress in progress_records:
+        completed, started = progress_state(progress)
+        completed_count += completed
+        started_count += started
+        if completed and progress.path_id is not None:
+            completed_by_path.setdefault(str(progress.path_id), []).append(progress.resource_id)
+
+    bookmark_rows = db.session.query(LearningBookmark, LearningResource.topic).outerjoin(
+        LearningResource, LearningBookmark.resource_id == LearningResource.id
+    ).filter(LearningBookmark.user_id == user_id).all()
+
+    bookmark_topics = Counter()
+    completed_bookmarks = 0
+    started_bookmarks = 0
+    for bookmark, topic in bookmark_rows:
+        completed, started = progress_state(progress_by_resource.get(bookmark.resource_id))
+        completed_bookmarks += completed
+        started_bookmarks += started
+        if topic:
+            bookmark_topics[topic] += 1
+
+    stats.completed_count = completed_count
+    stats.started_count = started_count
+    stats.total_time_spent_minutes = sum(progress.time_spent_minutes or 0 for progress in progress_records)
+    stats.completed_by_path = {path_id: sorted(ids) for path_id, ids in completed_by_path.items()}
+    stats.bookmark_count = len(bookmark_rows)
+    stats.completed_bookmark_count = completed_bookmarks
+    stats.started_bookmark_count = started_bookmarks
+    stats.bookmarks_with_notes_count = sum(1 for bookmark, _ in bookmark_rows if bookmark.notes)
+    stats.bookmark_topics = dict(bookmark_topics)
+
+    return stats
+
+
+def get_learning_stats(user_id):
+    """
+    Get a user's learning aggregates with a single primary key lookup
+
+    Does not write: for users without a stats row yet (created before the
+    table and not backfilled) the aggregates are computed without saving
+    them; the next write path stores the row.
+
+    Args:
+        user_id (int): User ID
+
+    Returns:
+        UserLearningStats: The user's stats
+    """
+    stats = db.session.get(UserLearningStats, user_id)
+    if stats is not None:
+        return stats
+    return rebuild_learning_stats(user_id, persist=False)
+
+
+def lock_learning_stats(user_id):
+    """
+    Get a user's stats row locked for update in the current transaction
+
+    Must be called before the progress or bookmark rows are modified: a
+    missing row is rebuilt from the rows as they are before the change.
+
+    Args:
+        user_id (int): User ID
+
+    Returns:
+        UserLearningStats: The stats row (rebuilt if missing)
+    """
+    stats = UserLearningStats.query.filter_by(user_id=user_id).with_for_update().first()
+    if stats is None:
+        stats = rebuild_learning_stats(user_id)
+    return stats
+
+
+def _adjust_counts(stats, field, key, delta):
+    """Add delta to a count inside one of the JSON histogram columns"""
+    counts = dict(getattr(stats, field) or {})
+    value = counts.get(key, 0) + delta
+    if value > 0:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+    # Assign a new dict so SQLAlchemy sees the change
+    setattr(stats, field, counts)
+
+
+def _adjust_path_completion(stats, path_id, resource_id, completed):
+    """Add or remove a resource in the completed resource IDs of a path"""
+    by_path = dict(stats.completed_by_path or {})
+    ids = set(by_path.get(str(path_id), ()))
+    if completed:
+        ids.add(resource_id)
+    else:
+        ids.discard(resource_id)
+
+    if ids:
+        by_path[str(path_id)] = sorted(ids)
+    else:
+        by_path.pop(str(path_id), None)
+    # Assign a new dict so SQLAlchemy sees the change
+    stats.completed_by_path = by_path
+
+
+def record_progress_change(stats, progress, previous_state, time_added=0):
+    """
+    Apply a progress update to the stats row
+
+    Args:
+        stats (UserLearningStats): Locked stats row
+        progress (LearningProgress): The progress record after the change
+        previous_state (tuple): progress_state() before the change
+        time_added (int): Minutes added to time spent
+    """
+    was_completed, was_started = previous_state
+    completed, started = progress_state(progress)
+
+    stats.total_time_spent_minutes = (stats.total_time_spent_minutes or 0) + (time_added or 0)
+
+    if completed == was_completed and started == was_started:
+        return
+
+    completed_delta = int(completed) - int(was_completed)
+    started_delta = int(started) - int(was_started)
+
+    stats.completed_count = (stats.completed_count or 0) + completed_delta
+    stats.started_count = (stats.started_count or 0) + started_delta
+    if completed_delta and progress.path_id is not None:
+        _adjust_path_completion(stats, progress.path_id, progress.resource_id, completed_delta > 0)
+
+    is_bookmarked = LearningBookmark.query.filter_by(
+        user_id=progress.user_id,
+        resource_id=progress.resource_id
+    ).first() is not None
+
+    if is_bookmarked:
+        stats.completed_bookmark_count = (stats.completed_bookmark_count or 0) + completed_delta
+        stats.started_bookmark_count = (stats.started_bookmark_count or 0) + started_delta
+
+
+def _record_bookmark(stats, bookmark, resource, sign):
+    """Add (sign=1) or remove (sign=-1) a bookmark from the stats row"""
+    stats.bookmark_count = (stats.bookmark_count or 0) + sign
+    if bookmark.notes:
+        stats.bookmarks_with_notes_count = (stats.bookmarks_with_notes_count or 0) + sign
+    if resource is not None and resource.topic:
+        _adjust_counts(stats, 'bookmark_topics', resource.topic, sign)
+
+    progress = LearningProgress.query.filter_by(
+        user_id=bookmark.user_id,
+        resource_id=bookmark.resource_id
+    ).first()
+    completed, started = progress_state(progress)
+    stats.completed_bookmark_count = (stats.completed_bookmark_count or 0) + sign * completed
+    stats.started_bookmark_count = (stats.started_bookmark_count or 0) + sign * started
+
+
+def record_bookmark_added(stats, bookmark, resource):
+    """
+    Apply a new bookmark to the stats row
+
+    Args:
+        stats (UserLearningStats): Locked stats row
+        bookmark (LearningBookmark): The new bookmark
+        resource (LearningResource): The bookmarked resource
+    """
+    _record_bookmark(stats, bookmark, resource, 1)
+
+
+def record_bookmark_removed(stats, bookmark, resource):
+    """
+    Apply a removed bookmark to the stats row
+
+    Args:
+        stats (UserLearningStats): Locked stats row
+        bookmark (LearningBookmark): The bookmark being removed
+        resource (LearningResource): The bookmarked resource
+    """
+    _record_bookmark(stats, bookmark, resource, -1)
+
+
+def rebuild_all_learning_stats(batch_size=200):
+    """
+    Rebuild the learning aggregates of every user (backfill / repair)
+
+    Args:
+        batch_size (int): Users committed per transaction
+
+    Returns:
+        int: Number of users rebuilt
+    """
+    user_ids = [user_id for (user_id,) in db.session.query(User.id).order_by(User.id)]
+
+    for start in range(0, len(user_ids), batch_size):
+        for user_id in user_ids[start:start + batch_size]:
+            rebuild_learning_stats(user_id)
+        db.session.commit()
+        logger.info(f"Rebuilt learning stats for {min(start + batch_size, len(user_ids))}/{len(user_ids)} users")
+
+    return len(user_ids)
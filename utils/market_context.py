@@ -0,0 +1,207 @@
+"""
+Shared market context for LLM prompts
+
+Every financial insights question used to fetch the index summary from Yahoo
+Finance and the latest news from Tavily, then serialize both into the
+prompt. The market context changes slowly compared to how often questions
+are asked, so it is built once into a compact, token-counted string and
+reused by every request until it is older than MARKET_CONTEXT_REFRESH_SECONDS,
+when one background thread rebuilds it while requests keep using the old one.
+"""
+import logging
+import threading
+import time
+from config import MARKET_CONTEXT_REFRESH_SECONDS, MARKET_CONTEXT_TOKEN_BUDGET
+from utils.context_packer import ContextPacker, count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Characters of each news article kept in the context
+NEWS_SNIPPET_CHARS = 300
+
+# Seconds before a snapshot built from incomplete data is rebuilt
+PARTIAL_RETRY_SECONDS = 30
+
+
+class MarketContextUnavailable(Exception):
+    """
+    Raised when the market data or news could not be fetched
+
+    Attributes:
+        snapshot (MarketContextSnapshot): Snapshot of whatever was fetched
+            (marked partial), or None if nothing was
+    """
+    def __init__(self, message, snapshot=None):
+        super().__init__(message)
+        self.snapshot = snapshot
+
+
+class MarketContextSnapshot:
+    """
+    Compact market context at one point in time
+    """
+    def __init__(self, text, market_summary, news, partial=False):
+        self.text = text
+        # Built from incomplete data; replaced as soon as a full build succeeds
+        self.partial = partial
+        self.token_count = count_tokens(text)
+        self.market_summary = market_summary
+        self.news = news
+        self.built_at = time.time()
+        self._built_monotonic = time.monotonic()
+
+    @property
+    def age(self):
+        """Seconds since the snapshot was built"""
+        return time.monotonic() - self._built_monotonic
+
+
+def _round(value, digits=2):
+    return round(value, digits) if isinstance(value, (int, float)) else value
+
+
+def compact_market_context(market_summary, news):
+    """
+    Reduce the market summary and news to the fields useful in a prompt
+
+    Args:
+        market_summary (dict): Output of YahooFinanceAPI.get_market_summary()
+        news (dict): Output of TavilyNewsExtractor.get_latest_market_news()
+
+    Returns:
+        dict: Compact context data
+    """
+    indices = {}
+    for symbol, data in (market_summary or {}).get('indices', {}).items():
+        if data.get('error'):
+            continue
+        indices[data.get('name') or symbol] = {
+            'last': _round(data.get('last')),
+            'change': _round(data.get('change')),
+            'changePercent': _round(data.get('changePercent')),
+        }
+
+    articles = []
+    for article in (news or {}).get('results', []):
+        content = article.get('content', '')
+        if len(content) > NEWS_SNIPPET_CHARS:
+            content = content[:NEWS_SNIPPET_CHARS].rsplit(' ', 1)[0] + '...'
+        articles.append({
+            'title': article.get('title', ''),
+            'source': article.get('source', ''),
+            'date': article.get('published_date', ''),
+            'summary': content,
+            'score': article.get('score', 0),
+        })
+
+    context = {'indices': indices, 'news': articles}
+    if (news or {}).get('answer'):
+        context['news_overview'] = news['answer']
+    return context
+
+
+class MarketContextCache:
+    """
+    Keeps the latest market context snapshot for LLM prompts
+    """
+    def __init__(self, stock_client, news_client, refresh_seconds=MARKET_CONTEXT_REFRESH_SECONDS,
+                 token_budget=MARKET_CONTEXT_TOKEN_BUDGET, news_limit=5):
+        self.stock_client = stock_client
+        self.news_client = news_client
+        self.refresh_seconds = refresh_seconds
+        self.news_limit = news_limit
+        self.packer = ContextPacker(token_budget=token_budget)
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def build(self):
+        """
+        Fetch the market data and news and build a new snapshot
+
+        Returns:
+            MarketContextSnapshot: The new snapshot
+
+        Raises:
+            MarketContextUnavailable: If either source reported an error or
+                nothing usable was fetched (the clients return errors
+                instead of raising)
+        """
+        market_summary = self.stock_client.get_market_summary()
+        news = self.news_client.get_latest_market_news(limit=self.news_limit)
+
+        context = compact_market_context(market_summary, news)
+        errors = [
+            f"{source}: {result['error']}"
+            for source, result in (("market summary", market_summary), ("news", news))
+            if isinstance(result, dict) and result.get('error')
+        ]
+        has_content = bool(context['indices'] or context['news'])
+
+        # The packer drops the lowest scoring articles first when over budget
+        text = self.packer.pack_json(context)
+        if errors or not has_content:
+            partial = MarketContextSnapshot(text, market_summary, news, partial=True) if has_content else None
+            raise MarketContextUnavailable("; ".join(errors) or "no market data or news", partial)
+
+        snapshot = MarketContextSnapshot(text, market_summary, news)
+        logger.info(f"Built market context snapshot ({snapshot.token_count} tokens)")
+        return snapshot
+
+    def refresh(self):
+        """Rebuild the snapshot now, keeping the old one if the build fails"""
+        try:
+            snapshot = self.build()
+        except MarketContextUnavailable as e:
+            logger.warning(f"Market context incomplete, keeping the previous snapshot: {e}")
+            # Partial data is still better than none, or than older partial data
+            if e.snapshot is not None and (self._snapshot is None or self._snapshot.partial):
+                self._snapshot = e.snapshot
+            return self._snapshot
+        except Exception as e:
+            logger.error(f"Error refreshing market context: {e}")
+            return self._snapshot
+
+        self._snapshot = snapshot
+        return snapshot
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def refresh():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=refresh, name="market-context-refresh", daemon=True).start()
+
+    def get(self):
+        """
+        Get the current market context snapshot
+
+        The first call builds it; later calls return the cached snapshot
+        immediately and start a background rebuild once it is stale. While
+        the sources fail, a partial (or empty) snapshot is returned and
+        rebuilt every PARTIAL_RETRY_SECONDS.
+
+        Returns:
+            MarketContextSnapshot: The snapshot
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self.refresh()
+                    if snapshot is None:
+                        snapshot = self._snapshot = MarketContextSnapshot("", {}, {}, partial=True)
+            return snapshot
+
+        max_age = PARTIAL_RETRY_SECONDS if snapshot.partial else self.refresh_seconds
+        if snapshot.age >= max_age:
+            self._refresh_in_background()
+        return snapshot
@@ -0,0 +1,166 @@
+"""
+Price history payload formats
+
+get_stock_data() returns history as one dict per bar, repeating every column
+name for every bar. Charts only need a few columns, so the API can instead
+send them column by column:
+
+    {"t": [epoch seconds], "o": [...], "h": [...], "l": [...], "c": [...], "v": [...]}
+
+Prices are rounded to 7 significant digits (float32 precision, enough for
+any price chart) so they serialize to short numbers, and missing values are
+sent as null, since NaN is not valid JSON.
+
+Long ranges can be reduced to a target number of points first with
+downsample_history() (see utils/downsampling.py).
+"""
+import logging
+from datetime import datetime
+from utils.downsampling import lttb_indices, ohlc_bucket_starts, aggregate_ohlc
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+# Columnar key -> history record column
+PRICE_COLUMNS = {
+    "o": "Open",
+    "h": "High",
+    "l": "Low",
+    "c": "Close",
+}
+
+
+# Significant digits kept for columnar prices (what float32 holds)
+PRICE_DIGITS = 7
+
+
+def _is_missing(value):
+    # NaN is the only value not equal to itself
+    return value is None or value != value
+
+
+def _compact_price(value):
+    """A price rounded to PRICE_DIGITS significant digits, or None if missing"""
+    if _is_missing(value):
+        return None
+    return float(f"{value:.{PRICE_DIGITS}g}")
+
+
+def _volume(value):
+    return 0 if _is_missing(value) else int(value)
+
+
+def _bar_time(record):
+    """The bar's timestamp (daily bars use 'Date', intraday bars 'Datetime')"""
+    return record.get("Date", record.get("Datetime"))
+
+
+def _price_or_nan(record, column):
+    value = record.get(column)
+    return np.nan if value is None else value
+
+
+def _epoch_seconds(value):
+    if value is None:
+        return None
+    if hasattr(value, "timestamp"):
+        return int(value.timestamp())
+    # Older cached records may carry preformatted strings
+    return int(datetime.fromisoformat(str(value)).timestamp())
+
+
+# Downsampling methods accepted by downsample_history()
+DOWNSAMPLE_METHODS = ("lttb", "ohlc")
+
+
+def downsample_history(history, points, method="lttb"):
+    """
+    Reduce history records to at most the given number of bars
+
+    Args:
+        history (list): Records from get_stock_data()['history']
+        points (int): Target number of bars
+        method (str): 'lttb' keeps the bars that best preserve the shape of
+            the close line; 'ohlc' merges consecutive bars into one bar
+            per bucket (for candlestick charts)
+
+    Returns:
+        list: History records; the input list if it is already short enough
+    """
+    if not points or len(history) <= points:
+        return history
+
+    if method == "ohlc":
+        starts = ohlc_bucket_starts(len(history), points)
+        opens, highs, lows, closes, volumes = aggregate_ohlc(
+            [_price_or_nan(record, "Open") for record in history],
+            [_price_or_nan(record, "High") for record in history],
+            [_price_or_nan(record, "Low") for record in history],
+            [_price_or_nan(record, "Close") for record in history],
+            [_volume(record.get("Volume")) for record in history],
+            starts,
+        )
+        time_key = "Date" if "Date" in history[0] else "Datetime"
+        return [
+            {
+                time_key: _bar_time(history[start]),
+                "Open": float(opens[i]),
+                "High": float(highs[i]),
+                "Low": float(lows[i]),
+                "Close": float(closes[i]),
+                "Volume": int(volumes[i]),
+            }
+            for i, start in enumerate(starts)
+        ]
+
+    times = [_epoch_seconds(_bar_time(record)) for record in history]
+    closes = [_price_or_nan(record, "Close") for record in history]
+    return [history[i] for i in lttb_indices(times, closes, points)]
+
+
+def to_columnar(history):
+    """
+    Convert history records into columnar arrays
+
+    Args:
+        history (list): Records from get_stock_data()['history']
+
+    Returns:
+        dict: 't' (epoch seconds), 'o', 'h', 'l', 'c' (prices, None where
+            missing) and 'v' (volumes) lists
+    """
+    columns = {"t": [_epoch_seconds(_bar_time(record)) for record in history]}
+    for key, column in PRICE_COLUMNS.items():
+        columns[key] = [_compact_price(record.get(column)) for record in history]
+    columns["v"] = [_volume(record.get("Volume")) for record in history]
+    return columns
+
+
+def _point_value(value):
+    return None if _is_missing(value) else value
+
+
+def to_points(history):
+    """
+    Convert history records into the point list used by the chart scripts
+
+    Args:
+        history (list): Records from get_stock_data()['history']
+
+    Returns:
+        list: {'date', 'open', 'high', 'low', 'close', 'volume'} dicts
+            (None where missing)
+    """
+    return [
+        {
+            "date": _bar_time(record),
+            "open": _point_value(record.get("Open")),
+            "high": _point_value(record.get("High")),
+            "low": _point_value(record.get("Low")),
+            "close": _point_value(record.get("Close")),
+            "volume": _point_value(record.get("Volume")),
+        }
+        for record in history
+    ]
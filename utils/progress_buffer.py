@@ -0,0 +1,329 @@
+"""
+Write-behind buffer for learning progress updates
+
+The resource page reports reading progress many times per visit. Instead of
+a query and a commit per report, updates are coalesced in memory per
+(user, resource) - only the latest percentage matters - and written in one
+transaction every PROGRESS_FLUSH_INTERVAL seconds, when the buffer grows past
+PROGRESS_BUFFER_MAX_PENDING entries, and when the user completes a resource,
+opens a resource page or logs out.
+
+Every buffered update is also appended to a journal file owned by the
+process (named by PID plus a per-start token and held under an exclusive
+file lock), so updates that were not flushed when a process died are
+replayed by the next process that starts buffering. The lock, not the PID,
+decides whether the owner is gone: PIDs repeat after a container restart.
+"""
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from app import db
+from models import LearningProgress
+from config import PROGRESS_FLUSH_INTERVAL, PROGRESS_BUFFER_MAX_PENDING, PROGRESS_JOURNAL_DIR
+from utils.learning_stats import lock_learning_stats, progress_state, record_progress_change
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_PREFIX = "progress-"
+
+
+def _try_lock(f):
+    """Take an exclusive lock on an open file without blocking; False if another process holds it"""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+class ProgressBuffer:
+    """
+    Coalesces progress updates in memory and flushes them in batches
+    """
+    def __init__(self, flush_interval=PROGRESS_FLUSH_INTERVAL, max_pending=PROGRESS_BUFFER_MAX_PENDING,
+                 journal_dir=PROGRESS_JOURNAL_DIR):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.journal_dir = journal_dir
+        self._pending = {}  # (user_id, resource_id) -> {"percentage", "updated_at"}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._app = None
+        self._pid = None
+        self._token = None
+        self._thread = None
+        self._journal = None
+
+    # Process lifecycle
+
+    def _journal_path(self):
+        return os.path.join(self.journal_dir, f"{JOURNAL_PREFIX}{self._pid}-{self._token}.jsonl")
+
+    def _open_journal(self, path, mode="a"):
+        """Open (and lock) this process's journal"""
+        journal = open(path, mode, encoding="utf-8")
+        _try_lock(journal)
+        return journal
+
+    def _ensure_started(self, app):
+        """Start the flusher thread and journal in this process (again after a fork)"""
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+
+            self._app = app
+            self._pid = os.getpid()
+            self._token = uuid.uuid4().hex[:12]
+            self._pending = {}
+            self._journal = None
+            try:
+                os.makedirs(self.journal_dir, exist_ok=True)
+                self._journal = self._open_journal(self._journal_path())
+            except OSError as e:
+                logger.error(f"Progress journal unavailable, buffered updates are not durable: {e}")
+
+            self._replay_journals()
+
+            self._thread = threading.Thread(target=self._run, name="progress-buffer-flusher", daemon=True)
+            self._thread.start()
+
+        atexit.register(self.flush)
+
+    def _replay_journals(self):
+        """Load updates journaled by processes that died before flushing (lock held)"""
+        own_path = self._journal_path()
+        for path in glob.glob(os.path.join(self.journal_dir, f"{JOURNAL_PREFIX}*.jsonl")):
+            if path == own_path:
+                continue
+
+            try:
+                f = open(path, encoding="utf-8")
+            except OSError:
+                continue  # replayed by another process meanwhile
+            with f:
+                # A live owner (or another process replaying it) holds the lock
+                if not _try_lock(f):
+                    continue
+                # The owner may have compacted the journal after we opened it; then
+                # this lock is on the old, unlinked file and the live one is at path
+                if not self._is_current(f, path):
+                    continue
+                if fcntl is None and not self._owner_gone(path):
+                    continue
+
+                replayed = 0
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line of a crashed process
+                    self._add(entry["user_id"], entry["resource_id"], entry["percentage"], entry["updated_at"])
+                    replayed += 1
+                # Remove while still locked; the entries are in this process's journal now
+                try:
+                    if self._is_current(f, path):
+                        os.remove(path)
+                except OSError:
+                    pass
+            logger.info(f"Replayed {replayed} buffered progress updates from {os.path.basename(path)}")
+
+    @staticmethod
+    def _is_current(f, path):
+        """Whether an open journal is still the file at path (not replaced or removed)"""
+        try:
+            opened, current = os.fstat(f.fileno()), os.stat(path)
+        except OSError:
+            return False
+        return (opened.st_dev, opened.st_ino) == (current.st_dev, current.st_ino)
+
+    @staticmethod
+    def _owner_gone(path):
+        """Without file locks, fall back to checking whether the journal's PID still runs"""
+        try:
+            pid = int(os.path.basename(path)[len(JOURNAL_PREFIX):].split("-", 1)[0])
+            os.kill(pid, 0)
+        except ValueError:
+            return False
+        except ProcessLookupError:
+            return True
+        except OSError:
+            return False
+        return False
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing buffered progress updates: {e}")
+
+    # Buffering
+
+    def _add(self, user_id, resource_id, percentage, updated_at):
+        """Buffer one update and journal it (lock held)"""
+        key = (user_id, resource_id)
+        current = self._pending.get(key)
+        if current is not None and current["updated_at"] > updated_at:
+            return
+        self._pending[key] = {"percentage": percentage, "updated_at": updated_at}
+
+        if self._journal is not None:
+            self._journal.write(json.dumps({
+                "user_id": user_id, "resource_id": resource_id,
+                "percentage": percentage, "updated_at": updated_at
+            }) + "\n")
+            self._journal.flush()
+
+    def record(self, app, user_id, resource_id, percentage):
+        """
+        Buffer a progress update
+
+        Args:
+            app (Flask): The application (used by the background flusher)
+            user_id (int): User ID
+            resource_id (int): Resource ID
+            percentage (float): Completion percentage (below 100)
+        """
+        self._ensure_started(app)
+        with self._lock:
+            self._add(user_id, resource_id, percentage, time.time())
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def pending(self, user_id, resource_id):
+        """Get the buffered (not yet written) percentage for a resource, if any"""
+        entry = self._pending.get((user_id, resource_id))
+        return entry["percentage"] if entry else None
+
+    # Flushing
+
+    def flush(self, user_id=None, resource_id=None):
+        """
+        Write buffered updates to the database
+
+        Args:
+            user_id (int): Only flush this user's updates
+            resource_id (int): Only flush this resource (with user_id)
+
+        Returns:
+            int: Number of progress records updated
+        """
+        if self._app is None or self._pid != os.getpid():
+            return 0
+
+        with self._flush_lock:
+            with self._lock:
+                keys = [
+                    key for key in self._pending
+                    if (user_id is None or key[0] == user_id) and (resource_id is None or key[1] == resource_id)
+                ]
+                batch = {key: self._pending.pop(key) for key in keys}
+
+            if not batch:
+                return 0
+
+            try:
+                updated = self._write(batch)
+            except Exception:
+                # Put the updates back unless newer ones arrived meanwhile
+                with self._lock:
+                    for key, entry in batch.items():
+                        current = self._pending.get(key)
+                        if current is None or current["updated_at"] < entry["updated_at"]:
+                            self._pending[key] = entry
+                raise
+
+            self._compact_journal()
+            return updated
+
+    def _write(self, batch):
+        """Apply a batch of updates in one transaction"""
+        by_user = {}
+        for (user_id, resource_id), entry in batch.items():
+            by_user.setdefault(user_id, {})[resource_id] = entry
+
+        updated = 0
+        with self._app.app_context():
+            try:
+                for user_id, entries in by_user.items():
+                    learning_stats = lock_learning_stats(user_id)
+                    records = LearningProgress.query.filter(
+                        LearningProgress.user_id == user_id,
+                        LearningProgress.resource_id.in_(list(entries))
+                    ).all()
+
+                    for progress in records:
+                        entry = entries[progress.resource_id]
+                        if progress.is_completed:
+                            # Completed (possibly by another process after this update
+                            # was buffered); a partial percentage must not lower it
+                            continue
+                        previous_state = progress_state(progress)
+                        progress.completion_percentage = entry["percentage"]
+                        progress.last_accessed = datetime.utcfromtimestamp(entry["updated_at"])
+                        record_progress_change(learning_stats, progress, previous_state)
+                        updated += 1
+
+                    if len(records) < len(entries):
+                        logger.warning(f"Dropped {len(entries) - len(records)} buffered progress updates "
+                                       f"for user {user_id} without a progress record")
+
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error writing buffered progress updates: {e}")
+                raise
+
+        logger.debug(f"Flushed {updated} buffered progress updates")
+        return updated
+
+    def _compact_journal(self):
+        """Rewrite the journal with only the updates still pending"""
+        if self._journal is None:
+            return
+
+        with self._lock:
+            path = self._journal_path()
+            temp_path = f"{path}.tmp"
+            compacted = None
+            try:
+                # Lock the new file before it takes the journal's name
+                compacted = self._open_journal(temp_path, "w")
+                for (user_id, resource_id), entry in self._pending.items():
+                    compacted.write(json.dumps({
+                        "user_id": user_id, "resource_id": resource_id,
+                        "percentage": entry["percentage"], "updated_at": entry["updated_at"]
+                    }) + "\n")
+                compacted.flush()
+                os.replace(temp_path, path)
+            except OSError as e:
+                logger.error(f"Error compacting progress journal: {e}")
+                if compacted is not None:
+                    compacted.close()
+                return
+
+            self._journal.close()
+            self._journal = compacted
+
+
+progress_buffer = ProgressBuffer()
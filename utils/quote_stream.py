@@ -0,0 +1,159 @@
+"""
+Live quote push for the watchlist and dashboard pages
+
+Pages subscribe to a set of symbols over Server-Sent Events
+(/api/quotes/stream). One poller thread per process fetches the union of
+all subscribed symbols with a single upstream request every
+QUOTE_STREAM_INTERVAL seconds and hands each subscriber only the quotes
+that changed among its symbols. Upstream traffic grows with the number of
+distinct symbols being watched, not with users or page loads.
+
+Updates for a subscriber that is not reading are merged into its pending
+changes rather than queued, so a slow client costs at most one quote per
+symbol.
+"""
+import logging
+import os
+import threading
+from config import QUOTE_STREAM_INTERVAL
+from utils.yahoo_finance_api import YahooFinanceAPI
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteSubscription:
+    """
+    One client's symbols and the quote changes it has not received yet
+    """
+    def __init__(self, symbols):
+        self.symbols = frozenset(symbols)
+        self._pending = {}
+        self._condition = threading.Condition()
+
+    def publish(self, quotes):
+        """Merge changed quotes for this subscriber's symbols into its pending changes"""
+        relevant = {symbol: quote for symbol, quote in quotes.items() if symbol in self.symbols}
+        if not relevant:
+            return
+        with self._condition:
+            self._pending.update(relevant)
+            self._condition.notify()
+
+    def wait(self, timeout):
+        """
+        Wait for quote changes
+
+        Args:
+            timeout (float): Seconds to wait
+
+        Returns:
+            dict: Symbol -> quote for every symbol that changed (empty on timeout)
+        """
+        with self._condition:
+            if not self._pending:
+                self._condition.wait(timeout)
+            changes, self._pending = self._pending, {}
+        return changes
+
+
+class QuoteStream:
+    """
+    Polls quotes for every subscribed symbol and fans changes out to subscribers
+    """
+    def __init__(self, stock_client, interval=QUOTE_STREAM_INTERVAL):
+        self.stock_client = stock_client
+        self.interval = interval
+        self._subscriptions = set()
+        self._quotes = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def subscribe(self, symbols):
+        """
+        Register a subscriber; it immediately receives the last known quotes
+
+        Args:
+            symbols (iterable): Symbols to receive quotes for
+
+        Returns:
+            QuoteSubscription: The subscription (pass it to unsubscribe())
+        """
+        subscription = QuoteSubscription(symbols)
+        with self._lock:
+            known = {symbol: self._quotes[symbol] for symbol in subscription.symbols if symbol in self._quotes}
+            self._subscriptions.add(subscription)
+            self._ensure_poller()
+
+        subscription.publish(known)
+        if len(known) < len(subscription.symbols):
+            # Fetch the new symbols now instead of at the next interval
+            self._wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def latest(self, symbols):
+        """
+        Get the last polled quotes without fetching
+
+        Args:
+            symbols (iterable): Symbols to look up
+
+        Returns:
+            dict: Symbol -> quote for the symbols that have been polled
+        """
+        quotes = self._quotes
+        return {symbol: quotes[symbol] for symbol in symbols if symbol in quotes}
+
+    def _ensure_poller(self):
+        # Called with the lock held; a forked worker has no poller thread
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="quote-stream-poller", daemon=True)
+        self._thread.start()
+
+    def poll(self):
+        """Fetch quotes for all subscribed symbols once and publish the changes"""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        symbols = sorted(set().union(*(subscription.symbols for subscription in subscriptions)))
+        if not symbols:
+            return
+
+        quotes = self.stock_client.get_quotes(symbols)
+        with self._lock:
+            changed = {symbol: quote for symbol, quote in quotes.items() if self._quotes.get(symbol) != quote}
+            # Replace rather than mutate: latest() reads the dict without the lock
+            self._quotes = {**self._quotes, **quotes}
+            # Subscribers added from here on get the new quotes from subscribe()
+            subscriptions = list(self._subscriptions)
+
+        if changed:
+            for subscription in subscriptions:
+                subscription.publish(changed)
+
+    def _run(self):
+        logger.info("Quote stream poller started")
+        while True:
+            with self._lock:
+                if not self._subscriptions:
+                    # Stop when nobody listens; the next subscribe() starts a new poller
+                    self._thread = None
+                    break
+
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Error polling quotes: {e}")
+
+            self._wake.wait(self.interval)
+            self._wake.clear()
+        logger.info("Quote stream poller stopped")
+
+
+quote_stream = QuoteStream(YahooFinanceAPI())
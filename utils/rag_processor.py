@@ -1,14 +1,12 @@
 import os
 import logging
 import json
-# Import with comments for future use when sentence-transformers is installed
-from langchain_community.document_loaders import TextLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+# langchain/FAISS are imported where they are used so importing this module stays cheap
 # Commented out until sentence-transformers package is installed
 # from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain.chains import RetrievalQA
 from config import GROQ_API_KEY, FINANCIAL_BOOKS
+from utils.groq_api import LazyChatGroq
+from utils.context_packer import ContextPacker
 
 # Define RAG constants
 RAG_CHUNK_SIZE = 1000
@@ -22,24 +20,31 @@ class RAGProcessor:
         self.financial_books = FINANCIAL_BOOKS
         self.book_content = {}
         
+        # Keeps additional prompt context within the token budget
+        self.context_packer = ContextPacker()
+        
         # Skip embeddings initialization for now
         logger.warning("Using simple keyword matching instead of embeddings")
         self.embeddings = None
         
-        # Initialize LLM if API key is available
-        if self.api_key:
-            from langchain_groq import ChatGroq
-            self.llm = ChatGroq(
-                api_key=self.api_key,
-                model_name="llama3-70b-8192"
-            )
-        else:
+        # LLM is created on first use (see the llm property) to keep startup cheap
+        self._llm = LazyChatGroq(self.api_key)
+        if not self.api_key:
             logger.warning("Groq API key not provided. RAG functionality will be limited.")
-            self.llm = None
         
         # Load predefined book content for India-specific financial books
         self._load_book_content()
     
+    @property
+    def llm(self):
+        """
+        Groq chat model, created on first use if an API key is available
+        
+        Returns:
+            ChatGroq: LLM client, or None without an API key
+        """
+        return self._llm.get()
+    
     def _load_book_content(self):
         """
         Load predefined content for financial books
@@ -202,6 +207,9 @@ class RAGProcessor:
             return None
         
         try:
+            from langchain.text_splitter import RecursiveCharacterTextSplitter
+            from langchain_community.vectorstores import FAISS
+            
             # Prepare documents
             docs = []
             
@@ -372,8 +380,11 @@ class RAGProcessor:
             
             # Add additional context if provided
             additional_context = ""
-            if context:
-                additional_context = f"\nAdditional context:\n{json.dumps(context, indent=2)}"
+            if isinstance(context, str):
+                # Already compacted (e.g. the shared market context)
+                additional_context = f"\nAdditional context:\n{context}"
+            elif context:
+                additional_context = f"\nAdditional context:\n{self.context_packer.pack_json(context)}"
             
             # Create prompt
             prompt = f"""
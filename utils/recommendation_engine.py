@@ -0,0 +1,329 @@
+import bisect
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict, namedtuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app import db
+from models import LearningResource
+from config import RECOMMENDATION_CACHE_TTL, RECOMMENDATION_MAX_SEGMENTS
+from utils.learning_helpers import get_progress_snapshot
+from utils.learning_stats import get_learning_stats
+
+logger = logging.getLogger(__name__)
+
+# Lightweight copy of the resource columns used for ranking
+ResourceRecord = namedtuple('ResourceRecord', ['id', 'topic', 'difficulty_level', 'resource_type', 'created_ts'])
+
+# Preferred learning style -> resource type it is restricted to
+LEARNING_STYLE_TYPES = {
+    'Video': 'video',
+    'Interactive': 'quiz',
+}
+
+# How much topic affinity can lift a resource over pure recency (0-1 recency scale)
+AFFINITY_WEIGHT = 0.5
+BOOKMARK_AFFINITY = 2
+PROGRESS_AFFINITY = 1
+
+# Candidates considered for re-ranking, as a multiple of the requested limit
+CANDIDATE_WINDOW = 10
+
+
+def record_from_resource(resource):
+    """Build the lightweight ranking record of a LearningResource"""
+    created_at = resource.created_at
+    return ResourceRecord(
+        id=resource.id,
+        topic=resource.topic,
+        difficulty_level=resource.difficulty_level,
+        resource_type=resource.resource_type,
+        created_ts=created_at.timestamp() if created_at else 0.0
+    )
+
+
+class RecommendationEngine:
+    """
+    Serves learning resource recommendations from pre-ranked segments
+
+    A segment is the list of resource IDs matching a (difficulty, resource
+    type, topic set) combination, ranked newest first. Segments are built on
+    first use and cached; at read time completed resources are skipped with a
+    set lookup and the head of the segment is re-ranked by the user's topic
+    affinity (bookmarks and progress). New resources are inserted into the
+    cached segments as they are committed; the whole cache is also reloaded
+    after RECOMMENDATION_CACHE_TTL seconds to pick up changes made by other
+    processes.
+    """
+    def __init__(self, ttl=RECOMMENDATION_CACHE_TTL, max_segments=RECOMMENDATION_MAX_SEGMENTS):
+        self.ttl = ttl
+        self.max_segments = max_segments
+        self._lock = threading.RLock()
+        self._records = {}  # resource_id -> ResourceRecord
+        self._segments = OrderedDict()  # segment key -> tuple of ranked resource ids (LRU order)
+        self._loaded_at = None
+
+    def _ensure_loaded(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return
+
+            rows = db.session.query(
+                LearningResource.id,
+                LearningResource.topic,
+                LearningResource.difficulty_level,
+                LearningResource.resource_type,
+                LearningResource.created_at
+            ).all()
+
+            self._records = {
+                row.id: ResourceRecord(
+                    id=row.id,
+                    topic=row.topic,
+                    difficulty_level=row.difficulty_level,
+                    resource_type=row.resource_type,
+                    created_ts=row.created_at.timestamp() if row.created_at else 0.0
+                )
+                for row in rows
+            }
+            self._segments.clear()
+            self._loaded_at = time.monotonic()
+            logger.info(f"Loaded {len(self._records)} learning resources into the recommendation cache")
+
+    def invalidate(self):
+        """Drop all cached data; it is reloaded on the next request"""
+        with self._lock:
+            self._loaded_at = None
+            self._segments.clear()
+
+    def _rank_key(self, resource_id):
+        # Newest first, ties broken by the highest ID (as ORDER BY created_at DESC would)
+        record = self._records[resource_id]
+        return (-record.created_ts, -record.id)
+
+    @staticmethod
+    def _matches(record, key):
+        difficulty, resource_type, topics = key
+        if record.difficulty_level != difficulty:
+            return False
+        if resource_type and record.resource_type != resource_type:
+            return False
+        if topics and record.topic not in topics:
+            return False
+        return True
+
+    def _get_segment(self, key):
+        segment = self._segments.get(key)
+        if segment is not None:
+            return segment
+
+        with self._lock:
+            segment = self._segments.get(key)
+            if segment is None:
+                segment = tuple(sorted(
+                    (record.id for record in self._records.values() if self._matches(record, key)),
+                    key=self._rank_key
+                ))
+                self._segments[key] = segment
+                while len(self._segments) > self.max_segments:
+                    self._segments.popitem(last=False)
+            else:
+                self._segments.move_to_end(key)
+        return segment
+
+    def add_resources(self, records):
+        """
+        Add new or changed resources to the cache incrementally
+
+        Args:
+            records (list): ResourceRecord tuples (see record_from_resource)
+        """
+        if self._loaded_at is None:
+            return
+
+        with self._lock:
+            for record in records:
+                previous = self._records.get(record.id)
+                self._records[record.id] = record
+
+                for key, segment in list(self._segments.items()):
+                    ids = list(segment)
+                    if previous is not None and record.id in segment:
+                        ids.remove(record.id)
+                    if self._matches(record, key):
+                        bisect.insort(ids, record.id, key=self._rank_key)
+                    self._segments[key] = tuple(ids)
+
+    def remove_resources(self, resource_ids):
+        """
+        Remove deleted resources from the cache
+
+        Args:
+            resource_ids (iterable): IDs of deleted resources
+        """
+        if self._loaded_at is None:
+            return
+
+        removed = set(resource_ids)
+        with self._lock:
+            for resource_id in removed:
+                self._records.pop(resource_id, None)
+            for key, segment in list(self._segments.items()):
+                if removed.intersection(segment):
+                    self._segments[key] = tuple(r_id for r_id in segment if r_id not in removed)
+
+    def topic_affinity(self, resource_ids_in_progress, bookmark_topics=None):
+        """
+        Score how interested a user is in each topic
+
+        Args:
+            resource_ids_in_progress (iterable): Resources the user has progress on
+            bookmark_topics (dict): Topic -> number of bookmarked resources
+
+        Returns:
+            Counter: Topic -> affinity
+        """
+        affinity = Counter()
+        for topic, count in (bookmark_topics or {}).items():
+            affinity[topic] += BOOKMARK_AFFINITY * count
+        for resource_id in resource_ids_in_progress:
+            record = self._records.get(resource_id)
+            if record is not None:
+                affinity[record.topic] += PROGRESS_AFFINITY
+        return affinity
+
+    def _rank(self, segment, completed, exclude, affinity, limit):
+        """Pick the best resources of a segment that are not completed or excluded"""
+        window = []
+        for position, resource_id in enumerate(segment):
+            if resource_id in completed or resource_id in exclude:
+                continue
+            window.append((position, resource_id))
+            if len(window) >= limit * CANDIDATE_WINDOW:
+                break
+
+        if not affinity or not window:
+            return [resource_id for _, resource_id in window[:limit]]
+
+        max_affinity = max(affinity.values())
+        size = len(segment)
+
+        def score(candidate):
+            position, resource_id = candidate
+            recency = 1 - position / size
+            topic_score = affinity.get(self._records[resource_id].topic, 0) / max_affinity
+            return recency + AFFINITY_WEIGHT * topic_score
+
+        window.sort(key=score, reverse=True)
+        return [resource_id for _, resource_id in window[:limit]]
+
+    def recommend_ids(self, difficulty, learning_style=None, topics=None, completed=frozenset(), affinity=None, limit=3):
+        """
+        Get recommended resource IDs
+
+        Args:
+            difficulty (str): Difficulty level
+            learning_style (str): Preferred learning style (Text, Video, Interactive)
+            topics (iterable): Topics of interest (empty for all topics)
+            completed (set): IDs of completed resources
+            affinity (Counter): Topic affinity (see topic_affinity)
+            limit (int): Number of recommendations
+
+        Returns:
+            list: Resource IDs, best first
+        """
+        self._ensure_loaded()
+
+        primary_key = (difficulty, LEARNING_STYLE_TYPES.get(learning_style), frozenset(topics or ()))
+        ids = self._rank(self._get_segment(primary_key), completed, set(), affinity, limit)
+
+        # If not enough resources found, add some general ones at the same difficulty
+        if len(ids) < limit:
+            general_key = (difficulty, None, frozenset())
+            ids.extend(self._rank(self._get_segment(general_key), completed, set(ids), affinity, limit - len(ids)))
+
+        return ids
+
+    def recommend(self, user, limit=3):
+        """
+        Get personalized resource recommendations for a user
+
+        Args:
+            user (User): The user
+            limit (int): Number of recommendations
+
+        Returns:
+            list: LearningResource objects, best first
+        """
+        difficulty = user.personal_profile.get('experience_level', 'Beginner')
+        learning_style = user.personal_profile.get('preferred_learning_style', 'Text')
+        topics_of_interest = user.learning_progress.get('learning_topics', [])
+
+        snapshot = get_progress_snapshot(user.id)
+        self._ensure_loaded()
+        affinity = self.topic_affinity(snapshot.by_resource, get_learning_stats(user.id).bookmark_topics)
+
+        ids = self.recommend_ids(
+            difficulty,
+            learning_style=learning_style,
+            topics=topics_of_interest,
+            completed=snapshot.completed_ids,
+            affinity=affinity,
+            limit=limit
+        )
+        if not ids:
+            return []
+
+        resources = {resource.id: resource for resource in LearningResource.query.filter(LearningResource.id.in_(ids))}
+        return [resources[resource_id] for resource_id in ids if resource_id in resources]
+
+
+recommendation_engine = RecommendationEngine()
+
+
+# Keep the cache in step with committed resource changes
+_PENDING_KEY = 'recommendation_engine_changes'
+
+
+def _pending_changes(session):
+    return session.info.setdefault(_PENDING_KEY, {'upserted': [], 'deleted': []})
+
+
+@event.listens_for(LearningResource, 'after_insert')
+@event.listens_for(LearningResource, 'after_update')
+def _resource_saved(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        # Copy the columns now: the object is expired (and SQL is not allowed) after the commit
+        _pending_changes(session)['upserted'].append(record_from_resource(target))
+
+
+@event.listens_for(LearningResource, 'after_delete')
+def _resource_deleted(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        _pending_changes(session)['deleted'].append(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_resource_changes(session):
+    changes = session.info.pop(_PENDING_KEY, None)
+    if not changes:
+        return
+    try:
+        if changes['upserted']:
+            recommendation_engine.add_resources(changes['upserted'])
+        if changes['deleted']:
+            recommendation_engine.remove_resources(changes['deleted'])
+    except Exception as e:
+        logger.error(f"Error updating recommendation cache, invalidating it: {e}")
+        recommendation_engine.invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_resource_changes(session):
+    session.info.pop(_PENDING_KEY, None)
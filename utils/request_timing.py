@@ -0,0 +1,224 @@
+"""
+Per-request timing of external dependencies
+
+Each request collects spans: how many calls it made to a dependency (Yahoo
+Finance, Tavily, Groq, the database, template rendering) and how long they
+took in total. The breakdown is sent in a Server-Timing header, which the
+browser's developer tools show next to the request, and requests slower
+than SLOW_REQUEST_MS are logged with their breakdown as one JSON line.
+
+Client code marks upstream calls with the timed() decorator or the span()
+context manager; both do nothing outside a request. SQL statements and
+rendered templates are timed through SQLAlchemy events and Flask signals.
+Work handed to other threads (see utils/concurrent_tasks.py) is attributed
+to the request when the thread runs in a copy of the request's context;
+durations of such concurrent calls add up, so a dependency's total can
+exceed the request's.
+"""
+import functools
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from flask import g, request, template_rendered, before_render_template
+from config import SLOW_REQUEST_MS, SERVER_TIMING_HEADER
+
+logger = logging.getLogger(__name__)
+
+_timings = ContextVar("request_timings", default=None)
+# Name of the span being recorded, so nested calls to the same dependency count once
+_current_span = ContextVar("request_timing_span", default=None)
+
+
+class RequestTimings:
+    """
+    Call counts and durations per dependency for one request
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = {}
+        # Spans may be recorded from worker threads running in the request's context
+        self._lock = threading.Lock()
+
+    def record(self, name, duration):
+        with self._lock:
+            span = self.spans.setdefault(name, [0, 0.0])
+            span[0] += 1
+            span[1] += duration
+
+    @property
+    def elapsed(self):
+        """Seconds since the request started"""
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        """
+        Returns:
+            dict: Name -> {'count', 'ms'}
+        """
+        with self._lock:
+            return {
+                name: {'count': count, 'ms': round(duration * 1000, 1)}
+                for name, (count, duration) in sorted(self.spans.items())
+            }
+
+    def server_timing(self):
+        """Value of the Server-Timing header"""
+        entries = [
+            f'{name};dur={span["ms"]};desc="{span["count"]} call{"s" if span["count"] != 1 else ""}"'
+            for name, span in self.summary().items()
+        ]
+        entries.append(f"total;dur={self.elapsed * 1000:.1f}")
+        return ", ".join(entries)
+
+
+def current_timings():
+    """The current request's timings, or None outside a timed request"""
+    return _timings.get()
+
+
+class span:
+    """
+    Time a block as a call to a dependency
+
+        with span("groq"):
+            completion = client.chat.completions.create(...)
+
+    Args:
+        name (str): Dependency name (used as the Server-Timing metric name)
+    """
+    __slots__ = ('name', '_timings', '_started', '_token')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._timings = _timings.get()
+        if self._timings is None or _current_span.get() == self.name:
+            self._timings = None
+            return self
+        self._token = _current_span.set(self.name)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._timings is not None:
+            self._timings.record(self.name, time.perf_counter() - self._started)
+            _current_span.reset(self._token)
+        return False
+
+
+def timed(name):
+    """
+    Decorator timing every call of a function as a call to a dependency
+
+    Put it below @cached so that only real upstream fetches are counted.
+
+    Args:
+        name (str): Dependency name
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_methods(name):
+    """
+    Class decorator timing all public methods defined on the class
+
+    Args:
+        name (str): Dependency name
+    """
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if not attr.startswith('_') and callable(value) and not isinstance(value, (staticmethod, classmethod, type)):
+                setattr(cls, attr, timed(name)(value))
+        return cls
+    return decorator
+
+
+# SQL statements (all engines), timed per cursor execution unless a "db" span
+# (e.g. a PostgreSQLService method) already covers them
+def _times_sql():
+    return _timings.get() is not None and _current_span.get() != "db"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _times_sql():
+        conn.info.setdefault('request_timing_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('request_timing_start')
+    if _times_sql() and starts:
+        _timings.get().record("db", time.perf_counter() - starts.pop())
+
+
+# Templates rendered with render_template() (includes are part of their parent)
+def _before_render_template(app, template, context, **extra):
+    if _timings.get() is not None:
+        g.setdefault('template_render_starts', []).append(time.perf_counter())
+
+
+def _template_rendered(app, template, context, **extra):
+    timings = _timings.get()
+    starts = g.get('template_render_starts')
+    if timings is not None and starts:
+        timings.record("template", time.perf_counter() - starts.pop())
+
+
+def _start_timing():
+    g.request_timing_token = _timings.set(RequestTimings())
+
+
+def _finish_timing(response):
+    timings = _timings.get()
+    if timings is None:
+        return response
+
+    if SERVER_TIMING_HEADER:
+        response.headers['Server-Timing'] = timings.server_timing()
+
+    elapsed_ms = timings.elapsed * 1000
+    if elapsed_ms >= SLOW_REQUEST_MS:
+        logger.warning("Slow request: " + json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'ms': round(elapsed_ms, 1),
+            'spans': timings.summary(),
+        }))
+    return response
+
+
+def _reset_timing(exc):
+    token = g.pop('request_timing_token', None)
+    if token is not None:
+        _timings.reset(token)
+
+
+def init_request_timing(app):
+    """
+    Time the requests of the application
+
+    Args:
+        app (Flask): The application
+    """
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    before_render_template.connect(_before_render_template, app)
+    template_rendered.connect(_template_rendered, app)
+
+    app.before_request(_start_timing)
+    app.after_request(_finish_timing)
+    app.teardown_request(_reset_timing)
@@ -3,6 +3,8 @@ import logging
 from datetime import datetime, timedelta
 import os
 from config import TAVILY_API_KEY, FINANCIAL_NEWS_SOURCES
+from utils.data_cache import cached
+from utils.request_timing import timed
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,9 @@ class TavilyNewsExtractor:
         if not self.api_key:
             logger.warning("Tavily API key not provided. News extraction functionality will be limited.")
     
+    # Every news method goes through this search, so caching it covers them all
+    @cached(ttl=600)
+    @timed("tavily")
     def search_indian_financial_news(self, query, max_results=10, include_domains=None, source_filter=None):
         """
         Search for Indian financial news using Tavily API
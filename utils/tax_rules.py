@@ -0,0 +1,454 @@
+"""
+Deterministic tax rules for the tax advisor
+
+The tax advisor form offers a closed set of inputs (investment type, holding
+period and income bracket), so the tax treatment of every combination is
+encoded here and computed locally instead of asking the LLM. Rates follow
+the Finance (No. 2) Act, 2024 (transfers on or after 23 July 2024) and the
+old-regime slab rates, which the income brackets of the form correspond to.
+
+Every combination gets a narrative generated from the rules. A richer LLM
+narrative can be precomputed for all combinations with
+scripts/precompute_tax_narratives.py; it is then served from the narrative
+cache, so the page never waits for the LLM.
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from itertools import product
+from config import TAX_NARRATIVE_FILE
+
+logger = logging.getLogger(__name__)
+
+INVESTMENT_TYPES = [
+    "Equity Shares",
+    "Mutual Funds",
+    "Fixed Deposits",
+    "Real Estate",
+    "Gold",
+    "ELSS",
+    "PPF",
+    "NPS"
+]
+
+HOLDING_PERIODS = [
+    "Less than 1 year",
+    "1-3 years",
+    "More than 3 years"
+]
+
+INCOME_BRACKETS = [
+    "Up to ₹2.5 Lakh",
+    "₹2.5 Lakh - ₹5 Lakh",
+    "₹5 Lakh - ₹10 Lakh",
+    "₹10 Lakh - ₹50 Lakh",
+    "Above ₹50 Lakh"
+]
+
+# Holding period of each form option in months (min, max); None is open-ended
+HOLDING_MONTHS = {
+    "Less than 1 year": (0, 12),
+    "1-3 years": (12, 36),
+    "More than 3 years": (36, None),
+}
+
+# Marginal slab rate and surcharge of each income bracket (old regime)
+SLAB_RATES = {
+    "Up to ₹2.5 Lakh": 0.0,
+    "₹2.5 Lakh - ₹5 Lakh": 5.0,
+    "₹5 Lakh - ₹10 Lakh": 20.0,
+    "₹10 Lakh - ₹50 Lakh": 30.0,
+    "Above ₹50 Lakh": 30.0,
+}
+SURCHARGE_RATES = {
+    "Above ₹50 Lakh": 10.0,  # 10% between ₹50 lakh and ₹1 crore, higher above
+}
+HEALTH_EDUCATION_CESS = 4.0
+
+# Section 112A exemption on long-term gains from listed equity, per year
+EQUITY_LTCG_EXEMPTION = 125000
+
+# Gain used for the worked example of every answer
+EXAMPLE_GAIN = 200000
+
+# Tax treatment per instrument.
+#   threshold_months: holding period after which gains are long-term
+#   short_term / long_term: rate in percent, or "slab" for the income slab
+#   exemption: gains exempt per year (long-term only)
+#   lock_in_months: units cannot be sold before this
+#   tax_free: gains and withdrawals are exempt (EEE)
+#   periodic_income: taxed every year as it accrues, regardless of sale
+TAX_RULES = {
+    "Equity Shares": {
+        "threshold_months": 12,
+        "short_term": 20.0,
+        "long_term": 12.5,
+        "exemption": EQUITY_LTCG_EXEMPTION,
+        "sections": ["111A (STCG)", "112A (LTCG)"],
+        "notes": [
+            "Applies to listed shares sold on a recognised exchange with STT paid.",
+            "Dividends are taxed at your slab rate; TDS of 10% applies above ₹5,000 a year.",
+            "Capital losses can be set off against gains and carried forward for 8 years.",
+        ],
+    },
+    "Mutual Funds": {
+        "threshold_months": 12,
+        "short_term": 20.0,
+        "long_term": 12.5,
+        "exemption": EQUITY_LTCG_EXEMPTION,
+        "sections": ["111A (STCG)", "112A (LTCG)"],
+        "notes": [
+            "Rates shown are for equity-oriented funds (at least 65% in domestic equity).",
+            "Debt funds bought on or after 1 April 2023 are taxed at your slab rate whatever the holding period.",
+            "Switching between schemes or plans is a redemption and is taxed.",
+        ],
+    },
+    "Fixed Deposits": {
+        "periodic_income": True,
+        "short_term": "slab",
+        "long_term": "slab",
+        "sections": ["56 (Income from other sources)", "194A (TDS)"],
+        "notes": [
+            "Interest is taxed every year as it accrues, even if the deposit is not withdrawn.",
+            "Banks deduct 10% TDS when interest exceeds ₹40,000 a year (₹50,000 for senior citizens); submit Form 15G/15H if your income is below the taxable limit.",
+            "5-year tax-saver deposits qualify for the section 80C deduction of up to ₹1.5 lakh.",
+        ],
+    },
+    "Real Estate": {
+        "threshold_months": 24,
+        "short_term": "slab",
+        "long_term": 12.5,
+        "sections": ["112 (LTCG)", "54 / 54EC (Exemptions)"],
+        "notes": [
+            "Resident individuals selling property bought before 23 July 2024 may instead pay 20% with indexation, whichever is lower.",
+            "Reinvesting long-term gains in a residential house (section 54) or 54EC bonds within the deadlines exempts them.",
+            "The buyer deducts 1% TDS when the sale value is ₹50 lakh or more.",
+        ],
+    },
+    "Gold": {
+        "threshold_months": 24,
+        "short_term": "slab",
+        "long_term": 12.5,
+        "sections": ["112 (LTCG)"],
+        "notes": [
+            "Applies to physical gold and gold ETFs or funds; indexation is no longer available.",
+            "Sovereign Gold Bonds held to maturity are exempt from capital gains tax; their 2.5% interest is taxed at your slab rate.",
+        ],
+    },
+    "ELSS": {
+        "threshold_months": 12,
+        "lock_in_months": 36,
+        "short_term": 20.0,
+        "long_term": 12.5,
+        "exemption": EQUITY_LTCG_EXEMPTION,
+        "sections": ["80C (Deduction)", "112A (LTCG)"],
+        "notes": [
+            "Investments up to ₹1.5 lakh a year qualify for the section 80C deduction (old regime only).",
+            "Each SIP instalment has its own 3-year lock-in.",
+        ],
+    },
+    "PPF": {
+        "tax_free": True,
+        "lock_in_months": 180,
+        "sections": ["80C (Deduction)", "10(11) (Exempt income)"],
+        "notes": [
+            "Contributions up to ₹1.5 lakh a year qualify for section 80C, and interest and maturity amount are tax-free (EEE).",
+            "Partial withdrawals are allowed from the 7th financial year; loans from the 3rd to the 6th.",
+        ],
+    },
+    "NPS": {
+        "retirement": True,
+        "sections": ["80CCD(1)", "80CCD(1B)", "80CCD(2)"],
+        "notes": [
+            "Contributions qualify for section 80CCD(1) within the ₹1.5 lakh 80C limit, plus an extra ₹50,000 under 80CCD(1B).",
+            "At 60, up to 60% of the corpus can be withdrawn tax-free; at least 40% must buy an annuity, whose income is taxed at your slab rate.",
+            "Before 60, at least 80% of the corpus must buy an annuity.",
+        ],
+    },
+}
+
+
+def effective_rate(rate, income_bracket):
+    """
+    Effective tax rate including surcharge and cess
+
+    Args:
+        rate (float/str): Rate in percent, or "slab"
+        income_bracket (str): Income bracket of the form
+
+    Returns:
+        float: Effective rate in percent
+    """
+    base = SLAB_RATES[income_bracket] if rate == "slab" else rate
+    surcharge = SURCHARGE_RATES.get(income_bracket, 0.0)
+    return round(base * (1 + surcharge / 100) * (1 + HEALTH_EDUCATION_CESS / 100), 2)
+
+
+def tax_on_gain(gain, rate, income_bracket, exemption=0):
+    """
+    Tax payable on a gain
+
+    Args:
+        gain (float): Gain in rupees
+        rate (float/str): Rate in percent, or "slab"
+        income_bracket (str): Income bracket of the form
+        exemption (float): Part of the gain that is exempt
+
+    Returns:
+        float: Tax in rupees
+    """
+    taxable = max(gain - exemption, 0)
+    return round(taxable * effective_rate(rate, income_bracket) / 100, 2)
+
+
+def _describe_rate(rate, income_bracket):
+    if rate == "slab":
+        return f"your slab rate ({SLAB_RATES[income_bracket]:g}%)"
+    return f"{rate:g}%"
+
+
+def _rate_entry(label, rate, income_bracket, exemption=0):
+    return {
+        "label": label,
+        "rate": _describe_rate(rate, income_bracket),
+        "effective_rate": effective_rate(rate, income_bracket),
+        "exemption": exemption,
+        "example_tax": tax_on_gain(EXAMPLE_GAIN, rate, income_bracket, exemption),
+    }
+
+
+def _classify(rules, holding_period):
+    """Short-term, long-term or both (when the threshold falls inside the period)"""
+    low, high = HOLDING_MONTHS[holding_period]
+    threshold = rules["threshold_months"]
+    if high is not None and high <= threshold:
+        return "short_term"
+    if low >= threshold:
+        return "long_term"
+    return "mixed"
+
+
+def compute_tax(investment_type, holding_period, income_bracket):
+    """
+    Compute the tax treatment of an investment
+
+    Args:
+        investment_type (str): One of INVESTMENT_TYPES
+        holding_period (str): One of HOLDING_PERIODS
+        income_bracket (str): One of INCOME_BRACKETS
+
+    Returns:
+        dict: Classification, applicable rates with effective rates and the
+            tax on an EXAMPLE_GAIN gain, relevant sections and notes
+    """
+    if investment_type not in TAX_RULES:
+        raise ValueError(f"Unknown investment type: {investment_type}")
+    if holding_period not in HOLDING_MONTHS:
+        raise ValueError(f"Unknown holding period: {holding_period}")
+    if income_bracket not in SLAB_RATES:
+        raise ValueError(f"Unknown income bracket: {income_bracket}")
+
+    rules = TAX_RULES[investment_type]
+    notes = list(rules["notes"])
+    rates = []
+
+    if rules.get("tax_free"):
+        classification = "exempt"
+        rates.append(_rate_entry("Interest and maturity amount", 0.0, income_bracket))
+    elif rules.get("retirement"):
+        classification = "retirement"
+        rates.append(_rate_entry("Lump sum withdrawal at 60 (up to 60%)", 0.0, income_bracket))
+        rates.append(_rate_entry("Annuity income", "slab", income_bracket))
+    elif rules.get("periodic_income"):
+        classification = "interest"
+        rates.append(_rate_entry("Interest income", "slab", income_bracket))
+    else:
+        classification = _classify(rules, holding_period)
+        threshold = rules["threshold_months"]
+        if classification in ("short_term", "mixed"):
+            label = f"Short-term gains (held up to {threshold} months)"
+            rates.append(_rate_entry(label, rules["short_term"], income_bracket))
+        if classification in ("long_term", "mixed"):
+            label = f"Long-term gains (held over {threshold} months)"
+            rates.append(_rate_entry(label, rules["long_term"], income_bracket, rules.get("exemption", 0)))
+
+    lock_in = rules.get("lock_in_months")
+    low, high = HOLDING_MONTHS[holding_period]
+    locked_in = lock_in is not None and high is not None and high <= lock_in
+    if locked_in:
+        notes.insert(0, f"{investment_type} has a lock-in of {lock_in // 12} years, so it cannot be redeemed "
+                        f"within this holding period.")
+
+    if SLAB_RATES[income_bracket] <= 5.0:
+        notes.append("With total income up to ₹5 lakh, the section 87A rebate can bring slab tax and "
+                     "short-term equity gains tax to zero (not long-term gains under section 112A).")
+    if income_bracket in SURCHARGE_RATES:
+        notes.append("Surcharge is 10% between ₹50 lakh and ₹1 crore of income and higher above; on equity "
+                     "gains under sections 111A and 112A it is capped at 15%.")
+
+    return {
+        "investment_type": investment_type,
+        "holding_period": holding_period,
+        "income_bracket": income_bracket,
+        "classification": classification,
+        "locked_in": locked_in,
+        "rates": rates,
+        "example_gain": EXAMPLE_GAIN,
+        "sections": rules["sections"],
+        "notes": notes,
+    }
+
+
+def rules_narrative(result):
+    """
+    Plain-language explanation of a compute_tax() result
+
+    Args:
+        result (dict): Output of compute_tax()
+
+    Returns:
+        str: Narrative text
+    """
+    lines = [f"Tax treatment of {result['investment_type']} held {result['holding_period'].lower()} "
+             f"with income {result['income_bracket']}:"]
+    for entry in result["rates"]:
+        line = f"- {entry['label']}: taxed at {entry['rate']}, {entry['effective_rate']:g}% including surcharge and cess"
+        if entry["exemption"]:
+            line += f", after an exemption of ₹{entry['exemption']:,} a year"
+        line += f". Tax on a ₹{result['example_gain']:,} gain: ₹{entry['example_tax']:,.0f}."
+        lines.append(line)
+    lines.append(f"Relevant sections: {', '.join(result['sections'])}.")
+    lines.extend(f"- {note}" for note in result["notes"])
+    return "\n".join(lines)
+
+
+def all_combinations():
+    """Every (investment type, holding period, income bracket) the form offers"""
+    return list(product(INVESTMENT_TYPES, HOLDING_PERIODS, INCOME_BRACKETS))
+
+
+class TaxNarrativeCache:
+    """
+    Narratives for every input combination
+
+    Rule narratives are built on first use and kept in memory. LLM narratives
+    are read from TAX_NARRATIVE_FILE, which precompute_llm_narratives() fills.
+    """
+    def __init__(self, path=TAX_NARRATIVE_FILE):
+        self.path = path
+        self._rules = {}
+        self._llm = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(investment_type, holding_period, income_bracket):
+        return f"{investment_type}|{holding_period}|{income_bracket}"
+
+    def _load_llm_narratives(self):
+        if self._llm is not None:
+            return self._llm
+        with self._lock:
+            if self._llm is None:
+                try:
+                    with open(self.path, encoding='utf-8') as f:
+                        self._llm = json.load(f)
+                except FileNotFoundError:
+                    self._llm = {}
+                except (OSError, ValueError) as e:
+                    logger.error(f"Error loading tax narratives from {self.path}: {e}")
+                    self._llm = {}
+        return self._llm
+
+    def get(self, result):
+        """
+        Get the narrative for a compute_tax() result
+
+        Args:
+            result (dict): Output of compute_tax()
+
+        Returns:
+            tuple: (narrative text, source) where source is "llm" or "rules"
+        """
+        key = self._key(result["investment_type"], result["holding_period"], result["income_bracket"])
+        narrative = self._load_llm_narratives().get(key)
+        if narrative:
+            return narrative, "llm"
+
+        narrative = self._rules.get(key)
+        if narrative is None:
+            narrative = self._rules[key] = rules_narrative(result)
+        return narrative, "rules"
+
+    def precompute_llm_narratives(self, llm_client, overwrite=False):
+        """
+        Ask the LLM to explain every combination and save the narratives
+
+        The computed rates are given to the LLM, so the narrative explains
+        them instead of producing its own numbers.
+
+        Args:
+            llm_client (GroqLLMProcessor): LLM client
+            overwrite (bool): Regenerate narratives that already exist
+
+        Returns:
+            int: Number of narratives generated
+        """
+        narratives = dict(self._load_llm_narratives())
+        generated = 0
+
+        for investment_type, holding_period, income_bracket in all_combinations():
+            key = self._key(investment_type, holding_period, income_bracket)
+            if key in narratives and not overwrite:
+                continue
+
+            result = compute_tax(investment_type, holding_period, income_bracket)
+            response = llm_client.get_financial_insights(
+                {"computed_tax_treatment": result},
+                f"Explain the computed tax treatment of {investment_type} held {holding_period.lower()} "
+                f"for an investor with income {income_bracket}. Use only the computed rates, then give "
+                f"tax-saving strategies, filing requirements and the tax impact of different exit strategies."
+            )
+            if response.get("error") or not response.get("insights"):
+                logger.warning(f"No LLM narrative for {key}: {response.get('error', 'empty response')}")
+                continue
+
+            narratives[key] = response["insights"]
+            generated += 1
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(narratives, f, ensure_ascii=False, indent=2)
+
+        with self._lock:
+            self._llm = narratives
+        return generated
+
+
+tax_narratives = TaxNarrativeCache()
+
+
+def get_tax_advice(investment_type, holding_period, income_bracket):
+    """
+    Tax advice for the tax advisor, computed locally
+
+    Args:
+        investment_type (str): One of INVESTMENT_TYPES
+        holding_period (str): One of HOLDING_PERIODS
+        income_bracket (str): One of INCOME_BRACKETS
+
+    Returns:
+        dict: compute_tax() result plus "insights" (narrative text) and
+            "narrative_source", in the shape of the LLM tax advice
+    """
+    result = compute_tax(investment_type, holding_period, income_bracket)
+    narrative, source = tax_narratives.get(result)
+    result.update({
+        "insights": narrative,
+        "narrative_source": source,
+        "timestamp": datetime.now().isoformat()
+    })
+    return result
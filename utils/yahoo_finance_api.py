@@ -1,9 +1,13 @@
-import yfinance as yf
-import pandas as pd
 import logging
 from datetime import datetime, timedelta
 import json
 from config import DEFAULT_STOCKS, INDIAN_MARKET_INDICES
+from utils.lazy_import import lazy_import
+from utils.data_cache import cached
+from utils.request_timing import timed
+
+# Heavy dependencies are imported the first time market data is fetched
+yf = lazy_import("yfinance")
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +16,25 @@ class YahooFinanceAPI:
         self.default_stocks = DEFAULT_STOCKS
         self.market_indices = INDIAN_MARKET_INDICES
     
+    @staticmethod
+    def _to_yahoo_symbol(symbol):
+        """
+        Normalize a symbol for Yahoo Finance
+
+        Returns:
+            tuple: (symbol with exchange suffix, ticker to request from Yahoo)
+        """
+        # Add .NS suffix if not already present for NSE stocks
+        if '.NS' not in symbol and '.BO' not in symbol and not symbol.startswith('^'):
+            # Check if it's likely an Indian stock
+            if any(char.isalpha() for char in symbol):
+                symbol = f"{symbol}.NS"
+        
+        # Replace spaces with dashes for Yahoo Finance API
+        return symbol, symbol.replace(' ', '-')
+    
+    @cached(ttl=120)
+    @timed("yahoo")
     def get_stock_data(self, symbol, period="1mo", interval="1d"):
         """
         Get historical stock data for a specific symbol
@@ -57,14 +80,7 @@ class YahooFinanceAPI:
                         }
             
             # Normal processing for standard symbols 
-            # Add .NS suffix if not already present for NSE stocks
-            if '.NS' not in symbol and '.BO' not in symbol:
-                # Check if it's likely an Indian stock
-                if any(char.isalpha() for char in symbol):
-                    symbol = f"{symbol}.NS"
-            
-            # Replace spaces with dashes for Yahoo Finance API
-            yf_symbol = symbol.replace(' ', '-')
+            symbol, yf_symbol = self._to_yahoo_symbol(symbol)
             
             stock = yf.Ticker(yf_symbol)
             
@@ -76,14 +92,8 @@ class YahooFinanceAPI:
             
             # Process historical data
             if not hist.empty:
+                # Timestamps stay pandas values; the app's JSON provider serializes them
                 hist_dict = hist.reset_index().to_dict(orient='records')
-                
-                # Convert datetime to string for JSON serialization
-                for record in hist_dict:
-                    if 'Date' in record and isinstance(record['Date'], pd.Timestamp):
-                        record['Date'] = record['Date'].strftime('%Y-%m-%d %H:%M:%S')
-                    if 'Datetime' in record and isinstance(record['Datetime'], pd.Timestamp):
-                        record['Datetime'] = record['Datetime'].strftime('%Y-%m-%d %H:%M:%S')
             else:
                 hist_dict = []
             
@@ -131,6 +141,7 @@ class YahooFinanceAPI:
                 'timestamp': datetime.now().isoformat()
             }
     
+    @cached(ttl=120)
     def get_multiple_stocks(self, symbols=None, period="1d", interval="1d"):
         """
         Get data for multiple stocks
@@ -156,6 +167,61 @@ class YahooFinanceAPI:
             'count': len(results)
         }
     
+    @timed("yahoo")
+    def get_quotes(self, symbols):
+        """
+        Get the latest price of several symbols with a single upstream request
+        
+        Not cached: the live quote poller (utils/quote_stream.py) is the caller
+        and decides how often to refresh.
+        
+        Args:
+            symbols (list): Stock or index symbols as stored in watchlists
+            
+        Returns:
+            dict: Symbol -> {'price', 'previousClose', 'change', 'changePercent'};
+                symbols without data are left out
+        """
+        # Indices with spaces in their names are not available from Yahoo (see get_stock_data)
+        tickers = {}
+        for symbol in symbols:
+            if ' ' not in symbol:
+                tickers[self._to_yahoo_symbol(symbol)[1]] = symbol
+        if not tickers:
+            return {}
+        
+        try:
+            # Two daily bars give the latest price and the previous close
+            data = yf.download(list(tickers), period="5d", interval="1d", group_by="ticker",
+                               progress=False, threads=False, auto_adjust=False)
+        except Exception as e:
+            logger.error(f"Error fetching quotes for {len(tickers)} symbols: {e}")
+            return {}
+        
+        quotes = {}
+        for yf_symbol, symbol in tickers.items():
+            try:
+                frame = data[yf_symbol] if data.columns.nlevels > 1 else data
+                closes = frame['Close'].dropna()
+            except KeyError:
+                continue
+            if closes.empty:
+                continue
+            
+            price = float(closes.iloc[-1])
+            previous_close = float(closes.iloc[-2]) if len(closes) > 1 else price
+            change = price - previous_close
+            quotes[symbol] = {
+                'price': round(price, 2),
+                'previousClose': round(previous_close, 2),
+                'change': round(change, 2),
+                'changePercent': round(change / previous_close * 100, 2) if previous_close else 0.0,
+            }
+        
+        return quotes
+    
+    @cached(ttl=60)
+    @timed("yahoo")
     def get_market_summary(self, indices=None):
         """
         Get summary data for major Indian market indices
@@ -231,6 +297,7 @@ class YahooFinanceAPI:
             'timestamp': datetime.now().isoformat()
         }
     
+    @cached(ttl=300)
     def get_sector_performance(self, sectors=None):
         """
         Get performance data for Indian market sectors
@@ -296,6 +363,7 @@ class YahooFinanceAPI:
             'timestamp': datetime.now().isoformat()
         }
     
+    @cached(ttl=3600)
     def search_stocks(self, query, limit=10, exchanges=None):
         """
         Search for stocks based on name or symbol
@@ -323,7 +391,8 @@ class YahooFinanceAPI:
                     # Get basic info about the stock
                     stock_data = self.get_stock_data(stock['symbol'])
                     if 'error' not in stock_data:
-                        results.append(stock_data['info'])
+                        # Copy: the quote is a cached value shared with other requests
+                        results.append(dict(stock_data['info']))
             
             # Also search in market indices
             for index in self.market_indices:
@@ -333,11 +402,13 @@ class YahooFinanceAPI:
                     # Get basic info about the index
                     index_data = self.get_stock_data(index['symbol'])
                     if 'error' not in index_data:
-                        # Add additional market index info
-                        index_data['info']['description'] = index.get('description', '')
-                        index_data['info']['category'] = index.get('category', '')
-                        index_data['info']['is_index'] = True
-                        results.append(index_data['info'])
+                        # Add additional market index info to a copy of the cached quote
+                        results.append(dict(
+                            index_data['info'],
+                            description=index.get('description', ''),
+                            category=index.get('category', ''),
+                            is_index=True
+                        ))
             
             # If we don't have enough results, we could expand the search
             # This would require a more comprehensive list of Indian stocks
@@ -358,6 +429,7 @@ class YahooFinanceAPI:
                 'timestamp': datetime.now().isoformat()
             }
             
+    @cached(ttl=300)
     def get_all_market_indices(self, period="1mo", interval="1d", category=None):
         """
         Get data for all configured Indian market indices
@@ -383,10 +455,13 @@ class YahooFinanceAPI:
                 data = self.get_stock_data(symbol, period, interval)
                 
                 if 'info' in data:
-                    # Add additional index information
-                    data['info']['description'] = index.get('description', '')
-                    data['info']['category'] = index.get('category', '')
-                    data['info']['is_index'] = True
+                    # Add additional index information (on a copy - stock data is cached)
+                    data = dict(data, info=dict(
+                        data['info'],
+                        description=index.get('description', ''),
+                        category=index.get('category', ''),
+                        is_index=True
+                    ))
                     results[symbol] = data
                     
             except Exception as e:
@@ -399,6 +474,8 @@ class YahooFinanceAPI:
             'count': len(results)
         }
     
+    @cached(ttl=300)
+    @timed("yahoo")
     def get_indices_by_category(self):
         """
         Get all market indices organized by category